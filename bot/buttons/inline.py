@@ -1,13 +1,16 @@
-from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Video
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from aiogram.utils.i18n import gettext as _
+from bot.utils.i18n_bundle import gettext as _
 from typing import List
 
 from bot.utils.constants import ANSWER_LETTERS
+from bot.utils.catalogue import CategorySummary, CatalogueItem
 from db.models import CategoryTest, AnswerTest, DepartmentSafety, AreaSafety, FacilitySafety, EquipmentSafety, \
-    CategoryBook, Book, CategoryVideo, Channel
+    Channel
 from datetime import datetime, timezone
-from db.models import AccidentYear, Accident
+from bot.utils.accident_summary import YearSummary, AccidentItem
+from bot.utils.search import SearchHit
+from bot.utils.keyboard_cache import cached_keyboard, rows_key
 
 
 def channel_join_keyboard(channels: List[Channel]) -> InlineKeyboardMarkup:
@@ -29,6 +32,7 @@ def channel_join_keyboard(channels: List[Channel]) -> InlineKeyboardMarkup:
 
 # -------------------- 🧠 Test keyboards --------------------
 
+@cached_keyboard(key=lambda categories: rows_key(categories, "id", "name"))
 def test_category_keyboard(categories: List[CategoryTest]) -> InlineKeyboardMarkup:
     """
     Test kategoriyalari uchun tugmalarni yaratadi.
@@ -135,6 +139,7 @@ def result_with_next_question_keyboard(answers: List[AnswerTest], question_id: i
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard()
 def result_with_only_next_question_keyboard(result_text: str) -> InlineKeyboardMarkup:
     """
     Rasmli savollar uchun: Natija + keyingi savol tugmasi (javoblar o'rnida).
@@ -184,6 +189,7 @@ def timeout_result_keyboard(answers: List[AnswerTest], question_id: int,
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard()
 def timeout_with_next_question_keyboard() -> InlineKeyboardMarkup:
     """
     Rasmli savollar uchun vaqt tugaganda keyingi savol tugmasi.
@@ -217,6 +223,7 @@ def timeout_with_next_question_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard()
 def next_question_keyboard() -> InlineKeyboardMarkup:
     """
     "Keyingisi" tugmasi — foydalanuvchi keyingi savolga o'tishi uchun.
@@ -226,6 +233,7 @@ def next_question_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
+@cached_keyboard()
 def back_to_categories_keyboard() -> InlineKeyboardMarkup:
     """
     "Orqaga" va "Asosiy menyu" tugmalari yonma-yon chiqadi.
@@ -238,6 +246,7 @@ def back_to_categories_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
+@cached_keyboard()
 def test_result_keyboard(score: int, total: int) -> InlineKeyboardMarkup:
     """
     Test yakunlangandan keyin natijalar tugmalari.
@@ -273,6 +282,7 @@ def test_result_keyboard(score: int, total: int) -> InlineKeyboardMarkup:
 
 # -------------------- 🦺 Safety Equipment keyboards --------------------
 
+@cached_keyboard(key=lambda departments: rows_key(departments, "id", "name"))
 def safety_department_keyboard(departments: List[DepartmentSafety]) -> InlineKeyboardMarkup:
     """Himoya vositalari department'lari uchun tugmalar."""
     builder = InlineKeyboardBuilder()
@@ -286,6 +296,14 @@ def safety_department_keyboard(departments: List[DepartmentSafety]) -> InlineKey
 
     builder.adjust(2)  # har qatorda 2 ta tugma
 
+    # Seriya raqami bo'yicha qidiruv
+    builder.row(
+        InlineKeyboardButton(
+            text=_("🔎 Seriya raqami bo'yicha qidirish"),
+            callback_data="safety_serial_search"
+        )
+    )
+
     # Asosiy menyu tugmasi
     builder.row(
         InlineKeyboardButton(
@@ -456,6 +474,7 @@ def safety_equipment_keyboard(
     return builder.as_markup()
 
 
+@cached_keyboard()
 def safety_equipment_detail_keyboard(
         equipment_id: int,
         department_id: int,
@@ -478,6 +497,7 @@ def safety_equipment_detail_keyboard(
     ])
 
 
+@cached_keyboard()
 def back_to_departments_keyboard() -> InlineKeyboardMarkup:
     """Departments ro'yxatiga qaytish tugmasi."""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -494,6 +514,7 @@ def back_to_departments_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
+@cached_keyboard()
 def back_to_areas_keyboard(department_id: int) -> InlineKeyboardMarkup:
     """Areas ro'yxatiga qaytish tugmasi."""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -510,6 +531,7 @@ def back_to_areas_keyboard(department_id: int) -> InlineKeyboardMarkup:
     ])
 
 
+@cached_keyboard()
 def back_to_facilities_keyboard(department_id: int, area_id: int) -> InlineKeyboardMarkup:
     """Facilities ro'yxatiga qaytish tugmasi."""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -526,6 +548,7 @@ def back_to_facilities_keyboard(department_id: int, area_id: int) -> InlineKeybo
     ])
 
 
+@cached_keyboard()
 def department_statistics_keyboard(department_id: int) -> InlineKeyboardMarkup:
     """Statistika sahifasi uchun tugmalar."""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -542,8 +565,59 @@ def department_statistics_keyboard(department_id: int) -> InlineKeyboardMarkup:
     ])
 
 
+@cached_keyboard()
+def safety_serial_search_keyboard() -> InlineKeyboardMarkup:
+    """Seriya raqami qidiruvidan chiqish tugmalari."""
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(
+                text=_("↩️ Orqaga"),
+                callback_data="back_to_departments"
+            ),
+            InlineKeyboardButton(
+                text=_("🏠 Asosiy Menyu"),
+                callback_data="safety_main_menu"
+            )
+        ]
+    ])
+
+
+def safety_serial_results_keyboard(results: list) -> InlineKeyboardMarkup:
+    """Seriya raqami bo'yicha topilgan himoya vositalari."""
+    builder = InlineKeyboardBuilder()
+
+    MAX_LENGTH = 28
+
+    # results: (equipment_id, serial_number, catalog_name, ...) tuple'lar
+    for equipment_id, serial_number, catalog_name, *_rest in results:
+        raw_text = f"№{serial_number} {catalog_name}"
+        if len(raw_text) > MAX_LENGTH:
+            raw_text = raw_text[:MAX_LENGTH - 1] + "…"
+
+        builder.button(
+            text=f"🧰 {raw_text}",
+            callback_data=f"serial_result:{equipment_id}"
+        )
+
+    builder.adjust(1)
+
+    builder.row(
+        InlineKeyboardButton(
+            text=_("↩️ Orqaga"),
+            callback_data="back_to_departments"
+        ),
+        InlineKeyboardButton(
+            text=_("🏠 Asosiy Menyu"),
+            callback_data="safety_main_menu"
+        )
+    )
+
+    return builder.as_markup()
+
+
 # -------------------- 📅 Exam Schedule keyboards --------------------
 
+@cached_keyboard()
 def exam_schedule_main_menu_keyboard() -> InlineKeyboardMarkup:
     """Imtihon jadvali uchun asosiy menyu tugmasi."""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -551,6 +625,7 @@ def exam_schedule_main_menu_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
+@cached_keyboard()
 def exam_viewer_categories_keyboard(overdue: int, urgent: int, warning: int, normal: int, safe: int,
                                     no_data: int) -> InlineKeyboardMarkup:
     """Viewer uchun kategoriya tugmalari"""
@@ -614,6 +689,7 @@ def exam_viewer_categories_keyboard(overdue: int, urgent: int, warning: int, nor
     return builder.as_markup()
 
 
+@cached_keyboard()
 def exam_search_keyboard() -> InlineKeyboardMarkup:
     """Qidiruv sahifasi uchun keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -630,6 +706,7 @@ def exam_search_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
+@cached_keyboard()
 def exam_category_pagination_keyboard(category: str, page: int, total_pages: int) -> InlineKeyboardMarkup:
     """Kategoriya ichida pagination uchun keyboard"""
     buttons = []
@@ -675,6 +752,7 @@ def exam_category_pagination_keyboard(category: str, page: int, total_pages: int
 
 
 
+@cached_keyboard()
 def exam_search_pagination_keyboard(page: int, total_pages: int) -> InlineKeyboardMarkup:
     """Qidiruv natijalari uchun pagination keyboard"""
     buttons = []
@@ -723,6 +801,7 @@ def exam_search_pagination_keyboard(page: int, total_pages: int) -> InlineKeyboa
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard()
 def exam_back_to_categories_keyboard() -> InlineKeyboardMarkup:
     """Kategoriyalarga qaytish uchun keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -740,16 +819,16 @@ def exam_back_to_categories_keyboard() -> InlineKeyboardMarkup:
 
 # -------------------- ⚠️ accident_handler --------------------
 
-def accident_years_keyboard(years: List[AccidentYear]) -> InlineKeyboardMarkup:
+@cached_keyboard(domain="accident")
+def accident_years_keyboard(years: List[YearSummary]) -> InlineKeyboardMarkup:
     """Years list keyboard with accident counts"""
     builder = InlineKeyboardBuilder()
 
     if years:
         # Year buttons (2 per row)
         for year in years:
-            count = len(year.accidents)  # Barcha hodisalar soni (Xisobat ham kiradi)
             builder.button(
-                text=f"📆 {year.name} ({count})",
+                text=f"📆 {year.name} ({year.accident_count})",  # Barcha hodisalar soni (Xisobat ham kiradi)
                 callback_data=f"accident_year:{year.id}:1"
             )
 
@@ -774,6 +853,7 @@ def accident_years_keyboard(years: List[AccidentYear]) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard()
 def accident_empty_year_keyboard() -> InlineKeyboardMarkup:
     """Empty year keyboard with back button"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -791,7 +871,7 @@ def accident_empty_year_keyboard() -> InlineKeyboardMarkup:
 
 
 def accident_list_keyboard(
-        accidents: List[Accident],
+        accidents: List[AccidentItem],
         year_id: int,
         current_page: int,
         total_pages: int
@@ -860,6 +940,7 @@ def accident_list_keyboard(
     return builder.as_markup()
 
 
+@cached_keyboard()
 def accident_detail_keyboard(year_id: int) -> InlineKeyboardMarkup:
     """Accident detail keyboard with back navigation"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -876,6 +957,7 @@ def accident_detail_keyboard(year_id: int) -> InlineKeyboardMarkup:
     ])
 
 
+@cached_keyboard()
 def accident_statistics_main_keyboard() -> InlineKeyboardMarkup:
     """Main statistics keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -892,6 +974,7 @@ def accident_statistics_main_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
+@cached_keyboard()
 def accident_statistics_year_keyboard(year_id: int) -> InlineKeyboardMarkup:
     """Year statistics keyboard with enhanced navigation"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -915,6 +998,7 @@ def accident_statistics_year_keyboard(year_id: int) -> InlineKeyboardMarkup:
 
 
 
+@cached_keyboard()
 def ai_limits_keyboard() -> InlineKeyboardMarkup:
     """Limits view keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -933,14 +1017,15 @@ def ai_limits_keyboard() -> InlineKeyboardMarkup:
 
 # -------------------- 📚 library_handler --------------------
 
-def library_categories_keyboard(categories: List[CategoryBook], page: int, total_pages: int) -> InlineKeyboardMarkup:
+@cached_keyboard(domain="library")
+def library_categories_keyboard(categories: List[CategorySummary], page: int, total_pages: int) -> InlineKeyboardMarkup:
     """Categories list keyboard with pagination (2x2 grid)"""
     builder = InlineKeyboardBuilder()
 
-    # Category buttons (2 per row)
+    # Category buttons (2 per row) - with book counts
     for category in categories:
         builder.button(
-            text=f"📂 {category.name}",
+            text=f"📂 {category.name} ({category.item_count})",
             callback_data=f"library_category:{category.id}:1"
         )
 
@@ -989,7 +1074,7 @@ def library_categories_keyboard(categories: List[CategoryBook], page: int, total
 
 
 def library_books_keyboard(
-        books: List[Book],
+        books: List[CatalogueItem],
         category_id: int,
         current_page: int,
         total_pages: int
@@ -1050,6 +1135,7 @@ def library_books_keyboard(
     return builder.as_markup()
 
 
+@cached_keyboard()
 def library_book_detail_keyboard(category_id: int) -> InlineKeyboardMarkup:
     """Book detail keyboard with back navigation"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -1066,6 +1152,7 @@ def library_book_detail_keyboard(category_id: int) -> InlineKeyboardMarkup:
     ])
 
 
+@cached_keyboard()
 def library_statistics_keyboard() -> InlineKeyboardMarkup:
     """Library statistics keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -1082,6 +1169,7 @@ def library_statistics_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
+@cached_keyboard()
 def library_empty_category_keyboard() -> InlineKeyboardMarkup:
     """Empty category keyboard with back button"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -1099,14 +1187,15 @@ def library_empty_category_keyboard() -> InlineKeyboardMarkup:
 
 # -------------------- 🎥 video_handler --------------------
 
-def video_categories_keyboard(categories: List[CategoryVideo], page: int, total_pages: int) -> InlineKeyboardMarkup:
+@cached_keyboard(domain="video")
+def video_categories_keyboard(categories: List[CategorySummary], page: int, total_pages: int) -> InlineKeyboardMarkup:
     """Categories list keyboard with pagination (2x2 grid)"""
     builder = InlineKeyboardBuilder()
 
-    # Category buttons (2 per row)
+    # Category buttons (2 per row) - with video counts
     for category in categories:
         builder.button(
-            text=f"📂 {category.name}",
+            text=f"📂 {category.name} ({category.item_count})",
             callback_data=f"video_category:{category.id}:1"
         )
 
@@ -1155,7 +1244,7 @@ def video_categories_keyboard(categories: List[CategoryVideo], page: int, total_
 
 
 def video_list_keyboard(
-        videos: List[Video],
+        videos: List[CatalogueItem],
         category_id: int,
         current_page: int,
         total_pages: int
@@ -1216,6 +1305,7 @@ def video_list_keyboard(
     return builder.as_markup()
 
 
+@cached_keyboard()
 def video_detail_keyboard(category_id: int) -> InlineKeyboardMarkup:
     """Video detail keyboard with back navigation"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -1232,6 +1322,7 @@ def video_detail_keyboard(category_id: int) -> InlineKeyboardMarkup:
     ])
 
 
+@cached_keyboard()
 def video_statistics_keyboard() -> InlineKeyboardMarkup:
     """Video statistics keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -1248,6 +1339,7 @@ def video_statistics_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
+@cached_keyboard()
 def video_empty_category_keyboard() -> InlineKeyboardMarkup:
     """Empty category keyboard with back button"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -1267,6 +1359,7 @@ def video_empty_category_keyboard() -> InlineKeyboardMarkup:
 # -------------------- 🏢 company_handler --------------------
 
 
+@cached_keyboard()
 def company_contact_keyboard(admin_link: str = None) -> InlineKeyboardMarkup:
     """Faqat admin kontakt tugmasi"""
     builder = InlineKeyboardBuilder()
@@ -1303,6 +1396,7 @@ def company_contact_keyboard(admin_link: str = None) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard()
 def company_main_keyboard() -> InlineKeyboardMarkup:
     """Asosiy menyu tugmasi"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -1314,21 +1408,12 @@ def company_main_keyboard() -> InlineKeyboardMarkup:
 
 # -------------------- 🚆 train_handler --------------------
 
-def train_safety_folders_keyboard(folders, page: int = 1, per_page: int = 10):
-    """Papkalar klaviaturasi (pagination bilan)"""
+def train_safety_folders_keyboard(folders, page: int = 1, total_pages: int = 1):
+    """Papkalar klaviaturasi (pagination bilan) - folders: joriy sahifadagi papkalar"""
     builder = InlineKeyboardBuilder()
 
-    # Sahifa sozlamalari
-    total_items = len(folders)
-    total_pages = (total_items + per_page - 1) // per_page
-
-    # Hozirgi sahifa uchun papkalarni olish
-    start_idx = (page - 1) * per_page
-    end_idx = min(start_idx + per_page, total_items)
-    current_folders = folders[start_idx:end_idx]
-
     # Papka tugmalari (2 tadan har qatorda)
-    for folder in current_folders:
+    for folder in folders:
         builder.button(
             text=f"📂 {folder.name}",
             callback_data=f"train_safety_folder_{folder.id}"
@@ -1373,21 +1458,12 @@ def train_safety_folders_keyboard(folders, page: int = 1, per_page: int = 10):
     return builder.as_markup()
 
 
-def train_safety_files_keyboard(files, folder_id: int, page: int = 1, per_page: int = 10):
-    """Papka ichidagi fayllar klaviaturasi (pagination bilan)"""
+def train_safety_files_keyboard(files, folder_id: int, page: int = 1, total_pages: int = 1):
+    """Papka ichidagi fayllar klaviaturasi (pagination bilan) - files: joriy sahifadagi fayllar"""
     builder = InlineKeyboardBuilder()
 
-    # Sahifa sozlamalari
-    total_items = len(files)
-    total_pages = (total_items + per_page - 1) // per_page
-
-    # Hozirgi sahifa uchun fayllarni olish
-    start_idx = (page - 1) * per_page
-    end_idx = min(start_idx + per_page, total_items)
-    current_files = files[start_idx:end_idx]
-
     # Fayllar ro'yxati (1 tadan har qatorda)
-    for file in current_files:
+    for file in files:
         builder.button(
             text=f"📄 {file.name}",
             callback_data=f"train_safety_file_{file.id}"
@@ -1434,6 +1510,7 @@ def train_safety_files_keyboard(files, folder_id: int, page: int = 1, per_page:
     return builder.as_markup()
 
 
+@cached_keyboard()
 def train_safety_empty_folder_keyboard():
     """Bo'sh papka uchun keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -1450,6 +1527,7 @@ def train_safety_empty_folder_keyboard():
     ])
 
 
+@cached_keyboard()
 def train_safety_file_detail_keyboard(folder_id: int):
     """Fayl ko'rish uchun keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -1463,4 +1541,91 @@ def train_safety_file_detail_keyboard(folder_id: int):
                 callback_data="train_safety_main_menu"
             )
         ]
-    ])
\ No newline at end of file
+    ])
+
+# -------------------- 🔎 search_handler --------------------
+
+SEARCH_KIND_ICONS = {
+    "accident": "⚠️",
+    "book": "📚",
+    "video": "🎥",
+    "train_file": "🚆",
+    "company": "🏢",
+}
+
+
+def search_hit_callback(hit: SearchHit) -> str:
+    """Natija tugmasi - tegishli bo'limning detail handler'iga yo'naltiradi"""
+    return {
+        "accident": f"accident_detail:{hit.id}",
+        "book": f"library_book:{hit.id}",
+        "video": f"video_detail:{hit.id}",
+        "train_file": f"train_safety_file_{hit.id}",
+        "company": "search_company",
+    }[hit.kind]
+
+
+@cached_keyboard()
+def search_prompt_keyboard() -> InlineKeyboardMarkup:
+    """Qidiruv so'rovi kutilayotganda"""
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text=_("🏠 Asosiy Menyu"), callback_data="search_main_menu")]
+    ])
+
+
+def search_results_keyboard(hits: List[SearchHit], current_page: int, total_pages: int) -> InlineKeyboardMarkup:
+    """Qidiruv natijalari (sahifalangan)"""
+    builder = InlineKeyboardBuilder()
+
+    MAX_LENGTH = 32
+
+    for hit in hits:
+        title = hit.title if len(hit.title) <= MAX_LENGTH else hit.title[:MAX_LENGTH - 1] + "…"
+        builder.button(
+            text=f"{SEARCH_KIND_ICONS[hit.kind]} {title}",
+            callback_data=search_hit_callback(hit)
+        )
+
+    builder.adjust(1)
+
+    # Navigation buttons row
+    if total_pages > 1:
+        nav_buttons = []
+        if current_page > 1:
+            nav_buttons.append(
+                InlineKeyboardButton(text="⬅️", callback_data=f"search_page:{current_page - 1}")
+            )
+        nav_buttons.append(
+            InlineKeyboardButton(text=f"{current_page}/{total_pages}", callback_data="search_noop")
+        )
+        if current_page < total_pages:
+            nav_buttons.append(
+                InlineKeyboardButton(text="➡️", callback_data=f"search_page:{current_page + 1}")
+            )
+        builder.row(*nav_buttons)
+
+    builder.row(
+        InlineKeyboardButton(
+            text=_("🏠 Asosiy Menyu"),
+            callback_data="search_main_menu"
+        )
+    )
+
+    return builder.as_markup()
+
+
+@cached_keyboard()
+def search_company_keyboard(page: int) -> InlineKeyboardMarkup:
+    """Korxona ma'lumotidan natijalarga qaytish"""
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(
+                text=_("↩️ Orqaga"),
+                callback_data=f"search_page:{page}"
+            ),
+            InlineKeyboardButton(
+                text=_("🏠 Asosiy Menyu"),
+                callback_data="search_main_menu"
+            )
+        ]
+    ])
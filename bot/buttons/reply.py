@@ -1,10 +1,11 @@
 
 from aiogram.types import KeyboardButton, ReplyKeyboardMarkup
 from aiogram.utils.keyboard import ReplyKeyboardBuilder
-from aiogram.utils.i18n import gettext as _
+from bot.utils.i18n_bundle import gettext as _, per_locale
 
 
-async def get_main_menu_keyboard() -> ReplyKeyboardMarkup:
+@per_locale
+def get_main_menu_keyboard() -> ReplyKeyboardMarkup:
     builder = ReplyKeyboardBuilder()
     buttons = [
         KeyboardButton(text=_("🧠 Test")),
@@ -16,14 +17,16 @@ async def get_main_menu_keyboard() -> ReplyKeyboardMarkup:
         KeyboardButton(text=_("🎥 Video Materiallar")),
         KeyboardButton(text=_("🚆 Poezdlar Harakat Xavfsizligi")),
         KeyboardButton(text=_("🏢 Biz Haqimizda")),
+        KeyboardButton(text=_("🔎 Qidiruv")),
         KeyboardButton(text=_("🌐 Tilni O'zgartirish")),
     ]
     builder.add(*buttons)
-    builder.adjust(1, 2, 2, 2, 2, 1)
+    builder.adjust(1, 2, 2, 2, 2, 2)
     return builder.as_markup(resize_keyboard=True)
 
 
-async def get_phone_request_keyboard() -> ReplyKeyboardMarkup:
+@per_locale
+def get_phone_request_keyboard() -> ReplyKeyboardMarkup:
     builder = ReplyKeyboardBuilder()
     builder.add(
         KeyboardButton(text=_("📱 Telefon raqamimni yuborish"), request_contact=True)
@@ -31,7 +34,8 @@ async def get_phone_request_keyboard() -> ReplyKeyboardMarkup:
     return builder.as_markup(resize_keyboard=True, one_time_keyboard=True)
 
 
-async def get_language_keyboard() -> ReplyKeyboardMarkup:
+@per_locale
+def get_language_keyboard() -> ReplyKeyboardMarkup:
     builder = ReplyKeyboardBuilder()
     buttons = [
         KeyboardButton(text=_("🇺🇿 Uzbek")),
@@ -47,6 +51,7 @@ async def get_language_keyboard() -> ReplyKeyboardMarkup:
 
 # ------------------- ai handler ----------------------------
 
+@per_locale
 def ai_menu_keyboard() -> ReplyKeyboardMarkup:
     """AI assistant reply keyboard"""
     return ReplyKeyboardMarkup(
@@ -1,34 +1,67 @@
+import importlib
+import logging
+import time
+from types import ModuleType
+
 from bot.distpatchers import dp
-from bot.handlers.accident_handler import accident_router
-from bot.handlers.ai_assistant_handler import ai_router
-from bot.handlers.company_handler import company_router
-from bot.handlers.equipment_handler import equipment_router
-from bot.handlers.exam_schedule_handler import exam_schedule_router
-from bot.handlers.group_events import group_router
-from bot.handlers.language_handler import language_router
-from bot.handlers.library_handler import library_router
-from bot.handlers.media_handler import media_router
-from bot.handlers.test_handler import test_router
-from bot.handlers.text_handler import text_router
-from bot.handlers.start_handler import main_router
-from bot.handlers.train_safety_handler import train_safety_router
-from bot.handlers.video_handler import video_router
-
-dp.include_routers(
-    group_router,
-    accident_router,
-    company_router,
-    equipment_router,
-    exam_schedule_router,
-    language_router,
-    library_router,
-    media_router,
-    main_router,
-    test_router,
-    video_router,
-    train_safety_router,
-    ai_router,
-    text_router,
-)
 
+logger = logging.getLogger(__name__)
+
+# 🎯 ROUTERLAR - tartib muhim (birinchi mos kelgan handler ishlaydi)
+# feature -> (modul, router nomi); modul faqat feature yoqilgan bo'lsa import qilinadi
+FEATURE_ROUTERS = {
+    "group": ("bot.handlers.group_events", "group_router"),
+    "menu": ("bot.handlers.menu_routes", "menu_router"),
+    "accident": ("bot.handlers.accident_handler", "accident_router"),
+    "company": ("bot.handlers.company_handler", "company_router"),
+    "equipment": ("bot.handlers.equipment_handler", "equipment_router"),
+    "exam_schedule": ("bot.handlers.exam_schedule_handler", "exam_schedule_router"),
+    "language": ("bot.handlers.language_handler", "language_router"),
+    "library": ("bot.handlers.library_handler", "library_router"),
+    "media": ("bot.handlers.media_handler", "media_router"),
+    "start": ("bot.handlers.start_handler", "main_router"),
+    "test": ("bot.handlers.test_handler", "test_router"),
+    "video": ("bot.handlers.video_handler", "video_router"),
+    "train_safety": ("bot.handlers.train_safety_handler", "train_safety_router"),
+    "search": ("bot.handlers.search_handler", "search_router"),
+    "ai": ("bot.handlers.ai_assistant_handler", "ai_router"),
+    "text": ("bot.handlers.text_handler", "text_router"),
+}
+
+# O'chirib bo'lmaydigan feature'lar (ro'yxatdan o'tish, menyu, guruh hodisalari)
+CORE_FEATURES = {"group", "menu", "start", "text"}
+
+
+def setup_routers(disabled_features=()) -> dict[str, ModuleType]:
+    """Yoqilgan feature modullarini import qilish, menyu jadvalini tuzish va dp'ga ulash"""
+    disabled = set(disabled_features)
+    for feature in sorted(disabled - set(FEATURE_ROUTERS)):
+        logger.warning(f"Unknown feature in DISABLED_FEATURES: {feature}")
+    for feature in sorted(disabled & CORE_FEATURES):
+        logger.warning(f"Core feature can not be disabled: {feature}")
+    disabled -= CORE_FEATURES
+
+    modules: dict[str, ModuleType] = {}
+    timings: dict[str, float] = {}
+    for feature, (module_name, _router_name) in FEATURE_ROUTERS.items():
+        if feature in disabled:
+            continue
+        started = time.perf_counter()
+        modules[feature] = importlib.import_module(module_name)
+        timings[feature] = (time.perf_counter() - started) * 1000
+
+    modules["menu"].build_menu_routes(modules)
+    dp.include_routers(*(
+        getattr(module, FEATURE_ROUTERS[feature][1]) for feature, module in modules.items()
+    ))
+
+    # Import vaqti hisoboti (umumiy kutubxonalar birinchi import qilgan modulga yoziladi)
+    report = ", ".join(
+        f"{feature}={elapsed:.0f}ms"
+        for feature, elapsed in sorted(timings.items(), key=lambda item: item[1], reverse=True)
+    )
+    logger.info(f"Routers loaded in {sum(timings.values()):.0f}ms: {report}")
+    if disabled:
+        logger.info(f"Disabled features: {', '.join(sorted(disabled))}")
 
+    return modules
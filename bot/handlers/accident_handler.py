@@ -1,19 +1,16 @@
 
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove
+from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import List, Optional
 import asyncio
 import time
-import re
 from collections import defaultdict, deque
-from aiogram.utils.i18n import lazy_gettext as __
 
-from db.models import User, AccidentYear, Accident, AccidentCategory, Role
+from db.models import User, Accident, Role
 from bot.buttons.inline import (
     accident_years_keyboard,
     accident_list_keyboard,
@@ -35,18 +32,24 @@ from bot.utils.texts import (
     accident_file_error_text,
     accident_loading_text
 )
+from bot.utils.detail_renderer import render_detail, DetailAsset, DetailRenderError
+from bot.utils.navigation import render_screen, open_section, run_in_background
+from bot.utils.cache import cached
+from bot.utils.accident_summary import (
+    get_year_summaries,
+    get_year_category_counts,
+    get_year_accident_page,
+    find_year,
+    CategoryCount
+)
 
 accident_router = Router()
 
 # Constants
 ACCIDENTS_PER_PAGE = 15  # 3x5 grid
-CACHE_TTL = 300  # 5 minutes
 DELETE_CHUNK_SIZE = 10
 EXCLUDED_CATEGORY = "Xisobat"  # Statistikadan chiqarib tashlanadigan kategoriya
 
-# Cache
-_accident_cache: Dict[str, Tuple[any, datetime]] = {}
-
 
 # Message Store
 class MessageStore:
@@ -61,6 +64,11 @@ class MessageStore:
         self.user_messages[user_id][category].append(message_id)
         self._periodic_cleanup()
 
+    def store_messages(self, user_id: int, message_ids: list[int], category: str = "accident"):
+        """Store several message IDs at once"""
+        self.user_messages[user_id][category].extend(message_ids)
+        self._periodic_cleanup()
+
     def get_messages(self, user_id: int, category: str = "accident") -> list[int]:
         """Get user messages"""
         return list(self.user_messages[user_id][category])
@@ -95,6 +103,14 @@ async def store_message(user_id: int, category: str, message_id: int):
         pass
 
 
+async def store_messages(user_id: int, category: str, message_ids: list[int]):
+    """Store several messages with error handling"""
+    try:
+        message_store.store_messages(user_id, message_ids, category)
+    except Exception:
+        pass
+
+
 async def delete_user_messages(bot, user_id: int, category: str, exclude_ids: Optional[list[int]] = None):
     """Delete user messages in chunks"""
     msg_ids = message_store.get_messages(user_id, category)
@@ -128,64 +144,54 @@ async def send_clean_message(message: Message, text: str, reply_markup=None, par
     return sent
 
 
-async def get_cached_data(key: str, loader_func, *args) -> any:
-    """Get data from cache or load"""
-    now = datetime.now()
+async def get_years(session: AsyncSession):
+    """Year summaries from the shared cache (dropped when admin edits accidents)"""
+    return await cached("accident", "years", get_year_summaries, session, EXCLUDED_CATEGORY)
 
-    if key in _accident_cache:
-        data, timestamp = _accident_cache[key]
-        if (now - timestamp).seconds < CACHE_TTL:
-            return data
 
-    # Load fresh data
-    data = await loader_func(*args)
-    _accident_cache[key] = (data, now)
-    return data
+async def render_accident_screen(callback: CallbackQuery, state: FSMContext, text: str, keyboard):
+    """Render list screen: edit in place, or replace all detail messages when coming back from detail"""
+    data = await state.get_data()
+    detail_ids = data.get("accident_detail_ids") or []
 
+    if callback.message.message_id not in detail_ids:
+        sent, is_new = await render_screen(callback.message, text, keyboard)
+        if is_new:
+            await store_message(callback.from_user.id, "accident", sent.message_id)
+        return
 
-def extract_number(title: str) -> int:
-    """Extract number from title for proper sorting"""
-    match = re.search(r'\d+', title)
-    return int(match.group()) if match else 0
+    # Coming back from detail (image + document) - delete them while sending the list
+    await state.update_data(accident_detail_ids=[])
+    new_msg, _deleted = await asyncio.gather(
+        callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML"),
+        asyncio.gather(*[_safe_delete(callback.bot, callback.from_user.id, msg_id) for msg_id in detail_ids])
+    )
+    await store_message(callback.from_user.id, "accident", new_msg.message_id)
 
 
 # Main handler
-@accident_router.message(F.text == __("⚠️ Baxtsiz Hodisalar"))
+# Menyu tugmasi - bot/handlers/menu_routes.py orqali chaqiriladi
 async def show_accidents_main(message: Message, state: FSMContext, session: AsyncSession):
     """Main accident menu"""
     # Store user message
     await store_message(message.from_user.id, "accident", message.message_id)
 
-    # Remove reply keyboard
-    temp_msg = await message.answer(accident_loading_text(), reply_markup=ReplyKeyboardRemove())
-    await asyncio.sleep(0.1)
-    await temp_msg.delete()
-
     # Clear state
     await state.clear()
 
     # Get years with cache
-    async def load_years(session):
-        result = await session.execute(
-            select(AccidentYear)
-            .options(selectinload(AccidentYear.accidents))
-        )
-        years = result.scalars().all()
-        return sorted(years, key=lambda y: y.year_number, reverse=True)
-
-    years = await get_cached_data("accident_years", load_years, session)
+    years = await get_years(session)
 
     if not years:
-        await send_clean_message(message, accident_no_years_text(), category="accident")
-        return
+        text, keyboard = accident_no_years_text(), None
+    else:
+        text, keyboard = accident_main_text(), accident_years_keyboard(years)
 
-    # Send with keyboard
-    keyboard = accident_years_keyboard(years)
-    await send_clean_message(
-        message,
-        accident_main_text(),
-        reply_markup=keyboard,
-        category="accident"
+    # Reply keyboard olib tashlash + ekran bir vaqtda, eski xabarlar fonda o'chiriladi
+    sent = await open_section(message, text, keyboard, placeholder=accident_loading_text())
+    await store_message(message.from_user.id, "accident", sent.message_id)
+    run_in_background(
+        delete_user_messages(message.bot, message.from_user.id, "accident", exclude_ids=[sent.message_id])
     )
 
 
@@ -199,53 +205,29 @@ async def show_year_accidents(callback: CallbackQuery, state: FSMContext, sessio
     year_id = int(data_parts[1])
     page = int(data_parts[2]) if len(data_parts) > 2 else 1
 
-    # Check if we're coming from detail page (need to clean messages)
-    if hasattr(callback, 'message') and callback.message:
-        # Check if there are stored messages (indicates we're coming from detail)
-        stored_messages = message_store.get_messages(callback.from_user.id, "accident")
-        if len(stored_messages) > 1:  # More than 1 message means we have images/docs
-            # Clean all previous messages when coming from detail
-            await delete_user_messages(callback.bot, callback.from_user.id, "accident")
-
-    # Get year with accidents
-    async def load_year_accidents(session, year_id):
-        result = await session.execute(
-            select(AccidentYear)
-            .options(selectinload(AccidentYear.accidents))
-            .where(AccidentYear.id == year_id)
-        )
-        return result.scalar_one_or_none()
-
-    year_obj = await get_cached_data(f"year_{year_id}", load_year_accidents, session, year_id)
+    # Year summary (name + count) from the aggregate view
+    years = await get_years(session)
+    year_obj = find_year(years, year_id)
 
     if not year_obj:
         await callback.answer(accident_error_text(), show_alert=True)
         return
 
-    if not year_obj.accidents:
+    if not year_obj.accident_count:
         text = accident_no_accidents_text(year_obj.name)
         keyboard = accident_empty_year_keyboard()
 
-        # If messages were cleaned, send new message, otherwise edit
-        if len(message_store.get_messages(callback.from_user.id, "accident")) == 0:
-            new_msg = await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
-            await store_message(callback.from_user.id, "accident", new_msg.message_id)
-        else:
-            await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
+        await render_accident_screen(callback, state, text, keyboard)
         return
 
-    # Pagination with proper sorting
-    accidents = sorted(year_obj.accidents, key=lambda x: extract_number(x.title))
-    total_items = len(accidents)
+    # Pagination - only the current page is loaded (id + title)
+    total_items = year_obj.accident_count
     total_pages = (total_items + ACCIDENTS_PER_PAGE - 1) // ACCIDENTS_PER_PAGE
 
     # Validate page
     page = max(1, min(page, total_pages))
 
-    # Current page items
-    start_idx = (page - 1) * ACCIDENTS_PER_PAGE
-    end_idx = min(start_idx + ACCIDENTS_PER_PAGE, total_items)
-    current_accidents = accidents[start_idx:end_idx]
+    current_accidents = await get_year_accident_page(session, year_id, page, ACCIDENTS_PER_PAGE)
 
     # Text and keyboard
     text = accident_year_header_text(year_obj.name, total_items, page, total_pages)
@@ -256,21 +238,12 @@ async def show_year_accidents(callback: CallbackQuery, state: FSMContext, sessio
         total_pages=total_pages
     )
 
-    # If messages were cleaned, send new message, otherwise edit
-    if len(message_store.get_messages(callback.from_user.id, "accident")) == 0:
-        new_msg = await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
-        await store_message(callback.from_user.id, "accident", new_msg.message_id)
-    else:
-        # Use edit_text for pagination (tez ishlaydi)
-        await callback.message.edit_text(
-            text,
-            reply_markup=keyboard,
-            parse_mode="HTML"
-        )
+    # Edit in place for pagination, replace detail messages when coming back from detail
+    await render_accident_screen(callback, state, text, keyboard)
 
 
 @accident_router.callback_query(F.data.startswith("accident_detail:"))
-async def show_accident_detail(callback: CallbackQuery, session: AsyncSession):
+async def show_accident_detail(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
     """Show accident details with image and document"""
     await callback.answer()
 
@@ -291,50 +264,41 @@ async def show_accident_detail(callback: CallbackQuery, session: AsyncSession):
         await callback.answer(accident_error_text(), show_alert=True)
         return
 
-    # Clean all previous messages for this user
-    await delete_user_messages(callback.bot, callback.from_user.id, "accident")
+    detail_text = accident_detail_text(
+        accident.title,
+        accident.year.name,
+        accident.category.name,
+        getattr(accident, 'description', None)  # Add description if exists
+    )
+    keyboard = accident_detail_keyboard(accident.year_id)
 
     try:
-        # 1. Send image if exists
-        if accident.file_image:
-            try:
-                img_msg = await callback.message.answer_photo(
-                    photo=accident.file_image
-                )
-                await store_message(callback.from_user.id, "accident", img_msg.message_id)
-            except Exception:
-                pass  # If image fails, continue
-
-        # 2. Send document
-        doc_msg = await callback.message.answer_document(
-            document=accident.file_pdf
-        )
-        await store_message(callback.from_user.id, "accident", doc_msg.message_id)
-
-        # 3. Send details with keyboard
-        detail_text = accident_detail_text(
-            accident.title,
-            accident.year.name,
-            accident.category.name,
-            getattr(accident, 'description', None)  # Add description if exists
-        )
-        keyboard = accident_detail_keyboard(accident.year_id)
-
-        detail_msg = await callback.message.answer(
-            text=detail_text,
+        # Image + document (text in document caption), old messages deleted in parallel
+        message_ids = await render_detail(
+            callback.bot,
+            callback.message.chat.id,
+            [
+                DetailAsset("photo", accident.file_image, required=False),
+                DetailAsset("document", accident.file_pdf),
+            ],
+            detail_text,
             reply_markup=keyboard,
-            parse_mode="HTML"
+            cleanup=delete_user_messages(callback.bot, callback.from_user.id, "accident")
         )
-        await store_message(callback.from_user.id, "accident", detail_msg.message_id)
+        await store_messages(callback.from_user.id, "accident", message_ids)
+        await state.update_data(accident_detail_ids=message_ids)
+
+    except DetailRenderError as e:
+        await store_messages(callback.from_user.id, "accident", e.message_ids)
 
-    except Exception:
         # If document fails, send error message
         error_msg = await callback.message.answer(
             text=accident_file_error_text(),
-            reply_markup=accident_detail_keyboard(accident.year_id),
+            reply_markup=keyboard,
             parse_mode="HTML"
         )
         await store_message(callback.from_user.id, "accident", error_msg.message_id)
+        await state.update_data(accident_detail_ids=e.message_ids + [error_msg.message_id])
 
 
 @accident_router.callback_query(F.data == "accident_statistics_main")
@@ -342,28 +306,13 @@ async def show_main_statistics(callback: CallbackQuery, session: AsyncSession):
     """Show main statistics (excluding 'Xisobat' category)"""
     await callback.answer()
 
-    # Total count (excluding 'Xisobat')
-    result = await session.execute(
-        select(func.count(Accident.id))
-        .join(AccidentCategory)
-        .where(AccidentCategory.name != EXCLUDED_CATEGORY)
-    )
-    total_count = result.scalar() or 0
-
-    # Year statistics (excluding 'Xisobat' category)
-    result = await session.execute(
-        select(
-            AccidentYear.name,
-            func.count(Accident.id).label('count')
-        )
-        .join(Accident)
-        .join(AccidentCategory)
-        .where(AccidentCategory.name != EXCLUDED_CATEGORY)
-        .group_by(AccidentYear.id, AccidentYear.name)
-        .order_by(AccidentYear.name.desc())
-        .limit(10)  # Increased to get more years for comparison
-    )
-    year_stats = result.all()
+    # Total and per-year counts (excluding 'Xisobat') - one query on the aggregate view
+    years = await get_years(session)
+    total_count = sum(year.reported_count for year in years)
+    year_stats = [
+        CategoryCount(year.name, year.reported_count)
+        for year in years if year.reported_count
+    ][:10]  # Increased to get more years for comparison
 
     # Check if there's any data
     if total_count == 0:
@@ -375,12 +324,10 @@ async def show_main_statistics(callback: CallbackQuery, session: AsyncSession):
 
     keyboard = accident_statistics_main_keyboard()
 
-    # Use edit_text for statistics (tez ishlaydi)
-    await callback.message.edit_text(
-        text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
-    )
+    # Edit in place for statistics (tez ishlaydi)
+    sent, is_new = await render_screen(callback.message, text, keyboard)
+    if is_new:
+        await store_message(callback.from_user.id, "accident", sent.message_id)
 
 
 @accident_router.callback_query(F.data.startswith("accident_statistics_year:"))
@@ -391,32 +338,15 @@ async def show_year_statistics(callback: CallbackQuery, session: AsyncSession):
     year_id = int(callback.data.split(":")[1])
 
     # Get year
-    result = await session.execute(
-        select(AccidentYear).where(AccidentYear.id == year_id)
-    )
-    year_obj = result.scalar_one_or_none()
+    years = await get_years(session)
+    year_obj = find_year(years, year_id)
 
     if not year_obj:
         await callback.answer(accident_error_text(), show_alert=True)
         return
 
     # Category statistics for this year (excluding 'Xisobat')
-    result = await session.execute(
-        select(
-            AccidentCategory.name,
-            func.count(Accident.id).label('count')
-        )
-        .join(Accident)
-        .where(
-            and_(
-                Accident.year_id == year_id,
-                AccidentCategory.name != EXCLUDED_CATEGORY
-            )
-        )
-        .group_by(AccidentCategory.id)
-        .order_by(func.count(Accident.id).desc())
-    )
-    category_stats = result.all()
+    category_stats = await get_year_category_counts(session, year_id, EXCLUDED_CATEGORY)
 
     # Total count (excluding 'Xisobat')
     total = sum(stat.count for stat in category_stats)
@@ -425,12 +355,10 @@ async def show_year_statistics(callback: CallbackQuery, session: AsyncSession):
     text = accident_statistics_year_text(year_obj.name, total, category_stats)
     keyboard = accident_statistics_year_keyboard(year_id)
 
-    # Use edit_text for statistics (tez ishlaydi)
-    await callback.message.edit_text(
-        text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
-    )
+    # Edit in place for statistics (tez ishlaydi)
+    sent, is_new = await render_screen(callback.message, text, keyboard)
+    if is_new:
+        await store_message(callback.from_user.id, "accident", sent.message_id)
 
 
 @accident_router.callback_query(F.data == "accident_back_to_years")
@@ -438,31 +366,13 @@ async def back_to_years(callback: CallbackQuery, state: FSMContext, session: Asy
     """Back to years list"""
     await callback.answer()
 
-    # Clean all accident messages first
-    await delete_user_messages(callback.bot, callback.from_user.id, "accident")
+    # Get years (cache is versioned - admin changes are picked up automatically)
+    years = await get_years(session)
 
-    # Clear cache to get fresh data
-    if "accident_years" in _accident_cache:
-        del _accident_cache["accident_years"]
-
-    # Get years
-    result = await session.execute(
-        select(AccidentYear)
-        .options(selectinload(AccidentYear.accidents))
-    )
-    years = result.scalars().all()
-    years = sorted(years, key=lambda y: y.year_number, reverse=True)
-
-    # Send new message
     text = accident_main_text()
     keyboard = accident_years_keyboard(years)
 
-    new_msg = await callback.message.answer(
-        text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
-    )
-    await store_message(callback.from_user.id, "accident", new_msg.message_id)
+    await render_accident_screen(callback, state, text, keyboard)
 
 
 @accident_router.callback_query(F.data == "accident_back_from_stats")
@@ -1,9 +1,9 @@
 # bot/handlers/ai_assistant_handler.py
 
-import os
 import time
 import asyncio
-from typing import Dict, List, Optional, Tuple
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 
@@ -15,11 +15,6 @@ from aiogram.utils.i18n import lazy_gettext as __
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-# AI Libraries
-import google.generativeai as genai
-from groq import Groq
-from together import Together
-
 from db.models import User
 from bot.states import AIStates  # Import qilindi
 from bot.buttons.inline import ai_limits_keyboard
@@ -33,6 +28,8 @@ from bot.utils.texts import (
     ai_back_to_chat_text,
     ai_limits_status_text,
     ai_response_text,
+    ai_response_header_text,
+    ai_response_footer_text,
     ai_other_messages_text,
     get_main_text,
     # Input validation texts
@@ -42,15 +39,21 @@ from bot.utils.texts import (
     ai_input_duplicate_text,
     # Timeout texts
     ai_timeout_text,
-    ai_processing_long_text
+    ai_processing_long_text,
+    ai_superseded_text
 )
+from bot.utils.navigation import remove_reply_keyboard, run_in_background
+from bot.utils.ai_providers import AIProvider, build_providers
+from bot.utils.ai_routing import AIRouter
+from bot.utils.ai_streaming import StreamingReply
+from bot.utils.ai_answer_cache import answer_cache, CachedAnswer
+from bot.utils.ai_retrieval import retrieve_context
+from bot.utils.ai_quota import ai_quota, user_subject, service_subject
+from bot.utils.ai_memory import ai_memory, pack_turns, Turn
+from bot.utils.ai_inflight import ai_inflight
 
 ai_router = Router()
-
-# Configure AI services
-genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
-groq_client = Groq(api_key=os.getenv('GROQ_API_KEY'))
-together_client = Together(api_key=os.getenv('TOGETHER_API_KEY'))
+logger = logging.getLogger(__name__)
 
 # 🎯 CONSTANTS
 MAX_MESSAGES_PER_USER = 50
@@ -63,22 +66,36 @@ DELETE_CHUNK_SIZE = 20
 AI_REQUEST_TIMEOUT = 35  # sekund
 GROQ_REQUEST_TIMEOUT = 30  # sekund (Groq tezroq)
 TOGETHER_REQUEST_TIMEOUT = 40  # sekund (Together.ai uchun)
-MAX_RETRIES_ON_TIMEOUT = 2
 LONG_PROCESSING_WARNING_TIME = 20  # sekund
+AI_STREAMING = True  # javobni bo'laklab ko'rsatish (False - to'liq javobni kutish)
+ANSWER_CACHE_CONTEXT_WINDOW = 600  # sekund - shu vaqt ichida suhbat bo'lsa javob keshlanmaydi
+
+# Async AI provayderlar (umumiy HTTP/2 pool, har biriga alohida parallel limit)
+_ai_providers: Optional[Dict[str, AIProvider]] = None
+ai_routing = AIRouter()
+
+
+def get_ai_providers() -> Dict[str, AIProvider]:
+    """Provayderlar birinchi savolda yaratiladi (API kalitlari ham shunda o'qiladi)"""
+    global _ai_providers
+
+    if _ai_providers is None:
+        _ai_providers = build_providers(AI_REQUEST_TIMEOUT, GROQ_REQUEST_TIMEOUT, TOGETHER_REQUEST_TIMEOUT)
+    return _ai_providers
 
-# Rate limiting
-user_requests: Dict[int, List[float]] = {}
-user_conversations: Dict[int, List[Dict[str, str]]] = {}
+# Suhbat konteksti uchun token budjeti (provayder bo'yicha)
+CONTEXT_TOKEN_BUDGET = {"google": 1500, "groq": 1200, "together": 1000}
+CONTEXT_MAX_TURNS = {"google": 10, "groq": 10, "together": 8}
 
 # Per user limits
 MAX_USER_REQUESTS_HOUR = 15  # Together.ai uchun ko'proq
 MAX_USER_REQUESTS_DAY = 50
 
-# Service usage tracking
-service_usage = {
-    "google": {"requests": [], "max_hour": 100, "max_day": 1000},
-    "groq": {"requests": [], "max_hour": 200, "max_day": 2000},
-    "together": {"requests": [], "max_hour": 30, "max_day": 300}
+# Service limits (hisoblagichlar ai_usage_buckets jadvalida - barcha workerlar uchun umumiy)
+service_limits = {
+    "google": {"max_hour": 100, "max_day": 1000},
+    "groq": {"max_hour": 200, "max_day": 2000},
+    "together": {"max_hour": 30, "max_day": 300}
 }
 
 
@@ -207,12 +224,13 @@ async def validate_user_input(message: Message, user_id: int) -> bool:
 
     # 4. Takroriy xabarni tekshirish (oxirgi 5 daqiqada)
     now = time.time()
-    if user_id in user_conversations:
+    history = await ai_memory.get(user_id)
+    if history:
         recent_messages = [
-            msg for msg in user_conversations[user_id]
-            if msg.get("timestamp", now) > now - 300  # 5 daqiqa
+            turn for turn in history
+            if turn.timestamp > now - 300  # 5 daqiqa
         ]
-        if any(msg.get("content") == message.text for msg in recent_messages):
+        if any(turn.content == message.text for turn in recent_messages):
             error_msg = await message.answer(
                 ai_input_duplicate_text(),
                 parse_mode="HTML"
@@ -224,79 +242,73 @@ async def validate_user_input(message: Message, user_id: int) -> bool:
 
 
 # Helper functions
-def clean_old_requests() -> None:
-    """Clean old requests from tracking"""
-    now = time.time()
-    day_ago = now - 86400
-
-    # Clean user requests
-    for user_id in list(user_requests.keys()):
-        user_requests[user_id] = [req for req in user_requests[user_id] if req > day_ago]
-        if not user_requests[user_id]:
-            del user_requests[user_id]
-
-    # Clean service usage
-    for service in service_usage.values():
-        service["requests"] = [req for req in service["requests"] if req > day_ago]
-
-
-def check_user_limit(user_id: int) -> Tuple[bool, str]:
+async def check_user_limit(user_id: int) -> Tuple[bool, str]:
     """Check user's personal limits"""
-    clean_old_requests()
-    now = time.time()
-    hour_ago = now - 3600
-
-    if user_id not in user_requests:
-        user_requests[user_id] = []
-
-    recent_requests = [req for req in user_requests[user_id] if req > hour_ago]
+    subject = user_subject(user_id)
+    usage = (await ai_quota.usage(subject))[subject]
 
-    if len(recent_requests) >= MAX_USER_REQUESTS_HOUR:
-        minutes_until_reset = 60 - int((now - min(recent_requests)) / 60)
+    if usage.hour >= MAX_USER_REQUESTS_HOUR:
+        minutes_until_reset = await ai_quota.minutes_until_hourly_reset(subject)
         return False, f"Soatlik limitingiz tugadi ({MAX_USER_REQUESTS_HOUR} ta). {minutes_until_reset} daqiqadan so'ng yangilanadi"
 
-    if len(user_requests[user_id]) >= MAX_USER_REQUESTS_DAY:
+    if usage.day >= MAX_USER_REQUESTS_DAY:
         return False, f"Kunlik limitingiz tugadi ({MAX_USER_REQUESTS_DAY} ta)"
 
     return True, ""
 
 
-def can_use_service(service_name: str) -> bool:
-    """Check if service can be used"""
-    now = time.time()
-    hour_ago = now - 3600
-
-    service = service_usage[service_name]
-    recent_requests = [req for req in service["requests"] if req > hour_ago]
+async def get_available_services() -> List[str]:
+    """Limiti tugamagan xizmatlar (ustuvorlik tartibida)"""
+    usage = await ai_quota.usage(*(service_subject(name) for name in service_limits))
 
-    return len(recent_requests) < service["max_hour"] and len(service["requests"]) < service["max_day"]
+    return [
+        name for name, limits in service_limits.items()
+        if usage[service_subject(name)].hour < limits["max_hour"]
+        and usage[service_subject(name)].day < limits["max_day"]
+    ]
 
 
-def get_conversation_context(user_id: int) -> str:
-    """Get last 5 messages for context"""
-    if user_id not in user_conversations:
+def get_conversation_context(history: List[Turn]) -> str:
+    """Token budjetiga sig'adigan oxirgi xabarlar - Gemini prompti uchun"""
+    turns = pack_turns(history, CONTEXT_TOKEN_BUDGET["google"], CONTEXT_MAX_TURNS["google"])
+    if not turns:
         return ""
 
-    recent_messages = user_conversations[user_id][-10:]
     context = "Oldingi suhbat:\n"
-    for msg in recent_messages:
-        if msg["role"] == "user":
-            context += f"Savol: {msg['content']}\n"
+    for turn in turns:
+        if turn.role == "user":
+            context += f"Savol: {turn.content}\n"
         else:
-            context += f"Javob: {msg['content'][:100]}...\n"
+            context += f"Javob: {turn.content}\n"
 
     return context + "\n"
 
 
-async def call_google_gemini(question: str, user_name: str, user_id: int) -> Tuple[bool, str]:
-    """Call Google Gemini API with context and timeout protection"""
-    try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        context = get_conversation_context(user_id)
+def history_messages(history: List[Turn], provider_name: str) -> List[Dict[str, str]]:
+    """Suhbat tarixi chat xabarlari ko'rinishida (provayder token budjeti bo'yicha)"""
+    turns = pack_turns(history, CONTEXT_TOKEN_BUDGET[provider_name], CONTEXT_MAX_TURNS[provider_name])
+    return [{"role": turn.role, "content": turn.content} for turn in turns]
+
+
+def knowledge_prompt(knowledge: str) -> str:
+    """Bot bazasidan topilgan parchalar (RAG) - javob shularga tayansin"""
+    if not knowledge:
+        return ""
+    return (
+        "Korxona ma'lumotlari (baxtsiz hodisalar, hujjatlar, jihozlar). "
+        "Savol shularga tegishli bo'lsa, javobni shu ma'lumotlarga asoslab ber:\n"
+        f"{knowledge}\n\n"
+    )
 
-        prompt = f"""Sen yordamchi AI assistantsiz. O'zbek tilida javob ber.
 
-{context}
+def build_gemini_messages(question: str, user_name: str, history: List[Turn],
+                          knowledge: str = "") -> List[Dict[str, str]]:
+    """Google Gemini uchun prompt (suhbat konteksti bilan)"""
+    context = get_conversation_context(history)
+
+    prompt = f"""Sen yordamchi AI assistantsiz. O'zbek tilida javob ber.
+
+{knowledge_prompt(knowledge)}{context}
 
 Foydalanuvchi: {user_name}
 Yangi savol: {question}
@@ -306,213 +318,154 @@ Javobni formatlashda markdown ishlatma. Oddiy matn formatida javob ber.
 Agar savol murakkab bo'lsa, bosqichma-bosqich tushuntir.
 Agar qo'shimcha ma'lumot kerak bo'lsa, qisqa va foydali internet manbalarini taklif qil."""
 
-        # ⏰ TIMEOUT PROTECTION
-        def generate_content():
-            return model.generate_content(prompt)
-
-        response = await asyncio.wait_for(
-            asyncio.to_thread(generate_content),
-            timeout=AI_REQUEST_TIMEOUT
-        )
+    return [{"role": "user", "content": prompt}]
 
-        if response.text:
-            service_usage["google"]["requests"].append(time.time())
 
-            if user_id not in user_conversations:
-                user_conversations[user_id] = []
+def build_groq_messages(question: str, user_name: str, history: List[Turn],
+                        knowledge: str = "") -> List[Dict[str, str]]:
+    """Groq uchun chat xabarlari"""
+    messages = [
+        {
+            "role": "system",
+            "content": """Siz yordamchi AI assistantsiz. O'zbek tilida javob bering. 
+To'liq, batafsil va foydali javoblar bering. Oldingi suhbatni yodda tuting.
+Javoblarni oddiy matn formatida bering, markdown ishlatmang.
+Murakkab savollarni bosqichma-bosqich tushuntiring.
+Qo'shimcha ma'lumot kerak bo'lsa, foydali manbalarni taklif qiling."""
+        }
+    ]
 
-            user_conversations[user_id].append({"role": "user", "content": question, "timestamp": time.time()})
-            user_conversations[user_id].append(
-                {"role": "assistant", "content": response.text.strip(), "timestamp": time.time()})
+    if knowledge:
+        messages.append({"role": "system", "content": knowledge_prompt(knowledge)})
 
-            if len(user_conversations[user_id]) > 20:
-                user_conversations[user_id] = user_conversations[user_id][-20:]
+    messages.extend(history_messages(history, "groq"))
 
-            return True, response.text.strip()
-        else:
-            return False, "Google Gemini javob bermadi"
+    messages.append({
+        "role": "user",
+        "content": f"Foydalanuvchi: {user_name}\nSavol: {question}"
+    })
+    return messages
 
-    except asyncio.TimeoutError:
-        print(f"Google Gemini timeout for user {user_id}")
-        return False, "AI xizmati javob bermadi (timeout)"
-    except Exception as e:
-        print(f"Google Gemini Error: {e}")
-        return False, str(e)
 
+def build_together_messages(question: str, user_name: str, history: List[Turn],
+                            knowledge: str = "") -> List[Dict[str, str]]:
+    """Together.ai uchun chat xabarlari"""
+    messages = [
+        {
+            "role": "system",
+            "content": """Sen professional AI yordamchisiz. O'zbek tilida javob ber.
+Sifatli, aniq va foydali javoblar ber. Foydalanuvchiga yordam berish uchun bor.
+Javoblarni tushunishga oson qilib ber. Agar savol murakkab bo'lsa, bosqichma-bosqich tushuntir.
+Markdown formatini ishlatma, oddiy matn formatida javob ber."""
+        }
+    ]
 
-async def call_groq_api(question: str, user_name: str, user_id: int) -> Tuple[bool, str]:
-    """Call Groq API with context and timeout protection"""
-    try:
-        messages = [
-            {
-                "role": "system",
-                "content": """Siz yordamchi AI assistantsiz. O'zbek tilida javob bering. 
-To'liq, batafsil va foydali javoblar bering. Oldingi suhbatni yodda tuting.
-Javoblarni oddiy matn formatida bering, markdown ishlatmang.
-Murakkab savollarni bosqichma-bosqich tushuntiring.
-Qo'shimcha ma'lumot kerak bo'lsa, foydali manbalarni taklif qiling."""
-            }
-        ]
+    if knowledge:
+        messages.append({"role": "system", "content": knowledge_prompt(knowledge)})
 
-        if user_id in user_conversations:
-            for msg in user_conversations[user_id][-10:]:
-                if msg["role"] == "user":
-                    messages.append({"role": "user", "content": msg["content"]})
-                else:
-                    messages.append({"role": "assistant", "content": msg["content"]})
-
-        messages.append({
-            "role": "user",
-            "content": f"Foydalanuvchi: {user_name}\nSavol: {question}"
-        })
-
-        # ⏰ TIMEOUT PROTECTION
-        def create_completion():
-            return groq_client.chat.completions.create(
-                model="llama-3.1-8b-instant",  # Yangilangan model
-                messages=messages,
-                max_tokens=800,
-                temperature=0.7
-            )
+    # Add conversation history
+    messages.extend(history_messages(history, "together"))
 
-        response = await asyncio.wait_for(
-            asyncio.to_thread(create_completion),
-            timeout=GROQ_REQUEST_TIMEOUT
-        )
+    # Add current question
+    messages.append({
+        "role": "user",
+        "content": f"Foydalanuvchi: {user_name}\nSavol: {question}"
+    })
+    return messages
 
-        if response.choices and response.choices[0].message:
-            service_usage["groq"]["requests"].append(time.time())
 
-            if user_id not in user_conversations:
-                user_conversations[user_id] = []
+# Ustuvorlik tartibi: Google (tekin) -> Groq (tekin) -> Together.ai (pullik, lekin ishonchli)
+MESSAGE_BUILDERS = {
+    "google": build_gemini_messages,
+    "groq": build_groq_messages,
+    "together": build_together_messages,
+}
 
-            user_conversations[user_id].append({"role": "user", "content": question, "timestamp": time.time()})
-            user_conversations[user_id].append(
-                {"role": "assistant", "content": response.choices[0].message.content.strip(), "timestamp": time.time()})
 
-            if len(user_conversations[user_id]) > 20:
-                user_conversations[user_id] = user_conversations[user_id][-20:]
+def track_service_usage(provider: AIProvider):
+    """Yuborilgan har bir so'rov (hedge ham) xizmat limitiga yoziladi"""
+    ai_quota.hit(service_subject(provider.name))
 
-            return True, response.choices[0].message.content.strip()
-        else:
-            return False, "Groq javob bermadi"
 
-    except asyncio.TimeoutError:
-        print(f"Groq timeout for user {user_id}")
-        return False, "AI xizmati javob bermadi (timeout)"
-    except Exception as e:
-        print(f"Groq API Error: {e}")
-        return False, str(e)
+async def build_candidates(question: str, user_name: str, user_id: int,
+                           knowledge: str = "") -> List[Tuple[AIProvider, List[Dict[str, str]]]]:
+    """Limiti tugamagan provayderlar va ularning xabarlari (ustuvorlik tartibida)"""
+    services = await get_available_services()
+    history = await ai_memory.get(user_id)
+    return [
+        (get_ai_providers()[name], MESSAGE_BUILDERS[name](question, user_name, history, knowledge))
+        for name in services
+    ]
 
 
-async def call_together_api(question: str, user_name: str, user_id: int) -> Tuple[bool, str]:
-    """Call Together.ai API as fallback"""
-    try:
-        messages = [
-            {
-                "role": "system",
-                "content": """Sen professional AI yordamchisiz. O'zbek tilida javob ber.
-Sifatli, aniq va foydali javoblar ber. Foydalanuvchiga yordam berish uchun bor.
-Javoblarni tushunishga oson qilib ber. Agar savol murakkab bo'lsa, bosqichma-bosqich tushuntir.
-Markdown formatini ishlatma, oddiy matn formatida javob ber."""
-            }
-        ]
+async def get_ai_response(question: str, user_name: str, user_id: int,
+                          knowledge: str = "") -> Tuple[bool, str, str]:
+    """Sog'lom provayderlar orasida hedge bilan so'rov - birinchi yaxshi javob olinadi"""
+    result = await ai_routing.route(
+        await build_candidates(question, user_name, user_id, knowledge), on_attempt=track_service_usage
+    )
+    if not result.ok:
+        logger.warning(f"AI request failed for user {user_id}: {result.text}")
+        return False, result.text, ""
 
-        # Add conversation history
-        if user_id in user_conversations:
-            for msg in user_conversations[user_id][-8:]:
-                if msg["role"] == "user":
-                    messages.append({"role": "user", "content": msg["content"]})
-                else:
-                    messages.append({"role": "assistant", "content": msg["content"]})
-
-        # Add current question
-        messages.append({
-            "role": "user",
-            "content": f"Foydalanuvchi: {user_name}\nSavol: {question}"
-        })
-
-        def create_completion():
-            return together_client.chat.completions.create(
-                model="meta-llama/Llama-3-70b-chat-hf",
-                messages=messages,
-                max_tokens=800,
-                temperature=0.7,
-                top_p=0.9,
-                stream=False
-            )
+    await ai_memory.append(user_id, question, result.text)
+    return True, result.text, result.provider.label
 
-        response = await asyncio.wait_for(
-            asyncio.to_thread(create_completion),
-            timeout=TOGETHER_REQUEST_TIMEOUT
-        )
 
-        if response.choices and response.choices[0].message:
-            service_usage["together"]["requests"].append(time.time())
+async def has_recent_conversation(user_id: int) -> bool:
+    """Oxirgi savol-javob yaqinda bo'lganmi (prompt suhbat kontekstiga bog'liq)"""
+    history = await ai_memory.get(user_id)
+    return bool(history) and history[-1].timestamp > time.time() - ANSWER_CACHE_CONTEXT_WINDOW
 
-            if user_id not in user_conversations:
-                user_conversations[user_id] = []
 
-            user_conversations[user_id].append({
-                "role": "user",
-                "content": question,
-                "timestamp": time.time()
-            })
-            user_conversations[user_id].append({
-                "role": "assistant",
-                "content": response.choices[0].message.content.strip(),
-                "timestamp": time.time()
-            })
+async def show_cached_answer(waiting_msg: Message, user_id: int, cached_answer: CachedAnswer):
+    """Keshdagi javobni ko'rsatish (uzun bo'lsa davomi yangi xabarda)"""
+    async def store_continuation(msg: Message):
+        await store_message(user_id, "ai", msg.message_id)
 
-            if len(user_conversations[user_id]) > 20:
-                user_conversations[user_id] = user_conversations[user_id][-20:]
+    reply = StreamingReply(waiting_msg, ai_response_header_text(), on_new_message=store_continuation)
+    await reply.feed(cached_answer.answer)
+    await reply.finish(ai_response_footer_text(cached_answer.service_used))
 
-            return True, response.choices[0].message.content.strip()
-        else:
-            return False, "Together AI javob bermadi"
 
-    except asyncio.TimeoutError:
-        print(f"Together AI timeout for user {user_id}")
-        return False, "AI xizmati javob bermadi (timeout)"
-    except Exception as e:
-        print(f"Together AI Error: {e}")
-        return False, f"Xatolik yuz berdi: {str(e)}"
+async def stream_ai_response(waiting_msg: Message, question: str, user_name: str, user_id: int,
+                             on_first_token: Callable[[], None], cacheable: bool = False,
+                             knowledge: str = "") -> Tuple[bool, str]:
+    """Javobni oqim bilan ko'rsatish: (yetkazildimi, xato matni)"""
+    result = await ai_routing.route_stream(
+        await build_candidates(question, user_name, user_id, knowledge), on_attempt=track_service_usage
+    )
+    on_first_token()
 
+    if not result.ok:
+        logger.warning(f"AI request failed for user {user_id}: {result.text}")
+        return False, result.text
 
-async def get_ai_response_with_retry(question: str, user_name: str, user_id: int) -> Tuple[bool, str, str]:
-    """Get AI response with failover strategy: Google -> Groq -> Together.ai"""
+    async def store_continuation(msg: Message):
+        await store_message(user_id, "ai", msg.message_id)
 
-    for attempt in range(MAX_RETRIES_ON_TIMEOUT):
-        try:
-            # 1. Try Google Gemini first (tekin)
-            if can_use_service("google"):
-                success, response = await call_google_gemini(question, user_name, user_id)
-                if success:
-                    return True, response, "Google Gemini"
-
-            # 2. Fallback to Groq (tekin)
-            if can_use_service("groq"):
-                success, response = await call_groq_api(question, user_name, user_id)
-                if success:
-                    return True, response, "Groq"
-
-            # 3. Final fallback to Together.ai (pullik, lekin ishonchli)
-            if can_use_service("together"):
-                success, response = await call_together_api(question, user_name, user_id)
-                if success:
-                    return True, response, "Together AI (Llama-3-70B)"
+    reply = StreamingReply(waiting_msg, ai_response_header_text(), on_new_message=store_continuation)
+    completed = False
+    try:
+        async for chunk in result.chunks:
+            await reply.feed(chunk)
+        completed = True
+    except Exception as e:
+        # Oqim o'rtada uzildi - olingan qism baribir ko'rsatiladi
+        logger.warning(f"AI stream interrupted for user {user_id}: {e}")
 
-        except Exception as e:
-            print(f"AI request attempt {attempt + 1} failed: {e}")
-            if attempt < MAX_RETRIES_ON_TIMEOUT - 1:
-                await asyncio.sleep(2)  # 2 sekund kutish
+    answer = (await reply.finish(ai_response_footer_text(result.provider.label))).strip()
+    await ai_memory.append(user_id, question, answer)
 
-    return False, "Barcha AI xizmatlar javob bermadi", ""
+    # Faqat to'liq javob keshlanadi
+    if cacheable and completed:
+        answer_cache.store(question, answer, result.provider.label)
+    return True, ""
 
 
 # 🤖 HANDLERS
 
-@ai_router.message(F.text == __("🤖 AI Yordamchi"))
+# Menyu tugmasi - bot/handlers/menu_routes.py orqali chaqiriladi
 async def start_ai_assistant(message: Message, state: FSMContext, session: AsyncSession):
     """Start AI assistant"""
     user_id = message.from_user.id
@@ -525,8 +478,8 @@ async def start_ai_assistant(message: Message, state: FSMContext, session: Async
     await delete_user_messages(message.bot, user_id, "menu")
 
     # Conversation tozalash
-    if user_id in user_conversations:
-        del user_conversations[user_id]
+    ai_inflight.cancel(user_id)
+    await ai_memory.clear(user_id)
 
     # State o'rnatish
     await state.clear()
@@ -560,7 +513,7 @@ async def start_ai_assistant(message: Message, state: FSMContext, session: Async
         __("🗑 Chatni tozalash")
     ]
 )
-async def process_text_question(message: Message, state: FSMContext):
+async def process_text_question(message: Message, state: FSMContext, session: AsyncSession):
     """Process text question with timeout protection"""
     user_id = message.from_user.id
 
@@ -571,8 +524,16 @@ async def process_text_question(message: Message, state: FSMContext):
 
     await store_message(user_id, "ai", message.message_id)
 
+    # 🔁 Bir vaqtda bitta generatsiya: bir xil savol mavjudiga qo'shiladi, yangisi eskisini bekor qiladi
+    await ai_inflight.run(user_id, message.text, lambda: answer_question(message, session))
+
+
+async def answer_question(message: Message, session: AsyncSession):
+    """Limit, kesh va AI javobi - ai_inflight orqali chaqiriladi"""
+    user_id = message.from_user.id
+
     # Check user limits
-    can_proceed, limit_msg = check_user_limit(user_id)
+    can_proceed, limit_msg = await check_user_limit(user_id)
     if not can_proceed:
         limit_msg_obj = await message.answer(
             ai_limit_text(limit_msg),
@@ -582,7 +543,7 @@ async def process_text_question(message: Message, state: FSMContext):
         return
 
     # Add to user tracking
-    user_requests[user_id].append(time.time())
+    ai_quota.hit(user_subject(user_id))
 
     # ⌨️ Typing action
     await message.bot.send_chat_action(chat_id=user_id, action="typing")
@@ -594,6 +555,17 @@ async def process_text_question(message: Message, state: FSMContext):
     )
     await store_message(user_id, "ai", waiting_msg.message_id)
 
+    # 💾 Takroriy savol keshdan (suhbatga bog'liq bo'lmagan savollar uchun)
+    cacheable = not await has_recent_conversation(user_id)
+    cached_answer = answer_cache.lookup(message.text) if cacheable else None
+    if cached_answer:
+        try:
+            await show_cached_answer(waiting_msg, user_id, cached_answer)
+            await ai_memory.append(user_id, message.text, cached_answer.answer)
+        except Exception as e:
+            logger.warning(f"AI cache reply error: {e}")
+        return
+
     # 📊 Long processing warning task
     async def long_processing_warning():
         await asyncio.sleep(LONG_PROCESSING_WARNING_TIME)
@@ -613,26 +585,54 @@ async def process_text_question(message: Message, state: FSMContext):
         # ⌨️ Typing action before AI call
         await message.bot.send_chat_action(chat_id=user_id, action="typing")
 
-        # 🚀 Get AI response with failover strategy
-        success, ai_response, service_used = await get_ai_response_with_retry(message.text, user_name, user_id)
-
-        # Cancel warning task
-        warning_task.cancel()
-
-        if success:
-            response_text = ai_response_text(ai_response, service_used)
+        # 📚 Bot bazasidan mos parchalar (topilmasa oddiy prompt)
+        try:
+            knowledge = await retrieve_context(session, message.text)
+        except Exception as e:
+            logger.warning(f"AI retrieval error: {e}")
+            knowledge = ""
+
+        if AI_STREAMING:
+            # 🌊 Javob bo'laklari kelishi bilan shu xabarda ko'rsatiladi
+            success, ai_response = await stream_ai_response(
+                waiting_msg, message.text, user_name, user_id,
+                on_first_token=warning_task.cancel, cacheable=cacheable, knowledge=knowledge
+            )
+            if success:
+                return
         else:
-            # Check if it's a timeout error
-            if "timeout" in ai_response.lower():
-                response_text = ai_timeout_text()
-            else:
-                response_text = ai_no_services_text()
+            # 🚀 Get AI response with failover strategy
+            success, ai_response, service_used = await get_ai_response(message.text, user_name, user_id, knowledge)
+
+            # Cancel warning task
+            warning_task.cancel()
+
+            if success:
+                if cacheable:
+                    answer_cache.store(message.text, ai_response, service_used)
+                await waiting_msg.edit_text(
+                    ai_response_text(ai_response, service_used),
+                    parse_mode="HTML"
+                )
+                return
+
+        # Check if it's a timeout error
+        if "timeout" in ai_response.lower():
+            response_text = ai_timeout_text()
+        else:
+            response_text = ai_no_services_text()
 
         await waiting_msg.edit_text(
             response_text,
             parse_mode="HTML"
         )
 
+    except asyncio.CancelledError:
+        # Yangi savol kelgani uchun bekor qilindi
+        warning_task.cancel()
+        run_in_background(waiting_msg.edit_text(ai_superseded_text(), parse_mode="HTML"))
+        raise
+
     except Exception as e:
         # Cancel warning task
         warning_task.cancel()
@@ -651,36 +651,28 @@ async def view_limits_handler(message: Message, state: FSMContext):
 
     await store_message(user_id, "ai", message.message_id)
 
-    # Reply keyboard'ni o'chirish
-    temp_msg = await message.answer("...", reply_markup=ReplyKeyboardRemove())
-    await asyncio.sleep(0.1)
-    await temp_msg.delete()
+    # Reply keyboard'ni o'chirish (placeholder fonda o'chiriladi)
+    await remove_reply_keyboard(message)
 
     await state.set_state(AIStates.viewing_limits)
 
-    now = time.time()
-    hour_ago = now - 3600
-    day_ago = now - 86400
-
-    # User stats
-    user_reqs = user_requests.get(user_id, [])
-    user_hour = len([req for req in user_reqs if req > hour_ago])
-    user_day = len([req for req in user_reqs if req > day_ago])
-
-    # Service stats
-    google_reqs = service_usage["google"]["requests"]
-    groq_reqs = service_usage["groq"]["requests"]
-    together_reqs = service_usage["together"]["requests"]
-
-    google_hour = len([req for req in google_reqs if req > hour_ago])
-    groq_hour = len([req for req in groq_reqs if req > hour_ago])
-    together_hour = len([req for req in together_reqs if req > hour_ago])
+    # User va xizmatlar hisoblagichlari - bitta so'rov
+    usage = await ai_quota.usage(
+        user_subject(user_id),
+        service_subject("google"),
+        service_subject("groq"),
+        service_subject("together")
+    )
+    user_usage = usage[user_subject(user_id)]
+    google_usage = usage[service_subject("google")]
+    groq_usage = usage[service_subject("groq")]
+    together_usage = usage[service_subject("together")]
 
     text = ai_limits_status_text(
-        user_hour, user_day,
-        google_hour, len(google_reqs),
-        groq_hour, len(groq_reqs),
-        together_hour, len(together_reqs),
+        user_usage.hour, user_usage.day,
+        google_usage.hour, google_usage.day,
+        groq_usage.hour, groq_usage.day,
+        together_usage.hour, together_usage.day,
         MAX_USER_REQUESTS_HOUR,
         MAX_USER_REQUESTS_DAY
     )
@@ -706,8 +698,8 @@ async def clear_chat_handler(message: Message, state: FSMContext, session: Async
     await delete_user_messages(message.bot, user_id, "ai")
 
     # Conversation history tozalash
-    if user_id in user_conversations:
-        del user_conversations[user_id]
+    ai_inflight.cancel(user_id)
+    await ai_memory.clear(user_id)
 
     # Get user info
     try:
@@ -736,13 +728,11 @@ async def main_menu_from_ai(message: Message, state: FSMContext):
     await store_message(user_id, "ai", message.message_id)
 
     # 📱 Klaviaturani yopish
-    temp_remove = await message.answer("...", reply_markup=ReplyKeyboardRemove())
-    await temp_remove.delete()
-    await asyncio.sleep(0.1)
+    await remove_reply_keyboard(message)
 
     # Conversation history tozalash
-    if user_id in user_conversations:
-        del user_conversations[user_id]
+    ai_inflight.cancel(user_id)
+    await ai_memory.clear(user_id)
 
     # Barcha xabarlarni o'chirish
     await asyncio.gather(
@@ -755,7 +745,7 @@ async def main_menu_from_ai(message: Message, state: FSMContext):
     await state.clear()
 
     # Send main menu
-    kb = await get_main_menu_keyboard()
+    kb = get_main_menu_keyboard()
     sent = await message.answer(
         get_main_text(),
         reply_markup=kb,
@@ -814,12 +804,11 @@ async def main_menu_callback(callback: CallbackQuery, state: FSMContext):
         text="...",
         reply_markup=ReplyKeyboardRemove()
     )
-    await temp_remove.delete()
-    await asyncio.sleep(0.1)
+    run_in_background(temp_remove.delete())
 
     # Conversation history tozalash
-    if user_id in user_conversations:
-        del user_conversations[user_id]
+    ai_inflight.cancel(user_id)
+    await ai_memory.clear(user_id)
 
     # Callback message'ni o'chirish
     try:
@@ -838,7 +827,7 @@ async def main_menu_callback(callback: CallbackQuery, state: FSMContext):
     await state.clear()
 
     # Send main menu
-    kb = await get_main_menu_keyboard()
+    kb = get_main_menu_keyboard()
     sent = await callback.bot.send_message(
         chat_id=user_id,
         text=get_main_text(),
@@ -1,10 +1,9 @@
 # bot/handlers/company_handler.py
 
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove
+from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
-from aiogram.utils.i18n import lazy_gettext as __
 from sqlalchemy import select
 import asyncio
 from typing import Optional
@@ -26,6 +25,9 @@ from bot.utils.texts import (
     get_main_text
 )
 from bot.buttons.reply import get_main_menu_keyboard
+from bot.utils.media_registry import send_media
+from bot.utils.navigation import remove_reply_keyboard
+from bot.utils.cache import cached
 
 company_router = Router()
 
@@ -120,7 +122,21 @@ async def _safe_delete(bot, chat_id: int, msg_id: int):
         return False
 
 
-@company_router.message(F.text == __("🏢 Biz Haqimizda"))
+async def load_company_info(session: AsyncSession):
+    """Faol kompaniya ma'lumoti - faqat kerakli ustunlar (ORM obyekt emas, keshlash xavfsiz)"""
+    result = await session.execute(
+        select(
+            CompanyInfo.name,
+            CompanyInfo.description,
+            CompanyInfo.image,
+            CompanyInfo.presentation_file,
+            CompanyInfo.admin_link
+        ).where(CompanyInfo.is_active == True)
+    )
+    return result.first()
+
+
+# Menyu tugmasi - bot/handlers/menu_routes.py orqali chaqiriladi
 async def show_company_info(message: Message, state: FSMContext, session: AsyncSession):
     """Kompaniya haqida ma'lumot ko'rsatish"""
 
@@ -131,19 +147,11 @@ async def show_company_info(message: Message, state: FSMContext, session: AsyncS
     await state.clear()
     await state.set_state(CompanyStates.viewing_info)
 
-    # Reply keyboard olib tashlash
-    temp_msg = await message.answer(
-        "...",
-        reply_markup=ReplyKeyboardRemove()
-    )
-    await asyncio.sleep(0.1)
-    await temp_msg.delete()
+    # Reply keyboard olib tashlash (placeholder fonda o'chiriladi)
+    await remove_reply_keyboard(message)
 
-    # Kompaniya ma'lumotlarini olish
-    result = await session.execute(
-        select(CompanyInfo).where(CompanyInfo.is_active == True)
-    )
-    company = result.scalar_one_or_none()
+    # Kompaniya ma'lumotlarini olish (umumiy keshdan)
+    company = await cached("company", "info", load_company_info, session)
 
     # Ma'lumot yo'q holati
     if not company:
@@ -171,8 +179,8 @@ async def show_company_info(message: Message, state: FSMContext, session: AsyncS
 
     # Asosiy kompaniya ma'lumotini yuborish (tugmalarsiz)
     if company.image:
-        main_msg = await message.answer_photo(
-            photo=company.image,
+        main_msg = await send_media(
+            message.bot, "photo", message.chat.id, company.image,
             caption=text,
             parse_mode="HTML"
         )
@@ -188,8 +196,8 @@ async def show_company_info(message: Message, state: FSMContext, session: AsyncS
     # Prezentatsiya faylini kontakt ma'lumoti bilan yuborish
     if company.presentation_file:
         try:
-            presentation_msg = await message.answer_document(
-                document=company.presentation_file,
+            presentation_msg = await send_media(
+                message.bot, "document", message.chat.id, company.presentation_file,
                 caption=company_presentation_with_contact_text(),
                 reply_markup=company_contact_keyboard(
                     admin_link=company.admin_link
@@ -251,7 +259,7 @@ async def back_to_main_menu(callback: CallbackQuery, state: FSMContext):
     await state.clear()
 
     # Yangi asosiy menyu yuborish
-    kb = await get_main_menu_keyboard()
+    kb = get_main_menu_keyboard()
     main_menu_msg = await callback.bot.send_message(
         chat_id=callback.from_user.id,
         text=get_main_text(),
@@ -2,10 +2,9 @@ from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, or_
 from sqlalchemy.orm import selectinload
-from aiogram.utils.i18n import gettext as _, lazy_gettext as __
-from aiogram.types import ReplyKeyboardRemove
+from bot.utils.i18n_bundle import gettext as _
 from aiogram.exceptions import TelegramBadRequest
 import asyncio
 from datetime import datetime, timezone
@@ -29,7 +28,9 @@ from bot.buttons.inline import (
     safety_equipment_detail_keyboard,
     back_to_departments_keyboard,
     back_to_areas_keyboard,
-    back_to_facilities_keyboard
+    back_to_facilities_keyboard,
+    safety_serial_search_keyboard,
+    safety_serial_results_keyboard
 )
 from bot.utils.texts import (
     safety_no_departments_text,
@@ -47,8 +48,15 @@ from bot.utils.texts import (
     safety_equipment_count_with_dash_text,
     safety_equipment_page_info_text,
     safety_no_equipment_in_department_text,
+    safety_serial_search_prompt_text,
+    safety_serial_search_too_short_text,
+    safety_serial_search_no_results_text,
+    safety_serial_search_results_text,
     get_main_text
 )
+from bot.utils.detail_renderer import render_detail, DetailAsset
+from bot.utils.navigation import render_screen, update_screen_text, render_markup, open_section, \
+    run_in_background
 
 equipment_router = Router()
 
@@ -59,6 +67,13 @@ MAX_RETRIES = 3
 RETRY_DELAY = 0.5  # sekund
 DELETE_CHUNK_SIZE = 10  # bir vaqtda o'chiriladigan xabarlar soni
 
+# 🔎 Seriya raqami qidiruvi
+SERIAL_MIN_LENGTH = 2
+SERIAL_MAX_LENGTH = 100  # EquipmentSafety.serial_number uzunligi
+SERIAL_RESULTS_LIMIT = 10
+SERIAL_CACHE_TTL = 60  # sekund - bir xil yorliqni qayta skanerlash uchun
+SERIAL_CACHE_MAX_SIZE = 500
+
 
 # 🚀 OPTIMAL MESSAGE STORE - Test handlerdan copy
 class OptimizedMessageStore:
@@ -75,6 +90,11 @@ class OptimizedMessageStore:
         self.user_messages[user_id][category].append(message_id)
         self._periodic_cleanup()
 
+    def store_messages(self, user_id: int, message_ids: list[int], category: str = "equipment"):
+        """Bir nechta xabarni bitta amalda saqlash"""
+        self.user_messages[user_id][category].extend(message_ids)
+        self._periodic_cleanup()
+
     def get_messages(self, user_id: int, category: str = "equipment") -> list[int]:
         """User xabarlarini olish"""
         return list(self.user_messages[user_id][category])
@@ -121,6 +141,14 @@ async def store_message(user_id: int, category: str, message_id: int):
         pass
 
 
+async def store_messages(user_id: int, category: str, message_ids: list[int]):
+    """Bir nechta xabarni saqlash"""
+    try:
+        message_store.store_messages(user_id, message_ids, category)
+    except Exception:
+        pass
+
+
 async def delete_user_messages(bot, user_id: int, category: str, exclude_ids: Optional[list[int]] = None):
     """Xabarlarni parallel o'chirish with chunking"""
     msg_ids = message_store.get_messages(user_id, category)
@@ -160,17 +188,147 @@ async def send_clean_message(message: Message, text: str, reply_markup=None, cat
     return sent
 
 
+# 🔎 SERIAL SEARCH - qisqa muddatli natija keshi
+_serial_cache: dict[str, tuple[float, list[tuple]]] = {}
+
+
+def _get_cached_serial_results(key: str) -> Optional[list[tuple]]:
+    """Keshdan natijani olish (muddati o'tgan bo'lsa None)"""
+    cached = _serial_cache.get(key)
+    if cached is None:
+        return None
+
+    cached_at, rows = cached
+    if time.monotonic() - cached_at > SERIAL_CACHE_TTL:
+        _serial_cache.pop(key, None)
+        return None
+
+    return rows
+
+
+def _set_cached_serial_results(key: str, rows: list[tuple]):
+    """Natijani keshga yozish - hajm cheklangan"""
+    if len(_serial_cache) >= SERIAL_CACHE_MAX_SIZE:
+        now = time.monotonic()
+        expired = [k for k, (ts, _rows) in _serial_cache.items() if now - ts > SERIAL_CACHE_TTL]
+        for k in expired:
+            del _serial_cache[k]
+
+        # Hali ham to'la bo'lsa - eng eski yozuvni chiqarish
+        while len(_serial_cache) >= SERIAL_CACHE_MAX_SIZE:
+            _serial_cache.pop(next(iter(_serial_cache)))
+
+    _serial_cache[key] = (time.monotonic(), rows)
+
+
+def _serial_rows_query():
+    """Equipment + to'liq joylashuv zanjiri bitta so'rovda (plain tuple'lar)"""
+    return (
+        select(
+            EquipmentSafety.id,
+            EquipmentSafety.serial_number,
+            EquipmentCatalog.name,
+            EquipmentCatalog.description,
+            EquipmentSafety.expire_at,
+            EquipmentSafety.file_image,
+            FacilitySafety.id,
+            FacilitySafety.name,
+            AreaSafety.id,
+            AreaSafety.name,
+            DepartmentSafety.id,
+            DepartmentSafety.name,
+        )
+        .select_from(EquipmentSafety)
+        .join(EquipmentCatalog, EquipmentSafety.catalog_id == EquipmentCatalog.id)
+        .join(FacilitySafety, EquipmentSafety.facility_safety_id == FacilitySafety.id)
+        .join(AreaSafety, FacilitySafety.area_safety_id == AreaSafety.id)
+        .join(DepartmentSafety, AreaSafety.department_safety_id == DepartmentSafety.id)
+        .where(EquipmentSafety.is_active == True)
+    )
+
+
+async def search_equipment_by_serial(session: AsyncSession, query: str) -> list[tuple]:
+    """Seriya raqami bo'yicha qidiruv: avval prefix, keyin fuzzy (pg_trgm)"""
+    cache_key = query.casefold()
+    cached = _get_cached_serial_results(cache_key)
+    if cached is not None:
+        return cached
+
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    # 1️⃣ Prefix qidiruv - aniq moslik birinchi chiqadi
+    result = await session.execute(
+        _serial_rows_query()
+        .where(EquipmentSafety.serial_number.ilike(f"{escaped}%", escape="\\"))
+        .order_by(func.length(EquipmentSafety.serial_number), EquipmentSafety.serial_number)
+        .limit(SERIAL_RESULTS_LIMIT)
+    )
+    rows = [tuple(row) for row in result.all()]
+
+    # 2️⃣ Prefix topilmasa - qism yoki o'xshashlik bo'yicha (trigram index)
+    if not rows:
+        result = await session.execute(
+            _serial_rows_query()
+            .where(or_(
+                EquipmentSafety.serial_number.ilike(f"%{escaped}%", escape="\\"),
+                EquipmentSafety.serial_number.op("%")(query)
+            ))
+            .order_by(func.similarity(EquipmentSafety.serial_number, query).desc())
+            .limit(SERIAL_RESULTS_LIMIT)
+        )
+        rows = [tuple(row) for row in result.all()]
+
+    _set_cached_serial_results(cache_key, rows)
+    return rows
+
+
+async def send_serial_equipment_detail(bot, chat_id: int, state: FSMContext, row: tuple, cleanup=None):
+    """Qidiruv natijasidan equipment detail'ni yuborish"""
+    (equipment_id, serial_number, catalog_name, catalog_description, expire_at, file_image,
+     facility_id, facility_name, area_id, area_name, department_id, department_name) = row
+
+    # Orqaga tugmalari ishlashi uchun joylashuvni state'ga yozish
+    await state.update_data(
+        department_id=department_id,
+        department_name=department_name,
+        area_id=area_id,
+        area_name=area_name,
+        facility_id=facility_id,
+        facility_name=facility_name
+    )
+
+    caption = safety_equipment_detail_text(
+        department_name=department_name,
+        area_name=area_name,
+        facility_name=facility_name,
+        catalog_name=catalog_name,
+        catalog_description=catalog_description,
+        serial_number=serial_number,
+        expire_date=expire_at
+    )
+
+    message_ids = await render_detail(
+        bot,
+        chat_id,
+        [DetailAsset("photo", file_image)],
+        caption,
+        reply_markup=safety_equipment_detail_keyboard(
+            equipment_id, department_id, area_id, facility_id
+        ),
+        cleanup=cleanup
+    )
+
+    await store_messages(chat_id, "equipment", message_ids)
+    await state.set_state(EquipmentState.viewing_detail)
+    return message_ids
+
+
 # 🦺 Himoya vositalari - asosiy handler (OPTIMIZED)
-@equipment_router.message(F.text == __("🦺 Himoya Vositalari"))
+# Menyu tugmasi - bot/handlers/menu_routes.py orqali chaqiriladi
 async def show_safety_departments(message: Message, state: FSMContext, session: AsyncSession):
     # User xabarini saqlash
     await store_message(message.from_user.id, "equipment", message.message_id)
 
-    # Reply keyboard'ni o'chirish
-    temp_msg = await message.answer("...", reply_markup=ReplyKeyboardRemove())
-    await asyncio.sleep(0.1)
-    await temp_msg.delete()
-
     # State'ni tozalash
     await state.clear()
     await state.update_data(user_telegram_id=message.from_user.id)
@@ -186,19 +344,15 @@ async def show_safety_departments(message: Message, state: FSMContext, session:
         text = safety_departments_prompt()
         reply_markup = safety_department_keyboard(departments)
 
-    # Yangi xabar yuborish
-    sent = await message.answer(
-        text,
-        reply_markup=reply_markup,
-        parse_mode="HTML"
-    )
+    # Reply keyboard'ni olib tashlash va inline ekran - bir vaqtda, sleep'siz
+    sent = await open_section(message, text, reply_markup)
     await store_message(message.chat.id, "equipment", sent.message_id)
 
-    # Parallel ravishda eski xabarlarni o'chirish
-    await asyncio.gather(
+    # Eski xabarlarni fonda o'chirish - foydalanuvchi kutmaydi
+    run_in_background(asyncio.gather(
         delete_user_messages(message.bot, message.from_user.id, "menu"),
         delete_user_messages(message.bot, message.from_user.id, "equipment", exclude_ids=[sent.message_id])
-    )
+    ))
 
     await state.set_state(EquipmentState.choosing_department)
 
@@ -236,11 +390,9 @@ async def show_department_areas(callback: CallbackQuery, state: FSMContext, sess
         text = safety_areas_prompt(department.name)
         reply_markup = safety_area_keyboard(areas, department_id)
 
-    await callback.message.edit_text(
-        text,
-        reply_markup=reply_markup,
-        parse_mode="HTML"
-    )
+    sent, is_new = await render_screen(callback.message, text, reply_markup)
+    if is_new:
+        await store_message(callback.from_user.id, "equipment", sent.message_id)
 
     await state.set_state(EquipmentState.choosing_area)
 
@@ -284,35 +436,10 @@ async def show_area_facilities(callback: CallbackQuery, state: FSMContext, sessi
     else:
         reply_markup = safety_facility_keyboard(facilities, department_id, area_id)
 
-    # Eski xabarni o'chirish
-    await callback.message.delete()
-
-    # Rasm bor/yo'qligini tekshirish
-    if area.image:
-        try:
-            sent = await callback.bot.send_photo(
-                chat_id=callback.from_user.id,
-                photo=area.image,
-                caption=caption,
-                reply_markup=reply_markup,
-                parse_mode="HTML"
-            )
-        except TelegramBadRequest:
-            sent = await callback.bot.send_message(
-                chat_id=callback.from_user.id,
-                text=caption,
-                reply_markup=reply_markup,
-                parse_mode="HTML"
-            )
-    else:
-        sent = await callback.bot.send_message(
-            chat_id=callback.from_user.id,
-            text=caption,
-            reply_markup=reply_markup,
-            parse_mode="HTML"
-        )
-
-    await store_message(callback.from_user.id, "equipment", sent.message_id)
+    # Joyida tahrirlash (photo->photo / text->text), aks holda qayta yuborish
+    sent, is_new = await render_screen(callback.message, caption, reply_markup, photo=area.image)
+    if is_new:
+        await store_message(callback.from_user.id, "equipment", sent.message_id)
     await state.set_state(EquipmentState.choosing_facility)
 
 
@@ -362,35 +489,10 @@ async def show_facility_equipment(callback: CallbackQuery, state: FSMContext, se
         caption += "\n" + safety_equipment_count_text(len(equipment_items))
         reply_markup = safety_equipment_keyboard(equipment_items, department_id, area_id, facility_id, page=1)
 
-    # Eski xabarni o'chirish
-    await callback.message.delete()
-
-    # Rasm bor/yo'qligini tekshirish
-    if facility.image:
-        try:
-            sent = await callback.bot.send_photo(
-                chat_id=callback.from_user.id,
-                photo=facility.image,
-                caption=caption,
-                reply_markup=reply_markup,
-                parse_mode="HTML"
-            )
-        except TelegramBadRequest:
-            sent = await callback.bot.send_message(
-                chat_id=callback.from_user.id,
-                text=caption,
-                reply_markup=reply_markup,
-                parse_mode="HTML"
-            )
-    else:
-        sent = await callback.bot.send_message(
-            chat_id=callback.from_user.id,
-            text=caption,
-            reply_markup=reply_markup,
-            parse_mode="HTML"
-        )
-
-    await store_message(callback.from_user.id, "equipment", sent.message_id)
+    # Joyida tahrirlash (photo->photo / text->text), aks holda qayta yuborish
+    sent, is_new = await render_screen(callback.message, caption, reply_markup, photo=facility.image)
+    if is_new:
+        await store_message(callback.from_user.id, "equipment", sent.message_id)
     await state.set_state(EquipmentState.choosing_equipment)
 
 
@@ -435,21 +537,19 @@ async def show_equipment_detail(callback: CallbackQuery, state: FSMContext, sess
         expire_date=equipment.expire_at
     )
 
-    # Eski xabarni o'chirish
-    await callback.message.delete()
-
-    # Rasm yuborish
-    sent = await callback.bot.send_photo(
-        chat_id=callback.from_user.id,
-        photo=equipment.file_image,
-        caption=caption,
+    # Rasm yuborish - eski xabar parallel o'chiriladi
+    message_ids = await render_detail(
+        callback.bot,
+        callback.from_user.id,
+        [DetailAsset("photo", equipment.file_image)],
+        caption,
         reply_markup=safety_equipment_detail_keyboard(
             equipment_id, department_id, area_id, facility_id
         ),
-        parse_mode="HTML"
+        cleanup=_safe_delete(callback.bot, callback.from_user.id, callback.message.message_id)
     )
 
-    await store_message(callback.from_user.id, "equipment", sent.message_id)
+    await store_messages(callback.from_user.id, "equipment", message_ids)
     await state.set_state(EquipmentState.viewing_detail)
 
 
@@ -492,14 +592,11 @@ async def change_equipment_page(callback: CallbackQuery, state: FSMContext, sess
 
     reply_markup = safety_equipment_keyboard(equipment_items, department_id, area_id, facility_id, page)
 
+    # Rasmli bo'lsa caption, rasmsiz bo'lsa matn yangilanadi
     try:
-        await callback.message.edit_caption(
-            caption=caption,
-            reply_markup=reply_markup,
-            parse_mode="HTML"
-        )
+        await update_screen_text(callback.message, caption, reply_markup)
     except TelegramBadRequest:
-        await callback.message.edit_reply_markup(reply_markup=reply_markup)
+        await render_markup(callback.message, reply_markup)
 
 
 # 📊 Department statistika
@@ -536,20 +633,8 @@ async def show_department_statistics(callback: CallbackQuery, state: FSMContext,
     else:
         text = safety_statistics_text(department.name, statistics)
 
-    try:
-        await callback.message.edit_text(
-            text,
-            reply_markup=back_to_areas_keyboard(department_id),
-            parse_mode="HTML"
-        )
-    except TelegramBadRequest:
-        await callback.message.delete()
-        sent = await callback.bot.send_message(
-            chat_id=callback.from_user.id,
-            text=text,
-            reply_markup=back_to_areas_keyboard(department_id),
-            parse_mode="HTML"
-        )
+    sent, is_new = await render_screen(callback.message, text, back_to_areas_keyboard(department_id))
+    if is_new:
         await store_message(callback.from_user.id, "equipment", sent.message_id)
 
 
@@ -583,33 +668,10 @@ async def back_to_facilities(callback: CallbackQuery, state: FSMContext, session
     else:
         reply_markup = safety_facility_keyboard(facilities, department_id, area_id)
 
-    await callback.message.delete()
-
-    if area.image:
-        try:
-            sent = await callback.bot.send_photo(
-                chat_id=callback.from_user.id,
-                photo=area.image,
-                caption=caption,
-                reply_markup=reply_markup,
-                parse_mode="HTML"
-            )
-        except TelegramBadRequest:
-            sent = await callback.bot.send_message(
-                chat_id=callback.from_user.id,
-                text=caption,
-                reply_markup=reply_markup,
-                parse_mode="HTML"
-            )
-    else:
-        sent = await callback.bot.send_message(
-            chat_id=callback.from_user.id,
-            text=caption,
-            reply_markup=reply_markup,
-            parse_mode="HTML"
-        )
-
-    await store_message(callback.from_user.id, "equipment", sent.message_id)
+    # Joyida tahrirlash (photo->photo / text->text), aks holda qayta yuborish
+    sent, is_new = await render_screen(callback.message, caption, reply_markup, photo=area.image)
+    if is_new:
+        await store_message(callback.from_user.id, "equipment", sent.message_id)
     await state.set_state(EquipmentState.choosing_facility)
 
 
@@ -649,33 +711,10 @@ async def back_to_equipment_list(callback: CallbackQuery, state: FSMContext, ses
         caption += "\n" + safety_equipment_count_with_dash_text(len(equipment_items))
         reply_markup = safety_equipment_keyboard(equipment_items, department_id, area_id, facility_id)
 
-    await callback.message.delete()
-
-    if facility.image:
-        try:
-            sent = await callback.bot.send_photo(
-                chat_id=callback.from_user.id,
-                photo=facility.image,
-                caption=caption,
-                reply_markup=reply_markup,
-                parse_mode="HTML"
-            )
-        except TelegramBadRequest:
-            sent = await callback.bot.send_message(
-                chat_id=callback.from_user.id,
-                text=caption,
-                reply_markup=reply_markup,
-                parse_mode="HTML"
-            )
-    else:
-        sent = await callback.bot.send_message(
-            chat_id=callback.from_user.id,
-            text=caption,
-            reply_markup=reply_markup,
-            parse_mode="HTML"
-        )
-
-    await store_message(callback.from_user.id, "equipment", sent.message_id)
+    # Joyida tahrirlash (photo->photo / text->text), aks holda qayta yuborish
+    sent, is_new = await render_screen(callback.message, caption, reply_markup, photo=facility.image)
+    if is_new:
+        await store_message(callback.from_user.id, "equipment", sent.message_id)
     await state.set_state(EquipmentState.choosing_equipment)
 
 
@@ -702,14 +741,9 @@ async def back_to_areas(callback: CallbackQuery, state: FSMContext, session: Asy
         text = safety_areas_prompt(department.name)
         reply_markup = safety_area_keyboard(areas, department_id)
 
-    await callback.message.delete()
-    sent = await callback.bot.send_message(
-        chat_id=callback.from_user.id,
-        text=text,
-        reply_markup=reply_markup,
-        parse_mode="HTML"
-    )
-    await store_message(callback.from_user.id, "equipment", sent.message_id)
+    sent, is_new = await render_screen(callback.message, text, reply_markup)
+    if is_new:
+        await store_message(callback.from_user.id, "equipment", sent.message_id)
 
     await state.set_state(EquipmentState.choosing_area)
 
@@ -728,18 +762,89 @@ async def back_to_departments(callback: CallbackQuery, state: FSMContext, sessio
         text = safety_departments_prompt()
         reply_markup = safety_department_keyboard(departments)
 
-    await callback.message.delete()
-    sent = await callback.bot.send_message(
-        chat_id=callback.from_user.id,
-        text=text,
-        reply_markup=reply_markup,
-        parse_mode="HTML"
-    )
-    await store_message(callback.from_user.id, "equipment", sent.message_id)
+    sent, is_new = await render_screen(callback.message, text, reply_markup)
+    if is_new:
+        await store_message(callback.from_user.id, "equipment", sent.message_id)
 
     await state.set_state(EquipmentState.choosing_department)
 
 
+# 🔎 Seriya raqami bo'yicha qidiruv rejimi
+@equipment_router.callback_query(F.data == "safety_serial_search")
+async def start_serial_search(callback: CallbackQuery, state: FSMContext):
+    await callback.answer()
+
+    sent, is_new = await render_screen(
+        callback.message,
+        safety_serial_search_prompt_text(),
+        safety_serial_search_keyboard()
+    )
+    if is_new:
+        await store_message(callback.from_user.id, "equipment", sent.message_id)
+
+    await state.set_state(EquipmentState.searching_serial)
+
+
+@equipment_router.message(EquipmentState.searching_serial, F.text)
+async def process_serial_search(message: Message, state: FSMContext, session: AsyncSession):
+    await store_message(message.from_user.id, "equipment", message.message_id)
+
+    query = message.text.strip().lstrip("№#").strip()[:SERIAL_MAX_LENGTH]
+
+    if len(query) < SERIAL_MIN_LENGTH:
+        sent = await message.answer(
+            safety_serial_search_too_short_text(),
+            reply_markup=safety_serial_search_keyboard(),
+            parse_mode="HTML"
+        )
+        await store_message(message.chat.id, "equipment", sent.message_id)
+        return
+
+    rows = await search_equipment_by_serial(session, query)
+
+    # Bitta aniq moslik - to'g'ridan-to'g'ri detail
+    if len(rows) == 1 or (rows and rows[0][1].casefold() == query.casefold()):
+        keep_ids = await send_serial_equipment_detail(message.bot, message.chat.id, state, rows[0])
+    else:
+        if not rows:
+            text = safety_serial_search_no_results_text(query)
+            reply_markup = safety_serial_search_keyboard()
+        else:
+            text = safety_serial_search_results_text(query, len(rows))
+            reply_markup = safety_serial_results_keyboard(rows)
+
+        sent = await message.answer(text, reply_markup=reply_markup, parse_mode="HTML")
+        await store_message(message.chat.id, "equipment", sent.message_id)
+        keep_ids = [sent.message_id]
+
+    await delete_user_messages(message.bot, message.chat.id, "equipment", exclude_ids=keep_ids)
+
+
+@equipment_router.callback_query(F.data.startswith("serial_result:"))
+async def show_serial_result(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
+    await callback.answer()
+
+    try:
+        equipment_id = int(callback.data.split(":")[1])
+    except (ValueError, IndexError):
+        await callback.answer(safety_error_text())
+        return
+
+    result = await session.execute(
+        _serial_rows_query().where(EquipmentSafety.id == equipment_id)
+    )
+    row = result.first()
+
+    if not row:
+        await callback.answer(safety_error_text())
+        return
+
+    await send_serial_equipment_detail(
+        callback.bot, callback.from_user.id, state, tuple(row),
+        cleanup=_safe_delete(callback.bot, callback.from_user.id, callback.message.message_id)
+    )
+
+
 # 🏠 Asosiy menyu (OPTIMIZED - Test handler singari)
 @equipment_router.callback_query(F.data == "safety_main_menu")
 async def back_to_main_menu_from_safety(callback: CallbackQuery, state: FSMContext):
@@ -757,7 +862,7 @@ async def back_to_main_menu_from_safety(callback: CallbackQuery, state: FSMConte
     await state.clear()
 
     # Yangi xabar yuborish
-    kb = await get_main_menu_keyboard()
+    kb = get_main_menu_keyboard()
     sent = await callback.bot.send_message(
         chat_id=callback.from_user.id,
         text=get_main_text(),
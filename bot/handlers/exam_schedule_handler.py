@@ -1,12 +1,12 @@
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove
+from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from sqlalchemy.orm import selectinload
 from datetime import datetime
-from aiogram.utils.i18n import gettext as _, lazy_gettext as __
-from typing import List, Tuple, Dict, Optional
+from bot.utils.i18n_bundle import gettext as _
+from typing import List, NamedTuple, Tuple, Dict, Optional
 import asyncio
 import time
 from collections import defaultdict, deque
@@ -33,20 +33,18 @@ from bot.utils.texts import (
     exam_search_divider, format_search_user_result, exam_search_footer_text
 )
 from bot.utils.exam_helpers import get_exam_status
+from bot.utils.navigation import remove_reply_keyboard
+from bot.utils.cache import cached
 
 exam_schedule_router = Router()
 
 # Constants
 ITEMS_PER_PAGE = 6
 SEARCH_ITEMS_PER_PAGE = 6
-CACHE_TTL = 300  # 5 minutes
 MAX_MESSAGES_PER_USER = 10
 CLEANUP_INTERVAL = 3600  # 1 hour
 DELETE_CHUNK_SIZE = 10
 
-# Simple in-memory cache
-_category_cache: Dict[str, Tuple[List[Dict], datetime]] = {}
-
 
 # Message Store
 class MessageStore:
@@ -128,13 +126,20 @@ async def send_clean_message(message: Message, text: str, reply_markup=None, par
     return sent
 
 
-def categorize_user(user: User, exam_schedule: Optional[ExamSchedule], today: datetime.date) -> Tuple[
+class ExamUserRow(NamedTuple):
+    """User and exam date - plain columns only (safe to keep in the shared cache)"""
+    full_name: str
+    phone_number: str
+    last_exam: Optional[datetime]
+
+
+def categorize_user(last_exam: Optional[datetime], today: datetime.date) -> Tuple[
     str, Optional[int], Optional[datetime]]:
     """Categorize a single user based on exam schedule"""
-    if not exam_schedule:
+    if not last_exam:
         return "no_data", None, None
 
-    next_exam = get_next_exam_friday(exam_schedule.last_exam)
+    next_exam = get_next_exam_friday(last_exam)
     days_left = (next_exam.date() - today).days
 
     if days_left < 0:
@@ -151,18 +156,18 @@ def categorize_user(user: User, exam_schedule: Optional[ExamSchedule], today: da
     return category, days_left, next_exam
 
 
-async def get_users_with_schedules(session: AsyncSession) -> List[Tuple[User, Optional[ExamSchedule]]]:
-    """Get all users with their exam schedules in one query"""
+async def get_users_with_schedules(session: AsyncSession) -> List[ExamUserRow]:
+    """Get all users with their exam dates in one query (no ORM objects)"""
     result = await session.execute(
-        select(User, ExamSchedule)
+        select(User.full_name, User.phone_number, ExamSchedule.last_exam)
         .outerjoin(ExamSchedule, User.id == ExamSchedule.user_id)
         .where(User.role == Role.user)
         .order_by(User.full_name)
     )
-    return result.all()
+    return [ExamUserRow(*row) for row in result.all()]
 
 
-def process_users_data(users_data: List[Tuple[User, Optional[ExamSchedule]]]) -> Dict[str, List[Dict]]:
+def process_users_data(users_data: List[ExamUserRow]) -> Dict[str, List[Dict]]:
     """Process all users and categorize them"""
     today = datetime.now().date()
     categorized_users = {
@@ -174,13 +179,12 @@ def process_users_data(users_data: List[Tuple[User, Optional[ExamSchedule]]]) ->
         "no_data": []
     }
 
-    for user, exam_schedule in users_data:
-        category, days_left, next_exam = categorize_user(user, exam_schedule, today)
+    for user in users_data:
+        category, days_left, next_exam = categorize_user(user.last_exam, today)
 
         user_info = {
             'user': user,
             'days_left': days_left,
-            'exam_schedule': exam_schedule,
             'next_exam': next_exam
         }
 
@@ -196,38 +200,27 @@ def process_users_data(users_data: List[Tuple[User, Optional[ExamSchedule]]]) ->
     return categorized_users
 
 
-async def get_cached_category_data(category: str, session: AsyncSession) -> Optional[List[Dict]]:
-    """Get category data from cache or database"""
-    now = datetime.now()
-
-    # Check cache
-    if category in _category_cache:
-        data, timestamp = _category_cache[category]
-        if (now - timestamp).seconds < CACHE_TTL:
-            return data
-
-    # Load from database
+async def load_categorized_users(session: AsyncSession) -> Dict[str, List[Dict]]:
+    """Load all users and categorize them (cached as a whole)"""
     users_data = await get_users_with_schedules(session)
-    categorized_users = process_users_data(users_data)
+    return process_users_data(users_data)
 
-    # Update cache for all categories
-    for cat, users in categorized_users.items():
-        _category_cache[cat] = (users, now)
 
+async def get_cached_category_data(category: str, session: AsyncSession) -> Optional[List[Dict]]:
+    """Get category data from the shared cache or database"""
+    categorized_users = await cached("exam", "categorized_users", load_categorized_users, session)
     return categorized_users.get(category, [])
 
 
 # Main handler
-@exam_schedule_router.message(F.text == __("📅 Davriy Imtixon Vaqti"))
+# Menyu tugmasi - bot/handlers/menu_routes.py orqali chaqiriladi
 async def show_exam_schedule(message: Message, state: FSMContext, session: AsyncSession):
     """Main exam schedule handler - optimized"""
     # Store user message
     await store_message(message.from_user.id, "exam", message.message_id)
 
-    # Remove reply keyboard
-    temp_msg = await message.answer("...", reply_markup=ReplyKeyboardRemove())
-    await asyncio.sleep(0.1)
-    await temp_msg.delete()
+    # Remove reply keyboard (placeholder fonda o'chiriladi)
+    await remove_reply_keyboard(message)
 
     # Clear state first
     await state.clear()
@@ -301,19 +294,16 @@ async def show_user_interface(message: Message, user: User, session: AsyncSessio
 
 async def show_viewer_interface(message: Message, session: AsyncSession):
     """Show categories menu for viewers"""
-    # Get all users data
-    users_data = await get_users_with_schedules(session)
+    # Get all users data (categorized, from shared cache)
+    categorized_users = await cached("exam", "categorized_users", load_categorized_users, session)
+    counts = {cat: len(users) for cat, users in categorized_users.items()}
+    total_users = sum(counts.values())
 
-    if not users_data:
+    if not total_users:
         await send_clean_message(message, exam_no_users_found_text(), category="exam")
         return
 
-    # Process and count categories
-    categorized_users = process_users_data(users_data)
-    counts = {cat: len(users) for cat, users in categorized_users.items()}
-
     # Build text
-    total_users = len(users_data)
     text = exam_all_users_header_text()
     text += exam_statistics_text(
         total_users,
@@ -384,8 +374,6 @@ async def show_category_users(callback: CallbackQuery, state: FSMContext, sessio
 async def back_to_exam_categories(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
     """Return to categories view"""
     await callback.answer()
-    # Clear cache to ensure fresh data
-    _category_cache.clear()
 
     # Delete current message and show fresh categories
     try:
@@ -405,9 +393,8 @@ async def back_to_main_menu(callback: CallbackQuery, state: FSMContext):
 
     await callback.answer()
 
-    # Clear state and cache
+    # Clear state
     await state.clear()
-    _category_cache.clear()
 
     # Delete all exam messages
     await asyncio.gather(
@@ -421,7 +408,7 @@ async def back_to_main_menu(callback: CallbackQuery, state: FSMContext):
     except Exception:
         pass
 
-    keyboard = await get_main_menu_keyboard()
+    keyboard = get_main_menu_keyboard()
     sent = await callback.message.answer(
         get_main_text(),
         reply_markup=keyboard,
@@ -593,15 +580,3 @@ async def cancel_search_on_callback(callback: CallbackQuery, state: FSMContext):
     if not callback.data.startswith("exam_search"):
         await state.clear()
     # Let the actual callback handler process the request
-
-
-# Optional: Periodic cache cleanup
-async def cleanup_cache():
-    """Cleanup expired cache entries"""
-    now = datetime.now()
-    expired_keys = [
-        key for key, (_, timestamp) in _category_cache.items()
-        if (now - timestamp).seconds > CACHE_TTL
-    ]
-    for key in expired_keys:
-        _category_cache.pop(key, None)
\ No newline at end of file
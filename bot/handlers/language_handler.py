@@ -1,7 +1,7 @@
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import Message, ReplyKeyboardRemove, BotCommand
 from aiogram.fsm.context import FSMContext
-from aiogram.utils.i18n import gettext as _, lazy_gettext as __
+from bot.utils.i18n_bundle import gettext as _, set_locale
 from aiogram.exceptions import TelegramBadRequest
 import asyncio
 import time
@@ -136,7 +136,7 @@ async def send_clean_message(message: Message, text: str, reply_markup=None, cat
 
 
 # 🌐 Tilni o'zgartirish menyu (OPTIMIZED)
-@language_router.message(F.text == __("🌐 Tilni O'zgartirish"))
+# Menyu tugmasi - bot/handlers/menu_routes.py orqali chaqiriladi
 async def change_language_prompt(message: Message, state: FSMContext):
     # User xabarini saqlash
     await store_message(message.from_user.id, "language", message.message_id)
@@ -145,7 +145,7 @@ async def change_language_prompt(message: Message, state: FSMContext):
     await state.set_state(MenuState.language)
 
     # Til tanlash klaviaturasini darhol ko'rsatish
-    kb = await get_language_keyboard()
+    kb = get_language_keyboard()
     sent = await message.answer(
         language_prompt_text(),
         reply_markup=kb,
@@ -182,7 +182,7 @@ async def set_language(message: Message, state: FSMContext, i18n):
 
     # Noto'g'ri tanlov
     if selected is None:
-        kb = await get_language_keyboard()
+        kb = get_language_keyboard()
         sent = await message.answer(
             language_invalid_text(),
             reply_markup=kb,
@@ -202,7 +202,7 @@ async def set_language(message: Message, state: FSMContext, i18n):
     # Orqaga qaytish (OPTIMIZED)
     if selected == "back":
         # Asosiy menyuga darhol qaytish
-        kb = await get_main_menu_keyboard()
+        kb = get_main_menu_keyboard()
         sent = await message.answer(
             get_main_text(),
             reply_markup=kb,
@@ -229,14 +229,15 @@ async def set_language(message: Message, state: FSMContext, i18n):
         return
 
     # 2. Joriy session uchun til o'rnatish
-    i18n.current_locale = selected
+    i18n.ctx_locale.set(selected)
+    set_locale(selected)
 
     # 3. Komandalarni yangi tilda o'rnatish
     await update_bot_commands_for_user(message.bot, user_id, i18n)
 
     # Til o'zgartirildi xabari va asosiy menyuni birga yuborish
     success_text = language_updated_text()
-    kb = await get_main_menu_keyboard()
+    kb = get_main_menu_keyboard()
 
     # Bitta xabarda ikkalasini yuborish
     combined_msg = await message.answer(
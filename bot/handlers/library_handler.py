@@ -1,13 +1,12 @@
 
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove
+from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 import asyncio
-from aiogram.utils.i18n import lazy_gettext as __
 from collections import defaultdict, deque
 import time
 
@@ -35,6 +34,9 @@ from bot.utils.texts import (
     main_menu_text
 )
 from bot.buttons.reply import get_main_menu_keyboard
+from bot.utils.detail_renderer import render_detail, DetailAsset, DetailRenderError
+from bot.utils.navigation import render_screen, open_section, run_in_background
+from bot.utils.catalogue import get_category_summaries, get_category_page, paginate_summaries
 
 library_router = Router()
 
@@ -60,6 +62,11 @@ class LibraryMessageStore:
         self.user_messages[user_id][category].append(message_id)
         self._periodic_cleanup()
 
+    def store_messages(self, user_id: int, message_ids: list[int], category: str = "library"):
+        """Bir nechta xabarni bitta amalda saqlash"""
+        self.user_messages[user_id][category].extend(message_ids)
+        self._periodic_cleanup()
+
     def get_messages(self, user_id: int, category: str = "library") -> list[int]:
         """User xabarlarini olish"""
         return list(self.user_messages[user_id][category])
@@ -105,6 +112,14 @@ async def store_message(user_id: int, category: str, message_id: int):
         pass
 
 
+async def store_messages(user_id: int, category: str, message_ids: list[int]):
+    """Bir nechta xabarni saqlash"""
+    try:
+        library_message_store.store_messages(user_id, message_ids, category)
+    except Exception:
+        pass
+
+
 async def delete_user_messages(bot, user_id: int, category: str, exclude_ids: Optional[list[int]] = None):
     """Xabarlarni parallel o'chirish"""
     msg_ids = library_message_store.get_messages(user_id, category)
@@ -132,8 +147,45 @@ async def _safe_delete(bot, chat_id: int, msg_id: int):
         return False
 
 
+# 📚 Catalogue screens - GROUP BY summaries + LIMIT/OFFSET pages
+async def build_categories_screen(session: AsyncSession, page: int = 1, is_main: bool = True):
+    """Categories screen text + keyboard (None keyboard if empty)"""
+    summaries = await get_category_summaries(session, "library")
+
+    if not summaries:
+        return library_no_categories_text(), None
+
+    current_categories, page, total_pages = paginate_summaries(summaries, page, CATEGORIES_PER_PAGE)
+    text = library_main_text() if is_main else library_categories_text(page, total_pages)
+    keyboard = library_categories_keyboard(current_categories, page, total_pages)
+    return text, keyboard
+
+
+async def build_books_screen(session: AsyncSession, category_id: int, page: int = 1):
+    """Books page of one category - None if category not found"""
+    catalogue_page = await get_category_page(session, "library", category_id, page, BOOKS_PER_PAGE)
+
+    if not catalogue_page:
+        return None
+
+    category = catalogue_page.category
+    if not catalogue_page.items:
+        return library_no_books_text(category.name), library_empty_category_keyboard()
+
+    text = library_books_text(
+        category.name, category.item_count, catalogue_page.page, catalogue_page.total_pages
+    )
+    keyboard = library_books_keyboard(
+        books=catalogue_page.items,
+        category_id=category_id,
+        current_page=catalogue_page.page,
+        total_pages=catalogue_page.total_pages
+    )
+    return text, keyboard
+
+
 # Main handler - UPDATED
-@library_router.message(F.text == __("📚 Kutubxona"))
+# Menyu tugmasi - bot/handlers/menu_routes.py orqali chaqiriladi
 async def show_library_main(message: Message, state: FSMContext, session: AsyncSession):
     """Main library menu"""
     # User xabarini saqlash
@@ -143,40 +195,18 @@ async def show_library_main(message: Message, state: FSMContext, session: AsyncS
     await state.clear()
     await state.set_state(LibraryStates.viewing_categories)
 
-    # Remove reply keyboard
-    temp_msg = await message.answer("...", reply_markup=ReplyKeyboardRemove())
-    await asyncio.sleep(0.1)
-    await temp_msg.delete()
+    # Get categories (first page)
+    text, reply_markup = await build_categories_screen(session)
 
-    # Get categories
-    result = await session.execute(
-        select(CategoryBook)
-        .options(selectinload(CategoryBook.books))
-        .order_by(CategoryBook.name)
-    )
-    categories = result.scalars().all()
-
-    if not categories:
-        text = library_no_categories_text()
-        reply_markup = None
-    else:
-        text = library_main_text()
-        keyboard = library_categories_keyboard(categories, 1, 1)
-        reply_markup = keyboard
-
-    # Send new message
-    sent = await message.answer(
-        text,
-        reply_markup=reply_markup,
-        parse_mode="HTML"
-    )
+    # Reply keyboard'ni olib tashlash va inline ekran - bir vaqtda, sleep'siz
+    sent = await open_section(message, text, reply_markup)
     await store_message(message.from_user.id, "library", sent.message_id)
 
-    # Parallel o'chirish - barcha eski xabarlarni
-    await asyncio.gather(
+    # Eski xabarlarni fonda o'chirish - foydalanuvchi kutmaydi
+    run_in_background(asyncio.gather(
         delete_user_messages(message.bot, message.from_user.id, "menu"),
         delete_user_messages(message.bot, message.from_user.id, "library", exclude_ids=[sent.message_id])
-    )
+    ))
 
 
 @library_router.callback_query(F.data.startswith("library_category:"))
@@ -192,51 +222,17 @@ async def show_category_books(callback: CallbackQuery, state: FSMContext, sessio
     # Set state
     await state.set_state(LibraryStates.viewing_books)
 
-    # Get category with books
-    result = await session.execute(
-        select(CategoryBook)
-        .options(selectinload(CategoryBook.books))
-        .where(CategoryBook.id == category_id)
-    )
-    category = result.scalar_one_or_none()
+    # Only the requested page of books is loaded
+    screen = await build_books_screen(session, category_id, page)
 
-    if not category:
+    if not screen:
         await callback.answer(library_error_text(), show_alert=True)
         return
 
-    if not category.books:
-        text = library_no_books_text(category.name)
-        keyboard = library_empty_category_keyboard()
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-        return
-
-    # Pagination - newest books first
-    books = sorted(category.books, key=lambda x: x.id, reverse=True)
-    total_items = len(books)
-    total_pages = (total_items + BOOKS_PER_PAGE - 1) // BOOKS_PER_PAGE
-
-    # Validate page
-    page = max(1, min(page, total_pages))
-
-    # Current page items
-    start_idx = (page - 1) * BOOKS_PER_PAGE
-    end_idx = min(start_idx + BOOKS_PER_PAGE, total_items)
-    current_books = books[start_idx:end_idx]
-
-    # Text and keyboard
-    text = library_books_text(category.name, total_items, page, total_pages)
-    keyboard = library_books_keyboard(
-        books=current_books,
-        category_id=category_id,
-        current_page=page,
-        total_pages=total_pages
-    )
-
-    await callback.message.edit_text(
-        text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
-    )
+    text, keyboard = screen
+    sent, is_new = await render_screen(callback.message, text, keyboard)
+    if is_new:
+        await store_message(callback.from_user.id, "library", sent.message_id)
 
 
 @library_router.callback_query(F.data.startswith("library_book:"))
@@ -261,50 +257,36 @@ async def show_book_detail(callback: CallbackQuery, state: FSMContext, session:
         await callback.answer(library_error_text(), show_alert=True)
         return
 
-    # Delete current message
-    await callback.message.delete()
+    detail_text = library_book_detail_text(
+        book.name,
+        book.category.name,
+        book.description
+    )
+    keyboard = library_book_detail_keyboard(book.category_book_id)
 
     try:
-        # 1. Send image if exists
-        if book.img:
-            try:
-                img_msg = await callback.bot.send_photo(
-                    chat_id=callback.from_user.id,
-                    photo=book.img
-                )
-                await store_message(callback.from_user.id, "library", img_msg.message_id)
-            except:
-                pass
-
-        # 2. Send document
-        doc_msg = await callback.bot.send_document(
-            chat_id=callback.from_user.id,
-            document=book.file
-        )
-        await store_message(callback.from_user.id, "library", doc_msg.message_id)
-
-        # 3. Send details with keyboard
-        detail_text = library_book_detail_text(
-            book.name,
-            book.category.name,
-            book.description
-        )
-        keyboard = library_book_detail_keyboard(book.category_book_id)
-
-        detail_msg = await callback.bot.send_message(
-            chat_id=callback.from_user.id,
-            text=detail_text,
+        # Rasm + hujjat (matn hujjat caption'ida) - joriy xabar parallel o'chiriladi
+        message_ids = await render_detail(
+            callback.bot,
+            callback.from_user.id,
+            [
+                DetailAsset("photo", book.img, required=False),
+                DetailAsset("document", book.file),
+            ],
+            detail_text,
             reply_markup=keyboard,
-            parse_mode="HTML"
+            cleanup=_safe_delete(callback.bot, callback.from_user.id, callback.message.message_id)
         )
-        await store_message(callback.from_user.id, "library", detail_msg.message_id)
+        await store_messages(callback.from_user.id, "library", message_ids)
+
+    except DetailRenderError as e:
+        await store_messages(callback.from_user.id, "library", e.message_ids)
 
-    except Exception:
         # If file fails, send error message
         error_msg = await callback.bot.send_message(
             chat_id=callback.from_user.id,
             text=library_file_error_text(),
-            reply_markup=library_book_detail_keyboard(book.category_book_id),
+            reply_markup=keyboard,
             parse_mode="HTML"
         )
         await store_message(callback.from_user.id, "library", error_msg.message_id)
@@ -347,11 +329,9 @@ async def show_library_statistics(callback: CallbackQuery, state: FSMContext, se
 
     keyboard = library_statistics_keyboard()
 
-    await callback.message.edit_text(
-        text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
-    )
+    sent, is_new = await render_screen(callback.message, text, keyboard)
+    if is_new:
+        await store_message(callback.from_user.id, "library", sent.message_id)
 
 
 @library_router.callback_query(F.data == "library_back_to_categories")
@@ -362,37 +342,13 @@ async def back_to_categories(callback: CallbackQuery, state: FSMContext, session
     # Set state
     await state.set_state(LibraryStates.viewing_categories)
 
-    # Delete current message
-    await callback.message.delete()
-
-    # Load categories
-    result = await session.execute(
-        select(CategoryBook)
-        .options(selectinload(CategoryBook.books))
-        .order_by(CategoryBook.name)
-    )
-    categories = result.scalars().all()
-
-    if not categories:
-        new_msg = await callback.bot.send_message(
-            chat_id=callback.from_user.id,
-            text=library_no_categories_text(),
-            parse_mode="HTML"
-        )
-        await store_message(callback.from_user.id, "library", new_msg.message_id)
-        return
-
-    # Send new message
-    text = library_main_text()
-    keyboard = library_categories_keyboard(categories, 1, 1)
+    # Load categories (first page)
+    text, keyboard = await build_categories_screen(session)
 
-    new_msg = await callback.bot.send_message(
-        chat_id=callback.from_user.id,
-        text=text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
-    )
-    await store_message(callback.from_user.id, "library", new_msg.message_id)
+    # Joyida tahrirlash (text->text), aks holda qayta yuborish
+    sent, is_new = await render_screen(callback.message, text, keyboard)
+    if is_new:
+        await store_message(callback.from_user.id, "library", sent.message_id)
 
 
 @library_router.callback_query(F.data == "library_back_from_stats")
@@ -401,6 +357,20 @@ async def back_from_statistics(callback: CallbackQuery, state: FSMContext, sessi
     await back_to_categories(callback, state, session)
 
 
+async def _replace_detail_screen(callback: CallbackQuery, text: str, keyboard):
+    """Detail xabarlari (rasm + hujjat) o'rniga ro'yxat - o'chirish va yuborish parallel"""
+    new_msg, _deleted = await asyncio.gather(
+        callback.bot.send_message(
+            chat_id=callback.from_user.id,
+            text=text,
+            reply_markup=keyboard,
+            parse_mode="HTML"
+        ),
+        delete_user_messages(callback.bot, callback.from_user.id, "library")
+    )
+    await store_message(callback.from_user.id, "library", new_msg.message_id)
+
+
 @library_router.callback_query(F.data.startswith("library_back_from_detail:"))
 async def back_from_detail(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
     """Back from detail to category books"""
@@ -411,61 +381,15 @@ async def back_from_detail(callback: CallbackQuery, state: FSMContext, session:
     # Set state
     await state.set_state(LibraryStates.viewing_books)
 
-    # Delete all current messages
-    await delete_user_messages(callback.bot, callback.from_user.id, "library")
-
-    # Load category
-    result = await session.execute(
-        select(CategoryBook)
-        .options(selectinload(CategoryBook.books))
-        .where(CategoryBook.id == category_id)
-    )
-    category = result.scalar_one_or_none()
+    # Load first page of the category
+    screen = await build_books_screen(session, category_id)
 
-    if not category:
+    if not screen:
         await callback.answer(library_error_text(), show_alert=True)
         return
 
-    if not category.books:
-        text = library_no_books_text(category.name)
-        keyboard = library_empty_category_keyboard()
-
-        new_msg = await callback.bot.send_message(
-            chat_id=callback.from_user.id,
-            text=text,
-            reply_markup=keyboard,
-            parse_mode="HTML"
-        )
-        await store_message(callback.from_user.id, "library", new_msg.message_id)
-        return
-
-    # Pagination - newest books first
-    books = sorted(category.books, key=lambda x: x.id, reverse=True)
-    total_items = len(books)
-    total_pages = (total_items + BOOKS_PER_PAGE - 1) // BOOKS_PER_PAGE
-
-    # Current page items (page 1)
-    start_idx = 0
-    end_idx = min(BOOKS_PER_PAGE, total_items)
-    current_books = books[start_idx:end_idx]
-
-    # Text and keyboard
-    text = library_books_text(category.name, total_items, 1, total_pages)
-    keyboard = library_books_keyboard(
-        books=current_books,
-        category_id=category_id,
-        current_page=1,
-        total_pages=total_pages
-    )
-
-    # Send new message
-    new_msg = await callback.bot.send_message(
-        chat_id=callback.from_user.id,
-        text=text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
-    )
-    await store_message(callback.from_user.id, "library", new_msg.message_id)
+    text, keyboard = screen
+    await _replace_detail_screen(callback, text, keyboard)
 
 
 # Main menu callback handler - MUHIM! - UPDATED
@@ -489,7 +413,7 @@ async def handle_library_main_menu(callback: CallbackQuery, state: FSMContext):
     await state.clear()
 
     # Send main menu with reply keyboard
-    kb = await get_main_menu_keyboard()
+    kb = get_main_menu_keyboard()
     main_menu_msg = await callback.bot.send_message(
         chat_id=callback.from_user.id,
         text=get_main_text(),
@@ -509,39 +433,16 @@ async def show_categories_page(callback: CallbackQuery, state: FSMContext, sessi
 
     page = int(callback.data.split(":")[1])
 
-    # Get categories
-    result = await session.execute(
-        select(CategoryBook)
-        .options(selectinload(CategoryBook.books))
-        .order_by(CategoryBook.name)
-    )
-    categories = result.scalars().all()
+    # Get categories page
+    text, keyboard = await build_categories_screen(session, page, is_main=False)
 
-    if not categories:
+    if keyboard is None:
         await callback.answer(library_error_text(), show_alert=True)
         return
 
-    # Pagination
-    total_items = len(categories)
-    total_pages = (total_items + CATEGORIES_PER_PAGE - 1) // CATEGORIES_PER_PAGE
-
-    # Validate page
-    page = max(1, min(page, total_pages))
-
-    # Current page items
-    start_idx = (page - 1) * CATEGORIES_PER_PAGE
-    end_idx = min(start_idx + CATEGORIES_PER_PAGE, total_items)
-    current_categories = categories[start_idx:end_idx]
-
-    # Text and keyboard
-    text = library_categories_text(page, total_pages)
-    keyboard = library_categories_keyboard(current_categories, page, total_pages)
-
-    await callback.message.edit_text(
-        text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
-    )
+    sent, is_new = await render_screen(callback.message, text, keyboard)
+    if is_new:
+        await store_message(callback.from_user.id, "library", sent.message_id)
 
 
 # Bot ishga tushganda cleanup'ni boshlash
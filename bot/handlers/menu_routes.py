@@ -0,0 +1,88 @@
+from types import ModuleType
+from typing import NamedTuple
+
+from aiogram import Router, F
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State
+from aiogram.types import Message
+
+from bot.states import AIStates, EquipmentState, ExamSearchState, MenuState, Registration, SearchStates
+from bot.utils.i18n_bundle import locale_bundles
+
+menu_router = Router()
+
+
+def N_(text: str) -> str:
+    """Tarjima uchun belgilash (pybabel extract) - qiymat o'zgarmaydi"""
+    return text
+
+
+# 🎯 MENYU JADVALI - routerlar tartibida (bot/handlers/__init__.py)
+# Tugma: (matn, feature, handler nomi). Holat: shu holatda matnni to'liq ushlaydigan handler -
+# undan keyin turgan tugmalar shu holatda oddiy router zanjiriga qoldiriladi
+MENU_ORDER = [
+    (N_("⚠️ Baxtsiz Hodisalar"), "accident", "show_accidents_main"),
+    (N_("🏢 Biz Haqimizda"), "company", "show_company_info"),
+    (N_("🦺 Himoya Vositalari"), "equipment", "show_safety_departments"),
+    EquipmentState.searching_serial,
+    (N_("📅 Davriy Imtixon Vaqti"), "exam_schedule", "show_exam_schedule"),
+    ExamSearchState.waiting_for_name,
+    (N_("🌐 Tilni O'zgartirish"), "language", "change_language_prompt"),
+    MenuState.language,
+    (N_("📚 Kutubxona"), "library", "show_library_main"),
+    Registration.full_name,
+    Registration.phone_number,
+    (N_("🧠 Test"), "test", "show_test_categories"),
+    (N_("🎥 Video Materiallar"), "video", "show_video_main"),
+    (N_("🚆 Poezdlar Harakat Xavfsizligi"), "train_safety", "show_train_safety_main"),
+    (N_("🔎 Qidiruv"), "search", "show_search_main"),
+    SearchStates.waiting_query,
+    (N_("🤖 AI Yordamchi"), "ai", "start_ai_assistant"),
+    AIStates.waiting_question,
+]
+
+
+class MenuRoute(NamedTuple):
+    """Menyu tugmasi yo'nalishi"""
+    handler: CallableObject
+    blocked_states: frozenset[str]  # bu holatlarda tugma oldingi handlerga qoldiriladi
+
+
+# tarjima qilingan tugma matni (barcha tillar) -> yo'nalish
+menu_routes: dict[str, MenuRoute] = {}
+
+
+def build_menu_routes(modules: dict[str, ModuleType]):
+    """Barcha tillardagi menyu matnlaridan jadval tuzish (faqat yoqilgan feature'lar)"""
+    menu_routes.clear()
+    blocked: set[str] = set()
+
+    for item in MENU_ORDER:
+        if isinstance(item, State):
+            blocked.add(item.state)
+            continue
+
+        label, feature, handler_name = item
+        if feature not in modules:
+            continue
+        route = MenuRoute(CallableObject(getattr(modules[feature], handler_name)), frozenset(blocked))
+        menu_routes[label] = route
+        for locale in locale_bundles.locales:
+            menu_routes.setdefault(locale_bundles.gettext(label, locale), route)
+
+
+async def match_menu(message: Message, state: FSMContext) -> bool | dict:
+    """Matn menyu tugmasi bo'lsa - yo'nalishni handlerga uzatish"""
+    route = menu_routes.get(message.text)
+    if route is None:
+        return False
+    if route.blocked_states and await state.get_state() in route.blocked_states:
+        return False
+    return {"menu_route": route}
+
+
+@menu_router.message(F.text, match_menu)
+async def dispatch_menu(message: Message, menu_route: MenuRoute, **data):
+    """Menyu tugmasini O(1) qidiruv bilan tegishli handlerga yo'naltirish"""
+    return await menu_route.handler.call(message, **data)
@@ -0,0 +1,234 @@
+# handlers/search_handler.py
+from aiogram import Router, F
+from aiogram.types import Message, CallbackQuery
+from aiogram.fsm.context import FSMContext
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import asyncio
+from collections import defaultdict, deque
+import time
+
+from bot.states import SearchStates
+from bot.buttons.inline import (
+    search_prompt_keyboard,
+    search_results_keyboard,
+    search_company_keyboard
+)
+from bot.utils.texts import (
+    search_prompt_text,
+    search_too_short_text,
+    search_no_results_text,
+    search_results_text,
+    company_info_text,
+    company_no_data_text,
+    get_main_text
+)
+from bot.buttons.reply import get_main_menu_keyboard
+from bot.utils.navigation import render_screen, open_section, run_in_background
+from bot.utils.search import search_content, SEARCH_MIN_LENGTH
+from bot.utils.cache import cached
+from bot.handlers.company_handler import load_company_info
+
+search_router = Router()
+
+# Constants
+RESULTS_PER_PAGE = 8
+MAX_QUERY_LENGTH = 100
+MAX_MESSAGES_PER_USER = 10
+CLEANUP_INTERVAL = 3600  # 1 soat
+DELETE_CHUNK_SIZE = 10
+
+
+# Message Store
+class SearchMessageStore:
+    def __init__(self):
+        self.user_messages = defaultdict(
+            lambda: defaultdict(lambda: deque(maxlen=MAX_MESSAGES_PER_USER))
+        )
+        self.last_cleanup = time.time()
+
+    def store_message(self, user_id: int, message_id: int, category: str = "search"):
+        """Xabarni saqlash"""
+        self.user_messages[user_id][category].append(message_id)
+        self._periodic_cleanup()
+
+    def get_messages(self, user_id: int, category: str = "search") -> list[int]:
+        """User xabarlarini olish"""
+        return list(self.user_messages[user_id][category])
+
+    def clear_user_messages(self, user_id: int, category: str = "search"):
+        """User xabarlarini tozalash"""
+        self.user_messages[user_id][category].clear()
+
+    def _periodic_cleanup(self):
+        """Har soatda bir marta eski userlarni tozalash"""
+        current_time = time.time()
+        if current_time - self.last_cleanup > CLEANUP_INTERVAL:
+            empty_users = [
+                user_id for user_id, categories in self.user_messages.items()
+                if not any(messages for messages in categories.values())
+            ]
+            for user_id in empty_users:
+                del self.user_messages[user_id]
+            self.last_cleanup = current_time
+
+
+# Global instance
+search_message_store = SearchMessageStore()
+
+
+# Helper functions
+async def store_message(user_id: int, category: str, message_id: int):
+    """Xabar saqlash"""
+    try:
+        search_message_store.store_message(user_id, message_id, category)
+    except Exception:
+        pass
+
+
+async def delete_user_messages(bot, user_id: int, category: str, exclude_ids: Optional[list[int]] = None):
+    """Xabarlarni parallel o'chirish"""
+    msg_ids = search_message_store.get_messages(user_id, category)
+
+    if exclude_ids:
+        msg_ids = [msg_id for msg_id in msg_ids if msg_id not in exclude_ids]
+
+    for i in range(0, len(msg_ids), DELETE_CHUNK_SIZE):
+        chunk = msg_ids[i:i + DELETE_CHUNK_SIZE]
+        tasks = [_safe_delete(bot, user_id, msg_id) for msg_id in chunk]
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if not exclude_ids:
+        search_message_store.clear_user_messages(user_id, category)
+
+
+async def _safe_delete(bot, chat_id: int, msg_id: int):
+    """Xavfsiz xabar o'chirish"""
+    try:
+        await bot.delete_message(chat_id, msg_id)
+        return True
+    except Exception:
+        return False
+
+
+async def build_results_screen(session: AsyncSession, query: str, page: int = 1):
+    """Natijalar ekrani: (text, keyboard, page)"""
+    results = await search_content(session, query, page, RESULTS_PER_PAGE)
+
+    if not results.hits:
+        return search_no_results_text(query), search_prompt_keyboard(), 1
+
+    text = search_results_text(query, results.total, results.page, results.total_pages)
+    keyboard = search_results_keyboard(results.hits, results.page, results.total_pages)
+    return text, keyboard, results.page
+
+
+# Main handler
+# Menyu tugmasi - bot/handlers/menu_routes.py orqali chaqiriladi
+async def show_search_main(message: Message, state: FSMContext):
+    """Search mode: so'rov kutish"""
+    await store_message(message.from_user.id, "search", message.message_id)
+
+    await state.clear()
+    await state.set_state(SearchStates.waiting_query)
+
+    sent = await open_section(message, search_prompt_text(), search_prompt_keyboard())
+    await store_message(message.from_user.id, "search", sent.message_id)
+
+    run_in_background(asyncio.gather(
+        delete_user_messages(message.bot, message.from_user.id, "menu"),
+        delete_user_messages(message.bot, message.from_user.id, "search", exclude_ids=[sent.message_id])
+    ))
+
+
+@search_router.message(SearchStates.waiting_query, F.text)
+async def process_search_query(message: Message, state: FSMContext, session: AsyncSession):
+    """So'rov bo'yicha qidirish - birinchi sahifa"""
+    await store_message(message.from_user.id, "search", message.message_id)
+
+    query = message.text.strip()[:MAX_QUERY_LENGTH]
+
+    if len(query) < SEARCH_MIN_LENGTH:
+        text, keyboard, page = search_too_short_text(), search_prompt_keyboard(), 1
+    else:
+        text, keyboard, page = await build_results_screen(session, query)
+
+    await state.update_data(search_query=query, search_page=page)
+
+    sent = await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await store_message(message.from_user.id, "search", sent.message_id)
+
+    # Oldingi natijalar fonda o'chiriladi
+    run_in_background(
+        delete_user_messages(message.bot, message.from_user.id, "search", exclude_ids=[sent.message_id])
+    )
+
+
+@search_router.callback_query(F.data.startswith("search_page:"))
+async def show_results_page(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
+    """Natijalar sahifasi (joyida tahrirlanadi)"""
+    await callback.answer()
+
+    data = await state.get_data()
+    query = data.get("search_query")
+
+    if not query:
+        await state.set_state(SearchStates.waiting_query)
+        sent, is_new = await render_screen(callback.message, search_prompt_text(), search_prompt_keyboard())
+    else:
+        page = int(callback.data.split(":")[1])
+        text, keyboard, page = await build_results_screen(session, query, page)
+
+        await state.set_state(SearchStates.waiting_query)
+        await state.update_data(search_page=page)
+        sent, is_new = await render_screen(callback.message, text, keyboard)
+
+    if is_new:
+        await store_message(callback.from_user.id, "search", sent.message_id)
+
+
+@search_router.callback_query(F.data == "search_company")
+async def show_company_result(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
+    """Korxona ma'lumoti natijasi"""
+    await callback.answer()
+
+    data = await state.get_data()
+    company = await cached("company", "info", load_company_info, session)
+
+    if company:
+        text = company_info_text(name=company.name, description=company.description)
+    else:
+        text = company_no_data_text()
+
+    sent, is_new = await render_screen(
+        callback.message, text, search_company_keyboard(data.get("search_page", 1))
+    )
+    if is_new:
+        await store_message(callback.from_user.id, "search", sent.message_id)
+
+
+@search_router.callback_query(F.data == "search_noop")
+async def search_noop(callback: CallbackQuery):
+    """Sahifa raqami tugmasi"""
+    await callback.answer()
+
+
+@search_router.callback_query(F.data == "search_main_menu")
+async def handle_search_main_menu(callback: CallbackQuery, state: FSMContext):
+    """Qidiruvdan asosiy menyuga qaytish"""
+    await callback.answer()
+
+    await state.clear()
+
+    kb = get_main_menu_keyboard()
+    main_menu_msg, _deleted = await asyncio.gather(
+        callback.bot.send_message(
+            chat_id=callback.from_user.id,
+            text=get_main_text(),
+            reply_markup=kb,
+            parse_mode="HTML"
+        ),
+        delete_user_messages(callback.bot, callback.from_user.id, "search")
+    )
+
+    await store_message(callback.from_user.id, "menu", main_menu_msg.message_id)
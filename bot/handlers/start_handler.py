@@ -153,7 +153,7 @@ async def cmd_start(message: Message, state: FSMContext, session: AsyncSession,
         greeting_text = get_main_menu_text_once(user.full_name)
         msg_greeting_keyboard = await message.answer(
             greeting_text,
-            reply_markup=await get_main_menu_keyboard()
+            reply_markup=get_main_menu_keyboard()
         )
 
         # 4. Asosiy menyu text (ikkinchi xabar)
@@ -277,7 +277,7 @@ async def full_name_handler(message: Message, state: FSMContext):
     # Telefon raqam so'rash
     msg = await message.answer(
         phone_number_prompt(),
-        reply_markup=await get_phone_request_keyboard()
+        reply_markup=get_phone_request_keyboard()
     )
     store_message(message.from_user.id, msg, category="menu")
 
@@ -317,7 +317,7 @@ async def phone_handler(message: Message, state: FSMContext, session: AsyncSessi
 
     # Salomlashuv va menyu
     msg1 = await message.answer(get_main_menu_text_once(full_name))
-    msg2 = await message.answer(get_main_text(), reply_markup=await get_main_menu_keyboard())
+    msg2 = await message.answer(get_main_text(), reply_markup=get_main_menu_keyboard())
 
     # Eski xabarlarni o'chirish va yangilarini saqlash
     await delete_user_messages(message, category="menu", except_msg_ids=[msg1.message_id, msg2.message_id])
@@ -5,11 +5,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from random import sample, shuffle
 from typing import List, Optional
-from aiogram.utils.i18n import gettext as _, lazy_gettext as __
+from bot.utils.i18n_bundle import gettext as _
 import asyncio
 import time
 from collections import defaultdict, deque
-from aiogram.types import ReplyKeyboardRemove
 
 from bot.states import TestState
 from bot.buttons.inline import (
@@ -40,6 +39,8 @@ from bot.utils.texts import (
     test_error_occurred, test_default_user_name, test_answer_variants_header,
     test_correct_response_short, test_incorrect_response_short
 )
+from bot.utils.media_registry import send_media
+from bot.utils.navigation import remove_reply_keyboard
 from db.models import CategoryTest, Test, AnswerTest, User
 
 test_router = Router()
@@ -230,13 +231,11 @@ def format_timeout_text_for_text_message(question: Test, answers: List[AnswerTes
     return text
 
 
-@test_router.message(F.text == __("🧠 Test"))
+# Menyu tugmasi - bot/handlers/menu_routes.py orqali chaqiriladi
 async def show_test_categories(message: Message, state: FSMContext, session: AsyncSession):
     await store_message(message.from_user.id, "test", message.message_id)
 
-    temp_msg = await message.answer("...", reply_markup=ReplyKeyboardRemove())
-    await asyncio.sleep(0.1)
-    await temp_msg.delete()
+    await remove_reply_keyboard(message)
 
     await state.clear()
     await state.update_data(user_telegram_id=message.from_user.id)
@@ -331,9 +330,8 @@ async def send_question(message: Message, state: FSMContext, session: AsyncSessi
 
     try:
         if question.image:
-            sent_msg = await message.bot.send_photo(
-                chat_id=message.chat.id,
-                photo=question.image,
+            sent_msg = await send_media(
+                message.bot, "photo", message.chat.id, question.image,
                 caption=timer_text(countdown),
                 reply_markup=markup,
                 parse_mode="HTML"
@@ -525,7 +523,7 @@ async def back_to_main_menu(callback: CallbackQuery, state: FSMContext):
 
     await state.clear()
 
-    kb = await get_main_menu_keyboard()
+    kb = get_main_menu_keyboard()
     sent = await callback.message.answer(get_main_text(), reply_markup=kb, parse_mode="HTML")
     await store_message(callback.from_user.id, "menu", sent.message_id)
 
@@ -1,18 +1,13 @@
 # handlers/train_safety_handler.py
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove
+from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from typing import List, Optional
 import asyncio
-from aiogram.utils.i18n import lazy_gettext as __
 from collections import defaultdict, deque
 import time
-from aiogram.exceptions import TelegramBadRequest
 
-from db.models import TrainSafetyFolder, TrainSafetyFile
 from bot.states import TrainSafetyStates
 from bot.buttons.inline import (
     train_safety_folders_keyboard,
@@ -30,6 +25,9 @@ from bot.utils.texts import (
     main_menu_text
 )
 from bot.buttons.reply import get_main_menu_keyboard
+from bot.utils.detail_renderer import render_detail, DetailAsset, DetailRenderError
+from bot.utils.navigation import render_screen, open_section, run_in_background
+from bot.utils.train_safety_tree import TrainSafetyTree, get_train_safety_tree, paginate
 
 train_safety_router = Router()
 
@@ -116,8 +114,49 @@ async def _safe_delete(bot, chat_id: int, msg_id: int):
         return False
 
 
+# 🚆 Screens - cached folder tree, page flips are in-memory slices
+def build_folders_screen(tree: TrainSafetyTree, page: int = 1):
+    """Folders screen text + keyboard (None keyboard if empty)"""
+    if not tree.folders:
+        return train_safety_no_folders_text(), None
+
+    current_folders, page, total_pages = paginate(tree.folders, page, FOLDERS_PER_PAGE)
+    return train_safety_main_text(), train_safety_folders_keyboard(current_folders, page, total_pages)
+
+
+def build_files_screen(tree: TrainSafetyTree, folder_id: int, page: int = 1):
+    """Files page of one folder - None if folder not found"""
+    folder = tree.folders_by_id.get(folder_id)
+    if not folder:
+        return None
+
+    if not folder.file_ids:
+        text = train_safety_folder_files_text(folder.name, folder.description, 0)
+        return text, train_safety_empty_folder_keyboard()
+
+    current_files, page, total_pages = paginate(tree.folder_files(folder), page, FILES_PER_PAGE)
+    text = train_safety_folder_files_text(folder.name, folder.description, len(folder.file_ids))
+    keyboard = train_safety_files_keyboard(current_files, folder_id, page, total_pages)
+    return text, keyboard
+
+
+async def show_files_screen(callback: CallbackQuery, session: AsyncSession, folder_id: int, page: int = 1):
+    """Render files page in place (or alert if folder is gone)"""
+    tree = await get_train_safety_tree(session)
+    screen = build_files_screen(tree, folder_id, page)
+
+    if not screen:
+        await callback.answer(train_safety_error_text(), show_alert=True)
+        return
+
+    text, keyboard = screen
+    sent, is_new = await render_screen(callback.message, text, keyboard)
+    if is_new:
+        await store_message(callback.from_user.id, "train_safety", sent.message_id)
+
+
 # Main handler
-@train_safety_router.message(F.text == __("🚆 Poezdlar Harakat Xavfsizligi"))
+# Menyu tugmasi - bot/handlers/menu_routes.py orqali chaqiriladi
 async def show_train_safety_main(message: Message, state: FSMContext, session: AsyncSession):
     """Main train safety menu"""
     # User xabarini saqlash
@@ -127,40 +166,19 @@ async def show_train_safety_main(message: Message, state: FSMContext, session: A
     await state.clear()
     await state.set_state(TrainSafetyStates.viewing_folders)
 
-    # Remove reply keyboard
-    temp_msg = await message.answer("...", reply_markup=ReplyKeyboardRemove())
-    await asyncio.sleep(0.1)
-    await temp_msg.delete()
+    # Get folders (first page)
+    tree = await get_train_safety_tree(session)
+    text, reply_markup = build_folders_screen(tree)
 
-    # Get folders
-    result = await session.execute(
-        select(TrainSafetyFolder)
-        .where(TrainSafetyFolder.is_active == True)
-        .order_by(TrainSafetyFolder.order_index, TrainSafetyFolder.name)
-    )
-    folders = result.scalars().all()
-
-    if not folders:
-        text = train_safety_no_folders_text()
-        reply_markup = None
-    else:
-        text = train_safety_main_text()
-        keyboard = train_safety_folders_keyboard(folders, 1, FOLDERS_PER_PAGE)
-        reply_markup = keyboard
-
-    # Send new message
-    sent = await message.answer(
-        text,
-        reply_markup=reply_markup,
-        parse_mode="HTML"
-    )
+    # Reply keyboard'ni olib tashlash va inline ekran - bir vaqtda, sleep'siz
+    sent = await open_section(message, text, reply_markup)
     await store_message(message.from_user.id, "train_safety", sent.message_id)
 
-    # Parallel o'chirish - barcha eski xabarlarni
-    await asyncio.gather(
+    # Eski xabarlarni fonda o'chirish - foydalanuvchi kutmaydi
+    run_in_background(asyncio.gather(
         delete_user_messages(message.bot, message.from_user.id, "menu"),
         delete_user_messages(message.bot, message.from_user.id, "train_safety", exclude_ids=[sent.message_id])
-    )
+    ))
 
 
 # Folders pagination handler
@@ -174,27 +192,17 @@ async def show_folders_page(callback: CallbackQuery, state: FSMContext, session:
     # Set state
     await state.set_state(TrainSafetyStates.viewing_folders)
 
-    # Get folders
-    result = await session.execute(
-        select(TrainSafetyFolder)
-        .where(TrainSafetyFolder.is_active == True)
-        .order_by(TrainSafetyFolder.order_index, TrainSafetyFolder.name)
-    )
-    folders = result.scalars().all()
+    tree = await get_train_safety_tree(session)
 
-    if not folders:
+    if not tree.folders:
         await callback.answer(train_safety_error_text(), show_alert=True)
         return
 
-    # Text and keyboard
-    text = train_safety_main_text()
-    keyboard = train_safety_folders_keyboard(folders, page, FOLDERS_PER_PAGE)
+    text, keyboard = build_folders_screen(tree, page)
 
-    await callback.message.edit_text(
-        text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
-    )
+    sent, is_new = await render_screen(callback.message, text, keyboard)
+    if is_new:
+        await store_message(callback.from_user.id, "train_safety", sent.message_id)
 
 
 # Folder selected
@@ -203,61 +211,13 @@ async def show_folder_files(callback: CallbackQuery, state: FSMContext, session:
     """Show files in folder with pagination"""
     await callback.answer()
 
-    # Parse data
-    parts = callback.data.split("_")
-    folder_id = int(parts[-1])
-    page = 1  # Default page
-
-    # Check if this is from pagination
-    if len(parts) > 4 and parts[-2] == "page":
-        folder_id = int(parts[-3])
-        page = int(parts[-1])
+    folder_id = int(callback.data.split("_")[-1])
 
     # Set state
     await state.set_state(TrainSafetyStates.viewing_files)
     await state.update_data(folder_id=folder_id)
 
-    # Get folder with files
-    result = await session.execute(
-        select(TrainSafetyFolder)
-        .options(selectinload(TrainSafetyFolder.files))
-        .where(
-            TrainSafetyFolder.id == folder_id,
-            TrainSafetyFolder.is_active == True
-        )
-    )
-    folder = result.scalar_one_or_none()
-
-    if not folder:
-        await callback.answer(train_safety_error_text(), show_alert=True)
-        return
-
-    # Active files only
-    active_files = [
-        file for file in folder.files
-        if file.is_active
-    ]
-    active_files.sort(key=lambda x: (x.order_index, x.name))
-
-    if not active_files:
-        text = train_safety_folder_files_text(folder.name, folder.description, 0)
-        keyboard = train_safety_empty_folder_keyboard()
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-        return
-
-    # Text and keyboard
-    text = train_safety_folder_files_text(
-        folder.name,
-        folder.description,
-        len(active_files)
-    )
-    keyboard = train_safety_files_keyboard(active_files, folder_id, page, FILES_PER_PAGE)
-
-    await callback.message.edit_text(
-        text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
-    )
+    await show_files_screen(callback, session, folder_id)
 
 
 # Files pagination handler
@@ -271,41 +231,7 @@ async def show_files_page(callback: CallbackQuery, state: FSMContext, session: A
     folder_id = int(parts[-2])
     page = int(parts[-1])
 
-    # Get folder with files
-    result = await session.execute(
-        select(TrainSafetyFolder)
-        .options(selectinload(TrainSafetyFolder.files))
-        .where(
-            TrainSafetyFolder.id == folder_id,
-            TrainSafetyFolder.is_active == True
-        )
-    )
-    folder = result.scalar_one_or_none()
-
-    if not folder:
-        await callback.answer(train_safety_error_text(), show_alert=True)
-        return
-
-    # Active files only
-    active_files = [
-        file for file in folder.files
-        if file.is_active
-    ]
-    active_files.sort(key=lambda x: (x.order_index, x.name))
-
-    # Text and keyboard
-    text = train_safety_folder_files_text(
-        folder.name,
-        folder.description,
-        len(active_files)
-    )
-    keyboard = train_safety_files_keyboard(active_files, folder_id, page, FILES_PER_PAGE)
-
-    await callback.message.edit_text(
-        text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
-    )
+    await show_files_screen(callback, session, folder_id, page)
 
 
 # File selected
@@ -316,51 +242,42 @@ async def show_file_detail(callback: CallbackQuery, state: FSMContext, session:
 
     file_id = int(callback.data.split("_")[-1])
 
-    # Get file with relations
-    result = await session.execute(
-        select(TrainSafetyFile)
-        .options(selectinload(TrainSafetyFile.folder))
-        .where(
-            TrainSafetyFile.id == file_id,
-            TrainSafetyFile.is_active == True
-        )
-    )
-    file = result.scalar_one_or_none()
+    # File and its folder from the cached tree
+    tree = await get_train_safety_tree(session)
+    file = tree.files_by_id.get(file_id)
 
     if not file:
         await callback.answer(train_safety_error_text(), show_alert=True)
         return
 
-    # Delete current message
-    await callback.message.delete()
+    folder = tree.folders_by_id[file.folder_id]
 
-    # Delete all old messages
-    await delete_user_messages(callback.bot, callback.from_user.id, "train_safety")
+    # File info text
+    file_info = train_safety_file_info_text(
+        folder_name=folder.name,
+        file_name=file.name,
+        description=file.description
+    )
+    keyboard = train_safety_file_detail_keyboard(file.folder_id)
 
     try:
-        # File info text
-        file_info = train_safety_file_info_text(
-            folder_name=file.folder.name,
-            file_name=file.name,
-            description=file.description
-        )
-
-        # Send document with caption and keyboard
-        keyboard = train_safety_file_detail_keyboard(file.folder_id)
-        doc_msg = await callback.bot.send_document(
-            chat_id=callback.from_user.id,
-            document=file.file_id,
-            caption=file_info,
+        # Hujjat (caption + tugmalar) - eski xabarlar parallel o'chiriladi
+        message_ids = await render_detail(
+            callback.bot,
+            callback.from_user.id,
+            [DetailAsset("document", file.file_id)],
+            file_info,
             reply_markup=keyboard,
-            parse_mode="HTML"
+            cleanup=delete_user_messages(callback.bot, callback.from_user.id, "train_safety")
         )
-        await store_message(callback.from_user.id, "train_safety", doc_msg.message_id)
+        for message_id in message_ids:
+            await store_message(callback.from_user.id, "train_safety", message_id)
 
-    except TelegramBadRequest:
+    except DetailRenderError:
         # Error message
         error_text = train_safety_file_error_text(
             file_name=file.name,
-            folder_name=file.folder.name
+            folder_name=folder.name
         )
 
         error_msg = await callback.bot.send_message(
@@ -384,32 +301,13 @@ async def back_to_folders(callback: CallbackQuery, state: FSMContext, session: A
     # Set state
     await state.set_state(TrainSafetyStates.viewing_folders)
 
-    # Delete all messages
-    await delete_user_messages(callback.bot, callback.from_user.id, "train_safety")
+    tree = await get_train_safety_tree(session)
+    text, keyboard = build_folders_screen(tree)
 
-    # Get folders
-    result = await session.execute(
-        select(TrainSafetyFolder)
-        .where(TrainSafetyFolder.is_active == True)
-        .order_by(TrainSafetyFolder.order_index, TrainSafetyFolder.name)
-    )
-    folders = result.scalars().all()
-
-    if not folders:
-        text = train_safety_no_folders_text()
-        keyboard = None
-    else:
-        text = train_safety_main_text()
-        keyboard = train_safety_folders_keyboard(folders, 1, FOLDERS_PER_PAGE)
-
-    # Send new message
-    new_msg = await callback.bot.send_message(
-        chat_id=callback.from_user.id,
-        text=text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
-    )
-    await store_message(callback.from_user.id, "train_safety", new_msg.message_id)
+    # Ro'yxat ekrani joyida tahrirlanadi; hujjatdan qaytganda - o'chirib qayta yuboriladi
+    sent, is_new = await render_screen(callback.message, text, keyboard)
+    if is_new:
+        await store_message(callback.from_user.id, "train_safety", sent.message_id)
 
 
 # Back from file detail
@@ -423,50 +321,8 @@ async def back_from_detail(callback: CallbackQuery, state: FSMContext, session:
     # Set state
     await state.set_state(TrainSafetyStates.viewing_files)
 
-    # Delete all messages
-    await delete_user_messages(callback.bot, callback.from_user.id, "train_safety")
-
-    # Get folder with files
-    result = await session.execute(
-        select(TrainSafetyFolder)
-        .options(selectinload(TrainSafetyFolder.files))
-        .where(
-            TrainSafetyFolder.id == folder_id,
-            TrainSafetyFolder.is_active == True
-        )
-    )
-    folder = result.scalar_one_or_none()
-
-    if not folder:
-        await callback.answer(train_safety_error_text(), show_alert=True)
-        return
-
-    # Active files only
-    active_files = [
-        file for file in folder.files
-        if file.is_active
-    ]
-    active_files.sort(key=lambda x: (x.order_index, x.name))
-
-    if not active_files:
-        text = train_safety_folder_files_text(folder.name, folder.description, 0)
-        keyboard = train_safety_empty_folder_keyboard()
-    else:
-        text = train_safety_folder_files_text(
-            folder.name,
-            folder.description,
-            len(active_files)
-        )
-        keyboard = train_safety_files_keyboard(active_files, folder_id, 1, FILES_PER_PAGE)
-
-    # Send new message
-    new_msg = await callback.bot.send_message(
-        chat_id=callback.from_user.id,
-        text=text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
-    )
-    await store_message(callback.from_user.id, "train_safety", new_msg.message_id)
+    # Ro'yxat ekrani joyida tahrirlanadi; hujjatdan qaytganda - o'chirib qayta yuboriladi
+    await show_files_screen(callback, session, folder_id)
 
 
 # Main menu callback handler
@@ -493,7 +349,7 @@ async def handle_train_safety_main_menu(callback: CallbackQuery, state: FSMConte
     await state.clear()
 
     # Send main menu with reply keyboard
-    kb = await get_main_menu_keyboard()
+    kb = get_main_menu_keyboard()
     main_menu_msg = await callback.bot.send_message(
         chat_id=callback.from_user.id,
         text=get_main_text(),
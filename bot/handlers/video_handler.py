@@ -1,13 +1,13 @@
 
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove
+from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 import asyncio
-from aiogram.utils.i18n import lazy_gettext as __, gettext as _
+from bot.utils.i18n_bundle import gettext as _
 from collections import defaultdict, deque
 import time
 
@@ -34,6 +34,9 @@ from bot.utils.texts import (
     get_main_text
 )
 from bot.buttons.reply import get_main_menu_keyboard
+from bot.utils.media_registry import send_media
+from bot.utils.navigation import open_section, run_in_background
+from bot.utils.catalogue import get_category_summaries, get_category_page, paginate_summaries
 
 video_router = Router()
 
@@ -131,7 +134,44 @@ async def _safe_delete(bot, chat_id: int, msg_id: int):
         return False
 
 
-@video_router.message(F.text == __("🎥 Video Materiallar"))
+# 🎥 Catalogue screens - GROUP BY summaries + LIMIT/OFFSET pages
+async def build_categories_screen(session: AsyncSession, page: int = 1, is_main: bool = True):
+    """Categories screen text + keyboard (None keyboard if empty)"""
+    summaries = await get_category_summaries(session, "video")
+
+    if not summaries:
+        return video_no_categories_text(), None
+
+    current_categories, page, total_pages = paginate_summaries(summaries, page, CATEGORIES_PER_PAGE)
+    text = video_main_text() if is_main else video_categories_text(page, total_pages)
+    keyboard = video_categories_keyboard(current_categories, page, total_pages)
+    return text, keyboard
+
+
+async def build_videos_screen(session: AsyncSession, category_id: int, page: int = 1):
+    """Videos page of one category - None if category not found"""
+    catalogue_page = await get_category_page(session, "video", category_id, page, VIDEOS_PER_PAGE)
+
+    if not catalogue_page:
+        return None
+
+    category = catalogue_page.category
+    if not catalogue_page.items:
+        return video_no_videos_text(category.name), video_empty_category_keyboard()
+
+    text = video_list_text(
+        category.name, category.item_count, catalogue_page.page, catalogue_page.total_pages
+    )
+    keyboard = video_list_keyboard(
+        videos=catalogue_page.items,
+        category_id=category_id,
+        current_page=catalogue_page.page,
+        total_pages=catalogue_page.total_pages
+    )
+    return text, keyboard
+
+
+# Menyu tugmasi - bot/handlers/menu_routes.py orqali chaqiriladi
 async def show_video_main(message: Message, state: FSMContext, session: AsyncSession):
     """Main video menu"""
 
@@ -142,40 +182,18 @@ async def show_video_main(message: Message, state: FSMContext, session: AsyncSes
     await state.clear()
     await state.set_state(VideoStates.viewing_categories)
 
-    # Remove reply keyboard
-    temp_msg = await message.answer("...", reply_markup=ReplyKeyboardRemove())
-    await asyncio.sleep(0.1)
-    await temp_msg.delete()
-
-    # Get categories
-    result = await session.execute(
-        select(CategoryVideo)
-        .options(selectinload(CategoryVideo.videos))
-        .order_by(CategoryVideo.name)
-    )
-    categories = result.scalars().all()
+    # Get categories (first page)
+    text, reply_markup = await build_categories_screen(session)
 
-    if not categories:
-        text = video_no_categories_text()
-        reply_markup = None
-    else:
-        text = video_main_text()
-        keyboard = video_categories_keyboard(categories, 1, 1)
-        reply_markup = keyboard
-
-    # Send new message
-    sent = await message.answer(
-        text,
-        reply_markup=reply_markup,
-        parse_mode="HTML"
-    )
+    # Reply keyboard'ni olib tashlash va inline ekran - bir vaqtda, sleep'siz
+    sent = await open_section(message, text, reply_markup)
     await store_message(message.from_user.id, "video", sent.message_id)
 
-    # Parallel o'chirish - barcha eski xabarlarni
-    await asyncio.gather(
+    # Eski xabarlarni fonda o'chirish - foydalanuvchi kutmaydi
+    run_in_background(asyncio.gather(
         delete_user_messages(message.bot, message.from_user.id, "menu"),
         delete_user_messages(message.bot, message.from_user.id, "video", exclude_ids=[sent.message_id])
-    )
+    ))
 
 
 @video_router.callback_query(F.data.startswith("video_category:"))
@@ -191,46 +209,14 @@ async def show_category_videos(callback: CallbackQuery, state: FSMContext, sessi
     # Set state
     await state.set_state(VideoStates.viewing_videos)
 
-    # Get category with videos
-    result = await session.execute(
-        select(CategoryVideo)
-        .options(selectinload(CategoryVideo.videos))
-        .where(CategoryVideo.id == category_id)
-    )
-    category = result.scalar_one_or_none()
+    # Only the requested page of videos is loaded
+    screen = await build_videos_screen(session, category_id, page)
 
-    if not category:
+    if not screen:
         await callback.answer(video_error_text(), show_alert=True)
         return
 
-    if not category.videos:
-        text = video_no_videos_text(category.name)
-        keyboard = video_empty_category_keyboard()
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-        return
-
-    # Pagination - newest videos first
-    videos = sorted(category.videos, key=lambda x: x.id, reverse=True)
-    total_items = len(videos)
-    total_pages = (total_items + VIDEOS_PER_PAGE - 1) // VIDEOS_PER_PAGE
-
-    # Validate page
-    page = max(1, min(page, total_pages))
-
-    # Current page items
-    start_idx = (page - 1) * VIDEOS_PER_PAGE
-    end_idx = min(start_idx + VIDEOS_PER_PAGE, total_items)
-    current_videos = videos[start_idx:end_idx]
-
-    # Text and keyboard
-    text = video_list_text(category.name, total_items, page, total_pages)
-    keyboard = video_list_keyboard(
-        videos=current_videos,
-        category_id=category_id,
-        current_page=page,
-        total_pages=total_pages
-    )
-
+    text, keyboard = screen
     await callback.message.edit_text(
         text,
         reply_markup=keyboard,
@@ -265,9 +251,8 @@ async def show_video_detail(callback: CallbackQuery, state: FSMContext, session:
 
     try:
         # 1. Send video file
-        video_msg = await callback.bot.send_video(
-            chat_id=callback.from_user.id,
-            video=video.file,
+        video_msg = await send_media(
+            callback.bot, "video", callback.from_user.id, video.file,
             caption=video_detail_text(
                 video.name,
                 video.category.name,
@@ -344,27 +329,10 @@ async def back_to_categories(callback: CallbackQuery, state: FSMContext, session
     # Delete current message
     await callback.message.delete()
 
-    # Load categories
-    result = await session.execute(
-        select(CategoryVideo)
-        .options(selectinload(CategoryVideo.videos))
-        .order_by(CategoryVideo.name)
-    )
-    categories = result.scalars().all()
-
-    if not categories:
-        new_msg = await callback.bot.send_message(
-            chat_id=callback.from_user.id,
-            text=video_no_categories_text(),
-            parse_mode="HTML"
-        )
-        await store_message(callback.from_user.id, "video", new_msg.message_id)
-        return
+    # Load categories (first page)
+    text, keyboard = await build_categories_screen(session)
 
     # Send new message
-    text = video_main_text()
-    keyboard = video_categories_keyboard(categories, 1, 1)
-
     new_msg = await callback.bot.send_message(
         chat_id=callback.from_user.id,
         text=text,
@@ -393,49 +361,14 @@ async def back_from_detail(callback: CallbackQuery, state: FSMContext, session:
     # Delete all current messages
     await delete_user_messages(callback.bot, callback.from_user.id, "video")
 
-    # Load category
-    result = await session.execute(
-        select(CategoryVideo)
-        .options(selectinload(CategoryVideo.videos))
-        .where(CategoryVideo.id == category_id)
-    )
-    category = result.scalar_one_or_none()
+    # Load first page of the category
+    screen = await build_videos_screen(session, category_id)
 
-    if not category:
+    if not screen:
         await callback.answer(video_error_text(), show_alert=True)
         return
 
-    if not category.videos:
-        text = video_no_videos_text(category.name)
-        keyboard = video_empty_category_keyboard()
-
-        new_msg = await callback.bot.send_message(
-            chat_id=callback.from_user.id,
-            text=text,
-            reply_markup=keyboard,
-            parse_mode="HTML"
-        )
-        await store_message(callback.from_user.id, "video", new_msg.message_id)
-        return
-
-    # Pagination - newest videos first
-    videos = sorted(category.videos, key=lambda x: x.id, reverse=True)
-    total_items = len(videos)
-    total_pages = (total_items + VIDEOS_PER_PAGE - 1) // VIDEOS_PER_PAGE
-
-    # Current page items (page 1)
-    start_idx = 0
-    end_idx = min(VIDEOS_PER_PAGE, total_items)
-    current_videos = videos[start_idx:end_idx]
-
-    # Text and keyboard
-    text = video_list_text(category.name, total_items, 1, total_pages)
-    keyboard = video_list_keyboard(
-        videos=current_videos,
-        category_id=category_id,
-        current_page=1,
-        total_pages=total_pages
-    )
+    text, keyboard = screen
 
     # Send new message
     new_msg = await callback.bot.send_message(
@@ -467,7 +400,7 @@ async def handle_video_main_menu(callback: CallbackQuery, state: FSMContext):
     await state.clear()
 
     # Send main menu with reply keyboard
-    kb = await get_main_menu_keyboard()
+    kb = get_main_menu_keyboard()
     main_menu_msg = await callback.bot.send_message(
         chat_id=callback.from_user.id,
         text=get_main_text(),
@@ -487,34 +420,13 @@ async def show_categories_page(callback: CallbackQuery, state: FSMContext, sessi
 
     page = int(callback.data.split(":")[1])
 
-    # Get categories
-    result = await session.execute(
-        select(CategoryVideo)
-        .options(selectinload(CategoryVideo.videos))
-        .order_by(CategoryVideo.name)
-    )
-    categories = result.scalars().all()
+    # Get categories page
+    text, keyboard = await build_categories_screen(session, page, is_main=False)
 
-    if not categories:
+    if keyboard is None:
         await callback.answer(video_error_text(), show_alert=True)
         return
 
-    # Pagination
-    total_items = len(categories)
-    total_pages = (total_items + CATEGORIES_PER_PAGE - 1) // CATEGORIES_PER_PAGE
-
-    # Validate page
-    page = max(1, min(page, total_pages))
-
-    # Current page items
-    start_idx = (page - 1) * CATEGORIES_PER_PAGE
-    end_idx = min(start_idx + CATEGORIES_PER_PAGE, total_items)
-    current_categories = categories[start_idx:end_idx]
-
-    # Text and keyboard
-    text = video_categories_text(page, total_pages)
-    keyboard = video_categories_keyboard(current_categories, page, total_pages)
-
     await callback.message.edit_text(
         text,
         reply_markup=keyboard,
@@ -1,3 +1,6 @@
+import logging
+import time
+from collections import OrderedDict
 from typing import Callable, Awaitable, Dict, Any, List
 from aiogram import BaseMiddleware, Bot
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
@@ -9,13 +12,22 @@ from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from aiogram.utils.i18n import I18n
-from bot.utils.user_helpers import get_user_by_telegram_id
+from bot.utils.user_helpers import get_user_by_telegram_id, get_admin_telegram_ids
+from bot.utils.flood_control import FloodControl
+from bot.utils.metrics import metrics
+from bot.utils.i18n_bundle import set_locale
+from bot.utils.navigation import run_in_background
 
 from db.models import Channel
 
+logger = logging.getLogger(__name__)
+
 MAX_STORED_MESSAGES = 2
 user_warn_messages: Dict[int, list[int]] = {}  # user_id -> list of warning message_ids
 
+RATE_LIMIT_MAX_USERS = 50_000  # xotiradagi userlar chegarasi
+ADMIN_IDS_REFRESH_INTERVAL = 300  # sekund - admin ro'yxati bazadan shu oraliqda yangilanadi
+
 
 def create_channel_join_keyboard(channels: List[Channel]) -> InlineKeyboardMarkup:
     """Guruh/kanallarga qo'shilish uchun inline tugmalar"""
@@ -221,7 +233,8 @@ class JoinChannelMiddleware(BaseMiddleware):
 
 class UserLanguageMiddleware(BaseMiddleware):
     """
-    Har requestda user tilini database'dan yuklaydi va i18n'ga o'rnatadi
+    Har requestda user tilini database'dan yuklaydi va contextvar'larga o'rnatadi
+    (umumiy I18n obyektining atributi o'zgartirilmaydi - parallel update'lar bir-biriga ta'sir qilmaydi)
     """
 
     def __init__(self, session_pool: async_sessionmaker[AsyncSession], i18n: I18n):
@@ -229,6 +242,11 @@ class UserLanguageMiddleware(BaseMiddleware):
         self.i18n = i18n
         self.default_locale = "uz"
 
+    def use_locale(self, locale: str):
+        """Joriy update uchun til: aiogram i18n va matn bundle'lari"""
+        self.i18n.ctx_locale.set(locale)
+        set_locale(locale)
+
     async def __call__(
             self,
             handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
@@ -238,7 +256,7 @@ class UserLanguageMiddleware(BaseMiddleware):
         # User telegram_id olish
         user_obj = getattr(event, 'from_user', None)
         if not user_obj:
-            self.i18n.current_locale = self.default_locale
+            self.use_locale(self.default_locale)
             return await handler(event, data)
 
         telegram_id = user_obj.id
@@ -249,28 +267,89 @@ class UserLanguageMiddleware(BaseMiddleware):
                 user = await get_user_by_telegram_id(session, telegram_id)
 
                 if user and user.language_code:
-                    self.i18n.current_locale = user.language_code
+                    self.use_locale(user.language_code)
                 else:
-                    self.i18n.current_locale = self.default_locale
+                    self.use_locale(self.default_locale)
 
         except Exception as e:
             print(f"Error loading user language: {e}")
-            self.i18n.current_locale = self.default_locale
+            self.use_locale(self.default_locale)
 
         return await handler(event, data)
 
 
-class RateLimitMiddleware(BaseMiddleware):
-    """Spam oldini olish uchun rate limiting middleware"""
+class AdminIds:
+    """Admin telegram ID'lari (users.role = superuser) - fonda davriy yangilanadi"""
+
+    def __init__(self, refresh_interval: float = ADMIN_IDS_REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self._ids: frozenset[int] = frozenset()
+        self._loaded_at = float("-inf")
+        self._loading = False
+
+    async def _reload(self):
+        try:
+            self._ids = frozenset(await get_admin_telegram_ids())
+        except Exception as e:
+            logger.error(f"Error loading admin ids: {e}")
+        finally:
+            self._loaded_at = time.monotonic()
+            self._loading = False
+
+    def __contains__(self, telegram_id: int) -> bool:
+        if not self._loading and time.monotonic() - self._loaded_at > self.refresh_interval:
+            # So'rov kutib turmaydi - yangilangan ro'yxat keyingi update'lardan ishlaydi
+            self._loading = True
+            run_in_background(self._reload())
+        return telegram_id in self._ids
 
-    def __init__(self, rate_limit: float = 1.0):
-        self.rate_limit = rate_limit  # Soniya
-        self.user_requests = {}  # user_id: timestamp
 
-        # Admin user IDs (spam limit yo'q)
-        self.admin_ids = {
-            900172087,  # Sizning telegram ID
-        }
+# Global instance
+admin_ids = AdminIds()
+
+
+class RateLimitMiddleware(BaseMiddleware):
+    """
+    Spam oldini olish uchun rate limiting middleware (token bucket):
+    - har rate_limit soniyada 1 ta so'rov, burst ta so'rovgacha ketma-ket ruxsat
+    - userlar OrderedDict'da oxirgi faollik tartibida - eskirganlari boshidan O(1) chiqariladi
+    - rad etilgan so'rovlar metrics'da hisoblanadi
+    """
+
+    def __init__(self, rate_limit: float = 1.0, burst: int = 1, name: str = "default",
+                 max_users: int = RATE_LIMIT_MAX_USERS):
+        self.rate_limit = rate_limit  # Soniya (bitta token tiklanishi)
+        self.burst = burst
+        self.name = name
+        self.max_users = max_users
+        self.idle_ttl = rate_limit * burst  # shundan keyin bucket to'la - saqlash shart emas
+        self.user_buckets: OrderedDict[int, tuple[float, float]] = OrderedDict()  # user_id: (tokens, last_seen)
+
+    def _expire(self, now: float):
+        buckets = self.user_buckets
+        while buckets:
+            user_id, (_tokens, last_seen) = next(iter(buckets.items()))
+            if now - last_seen <= self.idle_ttl and len(buckets) <= self.max_users:
+                break
+            buckets.popitem(last=False)
+
+    def allow(self, user_id: int) -> bool:
+        """Token bucket tekshiruvi (ruxsat bo'lsa token sarflanadi)"""
+        now = time.monotonic()
+        self._expire(now)
+
+        bucket = self.user_buckets.pop(user_id, None)
+        if bucket is None:
+            tokens = float(self.burst)
+        else:
+            tokens, last_seen = bucket
+            tokens = min(float(self.burst), tokens + (now - last_seen) / self.rate_limit)
+
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+        self.user_buckets[user_id] = (tokens, now)
+        return allowed
 
     async def __call__(
             self,
@@ -283,34 +362,47 @@ class RateLimitMiddleware(BaseMiddleware):
         if not user:
             return await handler(event, data)
 
-        user_id = user.id
-
         # Admin'lar uchun rate limit yo'q
-        if user_id in self.admin_ids:
+        if user.id in admin_ids:
             return await handler(event, data)
 
-        # Rate limit tekshiruvi
-        import time
-        now = time.time()
+        if not self.allow(user.id):
+            # Spam - ignore qilish
+            metrics.inc("rate_limit_rejected_total", limiter=self.name)
+            return
+
+        return await handler(event, data)
 
-        if user_id in self.user_requests:
-            time_passed = now - self.user_requests[user_id]
-            if time_passed < self.rate_limit:
-                # Spam - ignore qilish
-                print(f"🚫 Rate limit: User {user_id}")
-                return
 
-        # Request'ni record qilish
-        self.user_requests[user_id] = now
+class FloodControlMiddleware(BaseMiddleware):
+    """Matn va callback'lar uchun flood himoyasi (progressive ban bilan)"""
 
-        # Memory cleanup (1000+ user bo'lganda)
-        if len(self.user_requests) > 1000:
-            cleanup_threshold = 3600  # 1 soat
-            users_to_remove = [
-                uid for uid, timestamp in self.user_requests.items()
-                if now - timestamp > cleanup_threshold
-            ]
-            for uid in users_to_remove:
-                del self.user_requests[uid]
+    def __init__(self, flood: FloodControl, kind: str | None = None):
+        self.flood = flood
+        self.kind = kind
 
-        return await handler(event, data)
\ No newline at end of file
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        user = getattr(event, 'from_user', None)
+        if not user:
+            return await handler(event, data)
+
+        decision = self.flood.hit(user.id, self.kind)
+        if decision.allowed:
+            return await handler(event, data)
+
+        metrics.inc("flood_rejected_total", reason=decision.reason)
+
+        # Callback "soat" belgisida qolib ketmasligi uchun javob beriladi
+        if isinstance(event, CallbackQuery):
+            try:
+                await event.answer(
+                    f"⏳ Juda ko'p so'rov! {int(decision.retry_after) + 1} soniyadan keyin urinib ko'ring.",
+                    show_alert=False
+                )
+            except Exception:
+                pass
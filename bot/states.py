@@ -32,6 +32,7 @@ class EquipmentState(StatesGroup):
     choosing_facility = State()
     choosing_equipment = State()
     viewing_detail = State()
+    searching_serial = State()
 
 class ExamSearchState(StatesGroup):
     """Exam_schedule handler states"""
@@ -66,3 +67,6 @@ class TrainSafetyStates(StatesGroup):
     viewing_files = State()
 
 
+class SearchStates(StatesGroup):
+    """Search handler states"""
+    waiting_query = State()
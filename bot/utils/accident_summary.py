@@ -0,0 +1,108 @@
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select, func, table, column, Integer, String, BigInteger, cast
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Accident
+
+# Materialized view (migratsiya b41d7e6c2a90) - hodisa yozilganda trigger orqali yangilanadi
+accident_counts = table(
+    "accident_year_category_counts",
+    column("year_id", Integer),
+    column("year_name", String),
+    column("year_number", Integer),
+    column("category_id", Integer),
+    column("category_name", String),
+    column("accident_count", BigInteger),
+)
+
+
+class YearSummary(NamedTuple):
+    """Yil: id, nomi, raqami, jami hodisalar va statistikaga kiradigan hodisalar soni"""
+    id: int
+    name: str
+    year_number: int
+    accident_count: int
+    reported_count: int
+
+
+class CategoryCount(NamedTuple):
+    """Kategoriya nomi va hodisalar soni (statistika uchun)"""
+    name: str
+    count: int
+
+
+class AccidentItem(NamedTuple):
+    """Ro'yxat tugmasi uchun yengil element (description yuklanmaydi)"""
+    id: int
+    title: str
+
+
+async def get_year_summaries(session: AsyncSession, excluded_category: str) -> list[YearSummary]:
+    """Barcha yillar + hodisalar soni - view'dan bitta so'rov, yangi yillar birinchi"""
+    reported = func.coalesce(
+        func.sum(accident_counts.c.accident_count).filter(
+            accident_counts.c.category_name != excluded_category
+        ),
+        0
+    )
+    result = await session.execute(
+        select(
+            accident_counts.c.year_id,
+            accident_counts.c.year_name,
+            accident_counts.c.year_number,
+            func.sum(accident_counts.c.accident_count),
+            reported
+        )
+        .group_by(
+            accident_counts.c.year_id,
+            accident_counts.c.year_name,
+            accident_counts.c.year_number
+        )
+        .order_by(accident_counts.c.year_number.desc(), accident_counts.c.year_name.desc())
+    )
+    return [
+        YearSummary(year_id, name, year_number, int(total), int(reported_count))
+        for year_id, name, year_number, total, reported_count in result.all()
+    ]
+
+
+def find_year(summaries: list[YearSummary], year_id: int) -> Optional[YearSummary]:
+    """Ro'yxatdan yilni topish"""
+    return next((summary for summary in summaries if summary.id == year_id), None)
+
+
+async def get_year_category_counts(
+        session: AsyncSession,
+        year_id: int,
+        excluded_category: str
+) -> list[CategoryCount]:
+    """Bitta yil uchun kategoriyalar bo'yicha taqsimot (ko'pidan kamiga)"""
+    result = await session.execute(
+        select(accident_counts.c.category_name, accident_counts.c.accident_count)
+        .where(
+            accident_counts.c.year_id == year_id,
+            accident_counts.c.category_id.isnot(None),
+            accident_counts.c.category_name != excluded_category
+        )
+        .order_by(accident_counts.c.accident_count.desc())
+    )
+    return [CategoryCount(name, int(count)) for name, count in result.all()]
+
+
+async def get_year_accident_page(
+        session: AsyncSession,
+        year_id: int,
+        page: int,
+        per_page: int
+) -> list[AccidentItem]:
+    """Tanlangan yilning faqat bitta sahifasi - sarlavhadagi raqam bo'yicha tartiblangan"""
+    title_number = func.coalesce(cast(func.substring(Accident.title, r"\d{1,9}"), Integer), 0)
+    result = await session.execute(
+        select(Accident.id, Accident.title)
+        .where(Accident.year_id == year_id)
+        .order_by(title_number, Accident.id)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+    )
+    return [AccidentItem(*row) for row in result.all()]
@@ -0,0 +1,154 @@
+import logging
+import re
+import zlib
+from typing import NamedTuple, Optional
+
+from bot.utils.cache import AsyncTTLCache
+from bot.utils.transliterate import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# 🎯 CONSTANTS
+ANSWER_CACHE_MAX_SIZE = 1000
+ANSWER_CACHE_TTL = 7 * 24 * 3600  # sekund - xavfsizlik javoblari tez eskirmaydi
+SEMANTIC_DIM = 1024  # xeshlangan n-gram vektor o'lchami
+# Kosinus o'xshashlik chegarasi (o'lchangan misollar):
+#   "6 kv ... xavfsiz masofa qancha" / "35 kv ..."                     0.909  (boshqa javob!)
+#   "10 kv ..." / "110 kv ..."                                         0.883  (boshqa javob!)
+#   "...qo'lqopni qanday tekshirish kerak" / "...qo'lqoplarni ..."     0.886
+#   "...birinchi yordam qanday ko'rsatiladi" / "...birinci yordam..."  0.916  (imlo xatosi)
+#   "...kamari qanday taqiladi" / "...kamari qanday taqiladi ekan"     0.956
+# Qayta ifodalangan savollar 0.70-0.89 oralig'ida - ular aniq moslikka qoldiriladi,
+# raqam va inkor so'zlari esa qo'shimcha ravishda aynan mos kelishi shart (_guard_tokens)
+SEMANTIC_THRESHOLD = 0.95
+SEMANTIC_MIN_TOKENS = 2  # bitta so'zli savollar faqat aniq moslik bilan
+
+# Semantik qatlam ixtiyoriy va odatda O'CHIQ: numpy requirements.txt'da yo'q,
+# shuning uchun deploy qilingan botda faqat aniq moslik ishlaydi (yoqish uchun numpy o'rnating)
+try:
+    import numpy as np
+    SEMANTIC_AVAILABLE = True
+except ImportError:
+    np = None
+    SEMANTIC_AVAILABLE = False
+
+_APOSTROPHES = str.maketrans({"ʻ": "'", "ʼ": "'", "‘": "'", "’": "'", "`": "'"})
+_TOKEN_RE = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+# Javobni hal qiluvchi so'zlar: raqamlar (6 kv / 35 kv) va inkor (etiladimi / etilmaydimi)
+_NEGATION_WORDS = {"emas", "yo'q", "yoq", "hech", "taqiqlanadi", "taqiqlangan", "mumkinmas"}
+_NEGATION_SUFFIX_RE = re.compile(r"ma(?:y\w*|s(?:a|dan|lik\w*|in)?|gan\w*|di\w*|ng\w*|sin\w*)?$")
+
+
+class CachedAnswer(NamedTuple):
+    """Keshdagi javob va uni bergan xizmat"""
+    answer: str
+    service_used: str
+
+
+def question_key(question: str) -> str:
+    """Savolning normallashtirilgan kaliti: lotin, kichik harf, faqat so'zlar"""
+    return " ".join(_TOKEN_RE.findall(normalize_text(question.translate(_APOSTROPHES))))
+
+
+def _guard_tokens(key: str) -> tuple[frozenset, frozenset]:
+    """Semantik moslikda aynan mos kelishi kerak bo'lgan so'zlar: (raqamlar, inkorlar)"""
+    tokens = key.split()
+    numbers = frozenset(token for token in tokens if any(char.isdigit() for char in token))
+    negations = frozenset(
+        token for token in tokens
+        if token.removesuffix("mi") in _NEGATION_WORDS or _NEGATION_SUFFIX_RE.search(token)
+    )
+    return numbers, negations
+
+
+def _embed(key: str):
+    """Lokal vektor: so'z va harf uchliklari xeshlanadi, L2 normallashtiriladi"""
+    vector = np.zeros(SEMANTIC_DIM, dtype=np.float32)
+    for token in key.split():
+        vector[zlib.crc32(token.encode()) % SEMANTIC_DIM] += 2.0
+        padded = f"#{token}#"
+        for i in range(len(padded) - 2):
+            vector[zlib.crc32(padded[i:i + 3].encode()) % SEMANTIC_DIM] += 1.0
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class AIAnswerCache:
+    """
+    AI javoblari keshi:
+    - aniq moslik: normallashtirilgan savol kaliti (TTL + LRU)
+    - semantik moslik (numpy bo'lsa): eng yaqin savol, raqam va inkorlar aynan mos bo'lsa
+    """
+
+    def __init__(self, maxsize: int = ANSWER_CACHE_MAX_SIZE, ttl: float = ANSWER_CACHE_TTL):
+        self._answers = AsyncTTLCache(maxsize=maxsize, ttl=ttl)
+        self._vectors: dict[str, object] = {}
+        self._matrix = None
+        self._matrix_keys: list[str] = []
+
+    def _semantic_lookup(self, key: str) -> Optional[CachedAnswer]:
+        if not SEMANTIC_AVAILABLE or len(key.split()) < SEMANTIC_MIN_TOKENS or not self._vectors:
+            return None
+
+        if self._matrix is None:
+            self._matrix_keys = list(self._vectors)
+            self._matrix = np.stack([self._vectors[k] for k in self._matrix_keys])
+
+        scores = self._matrix @ _embed(key)
+        best = int(np.argmax(scores))
+        if scores[best] < SEMANTIC_THRESHOLD:
+            return None
+
+        best_key = self._matrix_keys[best]
+        if _guard_tokens(best_key) != _guard_tokens(key):
+            # O'xshash, lekin raqam yoki inkor farq qiladi - boshqa savol
+            return None
+
+        match = self._answers.get(best_key)
+        if match is None:
+            # Muddati o'tgan yoki LRU'dan chiqqan - vektor ham olib tashlanadi
+            self._drop_vector(best_key)
+        return match
+
+    def _drop_vector(self, key: str):
+        if self._vectors.pop(key, None) is not None:
+            self._matrix = None
+
+    def lookup(self, question: str) -> Optional[CachedAnswer]:
+        """Keshdan javob (aniq, keyin semantik moslik)"""
+        key = question_key(question)
+        if not key:
+            return None
+
+        answer = self._answers.get(key)
+        if answer is not None:
+            return answer
+        return self._semantic_lookup(key)
+
+    def store(self, question: str, answer: str, service_used: str):
+        """Javobni saqlash"""
+        key = question_key(question)
+        if not key:
+            return
+
+        self._answers.set(key, CachedAnswer(answer, service_used))
+
+        if SEMANTIC_AVAILABLE:
+            # LRU'dan chiqib ketgan kalitlar vektorlarini ham tozalash
+            if len(self._vectors) >= len(self._answers):
+                for stale in [k for k in self._vectors if k not in self._answers]:
+                    self._drop_vector(stale)
+            self._vectors[key] = _embed(key)
+            self._matrix = None
+
+    def clear(self):
+        """Butun keshni tozalash"""
+        self._answers.clear()
+        self._vectors.clear()
+        self._matrix = None
+
+
+# Global instance
+answer_cache = AIAnswerCache()
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+
+from bot.utils.ai_answer_cache import question_key
+
+logger = logging.getLogger(__name__)
+
+# 🎯 CONSTANTS
+INFLIGHT_DONE = "done"
+INFLIGHT_JOINED = "joined"  # xuddi shu savol allaqachon bajarilmoqda edi
+INFLIGHT_SUPERSEDED = "superseded"  # yangi savol kelgani uchun bekor qilindi
+
+POLICY_SUPERSEDE = "supersede"  # yangi savol eskisini bekor qiladi
+POLICY_QUEUE = "queue"  # yangi savol eskisi tugashini kutadi
+
+
+class InflightResult(NamedTuple):
+    """Registr natijasi: holat va (bajarilgan bo'lsa) qiymat"""
+    status: str
+    value: Any = None
+
+
+class _Inflight(NamedTuple):
+    key: str
+    task: asyncio.Task
+
+
+async def _wait_quietly(task: asyncio.Task):
+    """Boshqa so'rov tugashini kutish (uning xatosi yoki bekor qilinishi bu yerga o'tmaydi)"""
+    try:
+        await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if not task.cancelled():
+            raise
+    except Exception:
+        pass
+
+
+class InflightRegistry:
+    """
+    User bo'yicha faol AI so'rovlari:
+    - bir userda bir vaqtda bitta generatsiya
+    - bir xil (normallashtirilgan) savol mavjud so'rovga qo'shiladi
+    - boshqa savol: eskisini bekor qiladi (supersede) yoki navbatda kutadi (queue)
+    """
+
+    def __init__(self, policy: str = POLICY_SUPERSEDE):
+        self.policy = policy
+        self._active: dict[int, _Inflight] = {}
+
+    def is_busy(self, user_id: int) -> bool:
+        entry = self._active.get(user_id)
+        return entry is not None and not entry.task.done()
+
+    async def run(self, user_id: int, question: str, factory: Callable[[], Awaitable]) -> InflightResult:
+        """factory() ni registr orqali bajarish"""
+        key = question_key(question)
+        current = self._active.get(user_id)
+
+        if current is not None and not current.task.done():
+            if current.key == key:
+                # Takroriy yuborilgan savol - javob mavjud so'rov xabarida chiqadi
+                await _wait_quietly(current.task)
+                return InflightResult(INFLIGHT_JOINED)
+
+            if self.policy == POLICY_SUPERSEDE:
+                current.task.cancel()
+            else:
+                # Navbat: oldingi so'rov(lar) tugashini kutish
+                while self.is_busy(user_id):
+                    await _wait_quietly(self._active[user_id].task)
+
+        task = asyncio.create_task(factory())
+        entry = _Inflight(key, task)
+        self._active[user_id] = entry
+
+        try:
+            return InflightResult(INFLIGHT_DONE, await asyncio.shield(task))
+        except asyncio.CancelledError:
+            if task.cancelled():
+                # Keyingi savol bu so'rovni bekor qildi
+                return InflightResult(INFLIGHT_SUPERSEDED)
+            # Handler'ning o'zi bekor qilindi - generatsiya ham to'xtatiladi
+            task.cancel()
+            raise
+        finally:
+            if self._active.get(user_id) is entry:
+                del self._active[user_id]
+
+    def cancel(self, user_id: int) -> bool:
+        """User so'rovini bekor qilish (masalan, chat tozalanganda)"""
+        entry: Optional[_Inflight] = self._active.get(user_id)
+        if entry is None or entry.task.done():
+            return False
+        entry.task.cancel()
+        return True
+
+
+# Global instance
+ai_inflight = InflightRegistry()
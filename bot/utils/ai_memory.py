@@ -0,0 +1,222 @@
+import asyncio
+import json
+import logging
+import time
+import zlib
+from collections import OrderedDict
+from typing import Awaitable, NamedTuple, Optional
+
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
+
+from db import db
+from db.models import AIConversation
+from bot.utils.navigation import run_in_background
+
+logger = logging.getLogger(__name__)
+
+# 🎯 CONSTANTS
+MEMORY_MAX_CHARS = 2_000_000  # barcha userlar suhbatlari uchun RAM chegarasi (belgi)
+MEMORY_MAX_USERS = 5000  # RAM'dagi suhbatlar soni chegarasi
+MEMORY_EMPTY_CACHE_SIZE = 10_000  # tarixi yo'q userlar (bazaga qayta murojaat qilinmaydi)
+MEMORY_USER_MAX_TURNS = 20  # bitta user uchun oxirgi xabarlar
+MEMORY_USER_MAX_CHARS = 12_000  # bitta user tarixining chegarasi
+MEMORY_IDLE_TTL = 24 * 3600  # sekund - bundan eski suhbat kontekstga olinmaydi
+MEMORY_PERSIST = True  # suhbatlarni siqib bazaga yozish (restartdan keyin ham saqlanadi)
+CHARS_PER_TOKEN = 4  # tokenizer'siz taxminiy hisob
+TOKENS_PER_MESSAGE = 4  # rol/format uchun qo'shimcha
+
+
+class Turn(NamedTuple):
+    """Suhbatdagi bitta xabar"""
+    role: str
+    content: str
+    timestamp: float
+
+
+def estimate_tokens(text: str) -> int:
+    """Matn tokenlari soni (taxminan)"""
+    return len(text) // CHARS_PER_TOKEN + TOKENS_PER_MESSAGE
+
+
+def pack_turns(turns: list[Turn], max_tokens: int, max_turns: Optional[int] = None) -> list[Turn]:
+    """Eng yangi xabarlardan boshlab token budjetiga sig'adiganlari (xronologik tartibda)"""
+    packed = []
+    used = 0
+    for turn in reversed(turns[-max_turns:] if max_turns else turns):
+        cost = estimate_tokens(turn.content)
+        if used + cost > max_tokens:
+            remaining = (max_tokens - used - TOKENS_PER_MESSAGE) * CHARS_PER_TOKEN
+            if not packed and remaining > 0:
+                # Oxirgi xabar ham sig'masa - qisqartirilgan holda
+                packed.append(turn._replace(content=turn.content[:remaining] + "..."))
+            break
+        packed.append(turn)
+        used += cost
+
+    packed.reverse()
+    return packed
+
+
+def _turns_size(turns: list[Turn]) -> int:
+    return sum(len(turn.content) for turn in turns)
+
+
+def _encode(turns: list[Turn]) -> bytes:
+    return zlib.compress(json.dumps([list(turn) for turn in turns], ensure_ascii=False).encode(), 6)
+
+
+def _decode(data: bytes) -> list[Turn]:
+    return [Turn(*item) for item in json.loads(zlib.decompress(data))]
+
+
+class ConversationMemory:
+    """
+    AI suhbat xotirasi:
+    - RAM'da LRU: belgi budjeti yoki user soni oshsa eng uzoq faol bo'lmagan user chiqariladi
+    - bo'sh/eskirgan tarix RAM'da saqlanmaydi - faqat cheklangan "tarixi yo'q" ro'yxatida
+    - har bir user tarixi xabar soni va belgi bo'yicha cheklangan
+    - ixtiyoriy: zlib bilan siqilgan nusxa bazada (RAM'dan chiqqan user qayta yuklanadi),
+      bitta userning save/clear yozuvlari navbat bilan bajariladi
+    """
+
+    def __init__(
+            self,
+            max_chars: int = MEMORY_MAX_CHARS,
+            max_users: int = MEMORY_MAX_USERS,
+            persist: bool = MEMORY_PERSIST
+    ):
+        self.max_chars = max_chars
+        self.max_users = max_users
+        self.persist = persist
+        self._hot: OrderedDict[int, list[Turn]] = OrderedDict()
+        self._empty: OrderedDict[int, None] = OrderedDict()
+        self._chars = 0
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._writes: dict[int, asyncio.Future] = {}
+
+    def _put(self, user_id: int, turns: list[Turn]):
+        self._drop(user_id)
+        self._empty.pop(user_id, None)
+        self._hot[user_id] = turns
+        self._chars += _turns_size(turns)
+
+        while (self._chars > self.max_chars or len(self._hot) > self.max_users) and len(self._hot) > 1:
+            _evicted_id, evicted = self._hot.popitem(last=False)
+            self._chars -= _turns_size(evicted)
+
+    def _drop(self, user_id: int):
+        turns = self._hot.pop(user_id, None)
+        if turns is not None:
+            self._chars -= _turns_size(turns)
+
+    def _mark_empty(self, user_id: int):
+        self._drop(user_id)
+        self._empty[user_id] = None
+        self._empty.move_to_end(user_id)
+        if len(self._empty) > MEMORY_EMPTY_CACHE_SIZE:
+            self._empty.popitem(last=False)
+
+    async def _load(self, user_id: int) -> list[Turn]:
+        if not self.persist:
+            return []
+        try:
+            async with db.get_session() as session:
+                data = await session.scalar(
+                    select(AIConversation.data).where(AIConversation.user_id == user_id)
+                )
+            return _decode(data) if data else []
+        except Exception as e:
+            logger.error(f"AI memory load error ({user_id}): {e}")
+            return []
+
+    async def _load_once(self, user_id: int) -> list[Turn]:
+        """Bazadan yuklash - bir vaqtdagi so'rovlar bitta SELECT'ni kutadi"""
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            turns = self._hot.get(user_id)
+            if turns is None:
+                turns = [] if user_id in self._empty else await self._load(user_id)
+        if not lock.locked():
+            self._locks.pop(user_id, None)
+        return turns
+
+    def _write(self, user_id: int, operation: Awaitable) -> asyncio.Future:
+        """Userning bazaga yozuvlari navbat bilan - kechikkan save clear'dan keyin tushmaydi"""
+        previous = self._writes.get(user_id)
+
+        async def run_after_previous():
+            if previous is not None:
+                await asyncio.wait({previous})
+            await operation
+
+        task = run_in_background(run_after_previous())
+        self._writes[user_id] = task
+
+        def on_done(done: asyncio.Future):
+            if self._writes.get(user_id) is done:
+                del self._writes[user_id]
+
+        task.add_done_callback(on_done)
+        return task
+
+    async def _save(self, user_id: int, turns: list[Turn]):
+        async with db.get_session() as session:
+            stmt = insert(AIConversation).values(user_id=user_id, data=_encode(turns))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[AIConversation.user_id],
+                set_={"data": stmt.excluded.data}
+            )
+            await session.execute(stmt)
+            await session.commit()
+
+    async def _delete(self, user_id: int):
+        try:
+            async with db.get_session() as session:
+                await session.execute(delete(AIConversation).where(AIConversation.user_id == user_id))
+                await session.commit()
+        except Exception as e:
+            logger.error(f"AI memory clear error ({user_id}): {e}")
+
+    async def get(self, user_id: int) -> list[Turn]:
+        """User suhbati (eskirgan xabarlarsiz)"""
+        loaded = False
+        turns = self._hot.get(user_id)
+        if turns is not None:
+            self._hot.move_to_end(user_id)
+        elif user_id in self._empty:
+            self._empty.move_to_end(user_id)
+            return []
+        else:
+            turns = await self._load_once(user_id)
+            loaded = True
+
+        cutoff = time.time() - MEMORY_IDLE_TTL
+        fresh = [turn for turn in turns if turn.timestamp >= cutoff]
+        if not fresh:
+            self._mark_empty(user_id)
+        elif loaded or len(fresh) != len(turns):
+            self._put(user_id, fresh)
+        return fresh
+
+    async def append(self, user_id: int, question: str, answer: str):
+        """Savol-javobni qo'shish"""
+        now = time.time()
+        turns = await self.get(user_id) + [Turn("user", question, now), Turn("assistant", answer, now)]
+        turns = turns[-MEMORY_USER_MAX_TURNS:]
+        while len(turns) > 2 and _turns_size(turns) > MEMORY_USER_MAX_CHARS:
+            turns = turns[2:]
+
+        self._put(user_id, turns)
+        if self.persist:
+            self._write(user_id, self._save(user_id, turns))
+
+    async def clear(self, user_id: int):
+        """User suhbatini tozalash"""
+        self._mark_empty(user_id)
+        if self.persist:
+            await self._write(user_id, self._delete(user_id))
+
+
+# Global instance
+ai_memory = ConversationMemory()
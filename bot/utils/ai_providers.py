@@ -0,0 +1,323 @@
+import asyncio
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# 🎯 CONSTANTS
+AI_POOL_MAX_CONNECTIONS = 50
+AI_POOL_MAX_KEEPALIVE = 20
+AI_POOL_KEEPALIVE_EXPIRY = 60  # sekund
+AI_CONNECT_TIMEOUT = 5  # sekund
+
+GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+GEMINI_STREAM_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent"
+GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+TOGETHER_URL = "https://api.together.xyz/v1/chat/completions"
+
+_client: Optional["httpx.AsyncClient"] = None
+
+
+class AIProviderError(Exception):
+    """AI xizmati xato qaytardi yoki bo'sh javob berdi"""
+
+
+def _http2_available() -> bool:
+    """HTTP/2 uchun h2 paketi kerak - bo'lmasa HTTP/1.1 keep-alive pool ishlatiladi"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Barcha AI xizmatlari uchun umumiy ulanishlar pool'i (birinchi chaqiruvda yaratiladi)"""
+    global _client
+
+    if _client is None or _client.is_closed:
+        # httpx faqat birinchi AI so'rovida yuklanadi - bot ishga tushishi sekinlashmaydi
+        import httpx
+
+        _client = httpx.AsyncClient(
+            http2=_http2_available(),
+            limits=httpx.Limits(
+                max_connections=AI_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=AI_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=AI_POOL_KEEPALIVE_EXPIRY
+            ),
+            # Umumiy muddatni provider o'zi boshqaradi (wait_for), bu yerda faqat ulanish
+            timeout=httpx.Timeout(None, connect=AI_CONNECT_TIMEOUT)
+        )
+    return _client
+
+
+async def close_http_client():
+    """Bot to'xtaganda pool'ni yopish"""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+class AIProvider(ABC):
+    """
+    Async AI provider:
+    - umumiy HTTP/2 pool orqali so'rov (thread ishlatilmaydi)
+    - timeout'da so'rov haqiqatan bekor qilinadi (ulanish pool'ga qaytadi)
+    - Semaphore bilan bir vaqtdagi so'rovlar soni cheklangan
+    - stream(): token oqimi, har bir bo'lak timeout ichida kelishi kerak
+    """
+
+    def __init__(self, name: str, label: str, timeout: float, max_concurrency: int):
+        self.name = name
+        self.label = label
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def complete(self, messages: list[dict], max_tokens: int = 800, temperature: float = 0.7) -> str:
+        """Javob matni; navbat kutish ham timeout ichida hisoblanadi"""
+        return await asyncio.wait_for(
+            self._limited(messages, max_tokens, temperature),
+            timeout=self.timeout
+        )
+
+    async def _limited(self, messages: list[dict], max_tokens: int, temperature: float) -> str:
+        async with self._semaphore:
+            text = await self._request(messages, max_tokens, temperature)
+
+        text = (text or "").strip()
+        if not text:
+            raise AIProviderError(f"{self.label} javob bermadi")
+        return text
+
+    async def stream(self, messages: list[dict], max_tokens: int = 800,
+                     temperature: float = 0.7) -> AsyncIterator[str]:
+        """Javob bo'laklari; navbat va bo'laklar orasidagi kutish timeout bilan cheklangan"""
+        await asyncio.wait_for(self._semaphore.acquire(), timeout=self.timeout)
+        chunks = None
+        received = False
+
+        try:
+            chunks = self._stream_request(messages, max_tokens, temperature).__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=self.timeout)
+                except StopAsyncIteration:
+                    break
+                if chunk:
+                    received = True
+                    yield chunk
+        finally:
+            if chunks is not None:
+                await chunks.aclose()
+            self._semaphore.release()
+
+        if not received:
+            raise AIProviderError(f"{self.label} javob bermadi")
+
+    @abstractmethod
+    async def _request(self, messages: list[dict], max_tokens: int, temperature: float) -> str:
+        """Butun javob matni"""
+
+    @abstractmethod
+    def _stream_request(self, messages: list[dict], max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        """Javob bo'laklari (async generator)"""
+
+    @staticmethod
+    def _raise_for_status(response: "httpx.Response", label: str):
+        if response.status_code >= 400:
+            raise AIProviderError(f"{label} HTTP {response.status_code}: {response.text[:200]}")
+
+    @staticmethod
+    async def _iter_sse(response: "httpx.Response", label: str) -> AsyncIterator[dict]:
+        """Server-Sent Events oqimidan JSON hodisalar"""
+        if response.status_code >= 400:
+            await response.aread()
+            AIProvider._raise_for_status(response, label)
+
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            if data:
+                yield json.loads(data)
+
+
+class GeminiProvider(AIProvider):
+    """Google Gemini REST API (generateContent)"""
+
+    def __init__(self, api_key: Optional[str], model: str, timeout: float, max_concurrency: int):
+        super().__init__("google", "Google Gemini", timeout, max_concurrency)
+        self.api_key = api_key
+        self.model = model
+
+    @staticmethod
+    def _payload(messages: list[dict], max_tokens: int, temperature: float) -> dict:
+        system = [msg["content"] for msg in messages if msg["role"] == "system"]
+        payload = {
+            "contents": [
+                {
+                    "role": "model" if msg["role"] == "assistant" else "user",
+                    "parts": [{"text": msg["content"]}]
+                }
+                for msg in messages if msg["role"] != "system"
+            ],
+            "generationConfig": {"maxOutputTokens": max_tokens, "temperature": temperature}
+        }
+        if system:
+            payload["systemInstruction"] = {"parts": [{"text": "\n".join(system)}]}
+        return payload
+
+    @staticmethod
+    def _text(data: dict) -> str:
+        candidates = data.get("candidates") or []
+        if not candidates:
+            return ""
+        parts = candidates[0].get("content", {}).get("parts") or []
+        return "".join(part.get("text", "") for part in parts)
+
+    async def _request(self, messages: list[dict], max_tokens: int, temperature: float) -> str:
+        response = await get_http_client().post(
+            GEMINI_URL.format(model=self.model),
+            params={"key": self.api_key},
+            json=self._payload(messages, max_tokens, temperature)
+        )
+        self._raise_for_status(response, self.label)
+        return self._text(response.json())
+
+    async def _stream_request(self, messages: list[dict], max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        async with get_http_client().stream(
+            "POST",
+            GEMINI_STREAM_URL.format(model=self.model),
+            params={"key": self.api_key, "alt": "sse"},
+            json=self._payload(messages, max_tokens, temperature)
+        ) as response:
+            async for data in self._iter_sse(response, self.label):
+                yield self._text(data)
+
+
+class OpenAICompatibleProvider(AIProvider):
+    """OpenAI formatidagi chat/completions API (Groq, Together.ai)"""
+
+    def __init__(self, name: str, label: str, url: str, api_key: Optional[str], model: str,
+                 timeout: float, max_concurrency: int, **extra_params):
+        super().__init__(name, label, timeout, max_concurrency)
+        self.url = url
+        self.api_key = api_key
+        self.model = model
+        self.extra_params = extra_params
+
+    def _payload(self, messages: list[dict], max_tokens: int, temperature: float, stream: bool) -> dict:
+        return {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            **self.extra_params,
+            "stream": stream
+        }
+
+    async def _request(self, messages: list[dict], max_tokens: int, temperature: float) -> str:
+        response = await get_http_client().post(
+            self.url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json=self._payload(messages, max_tokens, temperature, stream=False)
+        )
+        self._raise_for_status(response, self.label)
+
+        choices = response.json().get("choices") or []
+        if not choices:
+            return ""
+        return (choices[0].get("message") or {}).get("content") or ""
+
+    async def _stream_request(self, messages: list[dict], max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        async with get_http_client().stream(
+            "POST",
+            self.url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json=self._payload(messages, max_tokens, temperature, stream=True)
+        ) as response:
+            async for data in self._iter_sse(response, self.label):
+                choices = data.get("choices") or []
+                if choices:
+                    yield (choices[0].get("delta") or {}).get("content") or ""
+
+
+class StubProvider(AIProvider):
+    """Lokal test provayderi - tarmoqsiz, oxirgi savolni qaytaradi"""
+
+    def __init__(self, name: str, label: str = "Stub", timeout: float = 5, max_concurrency: int = 10,
+                 delay: float = 0.0, reply: Optional[str] = None, error: Optional[Exception] = None):
+        super().__init__(name, label, timeout, max_concurrency)
+        self.delay = delay
+        self.reply = reply
+        self.error = error
+        self.calls = 0
+
+    def _answer(self, messages: list[dict]) -> str:
+        if self.reply is not None:
+            return self.reply
+        return f"[{self.name}] {messages[-1]['content']}" if messages else ""
+
+    async def _request(self, messages: list[dict], max_tokens: int, temperature: float) -> str:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self._answer(messages)
+
+    async def _stream_request(self, messages: list[dict], max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        # So'zma-so'z, har biri delay bilan
+        for word in self._answer(messages).split(" "):
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield word + " "
+
+
+def build_providers(google_timeout: float, groq_timeout: float, together_timeout: float) -> dict[str, AIProvider]:
+    """Provayderlar ro'yxati (tartib = ustuvorlik); AI_PROVIDER_STUB=1 bo'lsa tarmoqsiz stub'lar"""
+    if os.getenv("AI_PROVIDER_STUB") == "1":
+        logger.warning("AI providers are running in stub mode")
+        return {
+            "google": StubProvider("google", "Google Gemini (stub)", google_timeout),
+            "groq": StubProvider("groq", "Groq (stub)", groq_timeout),
+            "together": StubProvider("together", "Together AI (stub)", together_timeout),
+        }
+
+    return {
+        "google": GeminiProvider(
+            os.getenv("GOOGLE_API_KEY"),
+            "gemini-1.5-flash",
+            timeout=google_timeout,
+            max_concurrency=10
+        ),
+        "groq": OpenAICompatibleProvider(
+            "groq", "Groq", GROQ_URL,
+            os.getenv("GROQ_API_KEY"),
+            "llama-3.1-8b-instant",
+            timeout=groq_timeout,
+            max_concurrency=10
+        ),
+        "together": OpenAICompatibleProvider(
+            "together", "Together AI (Llama-3-70B)", TOGETHER_URL,
+            os.getenv("TOGETHER_API_KEY"),
+            "meta-llama/Llama-3-70b-chat-hf",
+            timeout=together_timeout,
+            max_concurrency=5,
+            top_p=0.9
+        ),
+    }
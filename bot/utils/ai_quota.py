@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import time
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+
+from db import db
+from db.models import AIUsageBucket
+from bot.utils.navigation import run_in_background
+
+logger = logging.getLogger(__name__)
+
+# 🎯 CONSTANTS
+HOUR_BUCKETS = 60  # soatlik oyna - 60 ta daqiqalik chelak
+DAY_BUCKETS = 1440  # kunlik oyna (sirpanuvchi 24 soat)
+QUOTA_REFRESH_INTERVAL = 5  # sekund - boshqa workerlar yozgan hisoblar shu oraliqda o'qiladi
+QUOTA_RETENTION_BUCKETS = 2 * DAY_BUCKETS  # undan eski chelaklar o'chiriladi
+QUOTA_CLEANUP_INTERVAL = 3600  # sekund
+
+
+class Usage(NamedTuple):
+    """Sirpanuvchi oynadagi so'rovlar soni"""
+    hour: int
+    day: int
+
+
+def current_minute() -> int:
+    """Joriy daqiqalik chelak raqami"""
+    return int(time.time() // 60)
+
+
+def user_subject(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def service_subject(name: str) -> str:
+    return f"service:{name}"
+
+
+class AIQuota:
+    """
+    Postgres'dagi daqiqalik chelaklar asosidagi kvota:
+    - hit(): lokal nusxa darhol +1, bazaga upsert fonda
+    - usage(): soatlik/kunlik yig'indi - bitta agregat so'rov, natija qisqa muddat keshlanadi
+    - barcha bot workerlari bitta jadvalni ishlatadi, restartdan keyin ham saqlanadi
+    """
+
+    def __init__(self):
+        self._snapshots: dict[str, tuple[float, Usage]] = {}
+        self._worker_task: Optional[asyncio.Task] = None
+
+    async def _load(self, subjects: list[str]) -> dict[str, Usage]:
+        minute = current_minute()
+        hour_start = minute - HOUR_BUCKETS
+
+        async with db.get_session() as session:
+            result = await session.execute(
+                select(
+                    AIUsageBucket.subject,
+                    func.coalesce(func.sum(AIUsageBucket.count).filter(AIUsageBucket.minute > hour_start), 0),
+                    func.sum(AIUsageBucket.count)
+                )
+                .where(
+                    AIUsageBucket.subject.in_(subjects),
+                    AIUsageBucket.minute > minute - DAY_BUCKETS
+                )
+                .group_by(AIUsageBucket.subject)
+            )
+            rows = result.all()
+
+        usage = {subject: Usage(0, 0) for subject in subjects}
+        for subject, hour, day in rows:
+            usage[subject] = Usage(int(hour), int(day))
+        return usage
+
+    async def usage(self, *subjects: str) -> dict[str, Usage]:
+        """Subyektlar bo'yicha hisob (eskirganlari bitta so'rov bilan yangilanadi)"""
+        now = time.monotonic()
+        stale = [
+            subject for subject in subjects
+            if subject not in self._snapshots or now - self._snapshots[subject][0] > QUOTA_REFRESH_INTERVAL
+        ]
+
+        if stale:
+            try:
+                for subject, usage in (await self._load(stale)).items():
+                    self._snapshots[subject] = (now, usage)
+            except Exception as e:
+                # Baza ishlamasa oxirgi ma'lum qiymat (yoki 0) bilan davom etiladi
+                logger.error(f"AI quota load error: {e}")
+
+        return {
+            subject: self._snapshots.get(subject, (now, Usage(0, 0)))[1]
+            for subject in subjects
+        }
+
+    def hit(self, subject: str):
+        """Bitta so'rovni hisobga olish"""
+        fetched_at, usage = self._snapshots.get(subject, (0.0, Usage(0, 0)))
+        self._snapshots[subject] = (fetched_at, Usage(usage.hour + 1, usage.day + 1))
+        run_in_background(self._persist(subject, current_minute()))
+
+    async def _persist(self, subject: str, minute: int):
+        async with db.get_session() as session:
+            stmt = insert(AIUsageBucket).values(subject=subject, minute=minute, count=1)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_ai_usage_buckets_subject_minute",
+                set_={"count": AIUsageBucket.count + 1}
+            )
+            await session.execute(stmt)
+            await session.commit()
+
+    async def minutes_until_hourly_reset(self, subject: str) -> int:
+        """Soatlik oynadagi eng eski chelak chiqib ketishigacha qolgan daqiqalar"""
+        minute = current_minute()
+        async with db.get_session() as session:
+            oldest = await session.scalar(
+                select(func.min(AIUsageBucket.minute)).where(
+                    AIUsageBucket.subject == subject,
+                    AIUsageBucket.minute > minute - HOUR_BUCKETS
+                )
+            )
+        if oldest is None:
+            return 0
+        return max(1, HOUR_BUCKETS - (minute - oldest))
+
+    async def cleanup(self):
+        """Eski chelaklarni o'chirish"""
+        async with db.get_session() as session:
+            await session.execute(
+                delete(AIUsageBucket).where(AIUsageBucket.minute < current_minute() - QUOTA_RETENTION_BUCKETS)
+            )
+            await session.commit()
+
+        # Lokal nusxalar ham cheksiz o'smasin
+        cutoff = time.monotonic() - QUOTA_REFRESH_INTERVAL
+        for subject in [s for s, (fetched_at, _) in self._snapshots.items() if fetched_at < cutoff]:
+            del self._snapshots[subject]
+
+    async def _cleanup_worker(self):
+        while True:
+            await asyncio.sleep(QUOTA_CLEANUP_INTERVAL)
+            try:
+                await self.cleanup()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"AI quota cleanup error: {e}")
+
+    def start(self):
+        """Fon tozalashni ishga tushirish"""
+        if not self._worker_task:
+            self._worker_task = asyncio.create_task(self._cleanup_worker())
+
+
+# Global instance
+ai_quota = AIQuota()
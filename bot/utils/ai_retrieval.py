@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import math
+from collections import Counter
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.utils.ai_answer_cache import question_key
+from bot.utils.cache import content_version
+from db.models import Accident, Book, TrainSafetyFile, EquipmentCatalog
+
+logger = logging.getLogger(__name__)
+
+# 🎯 CONSTANTS
+CHUNK_WORDS = 80  # bitta parcha uzunligi (so'z)
+CHUNK_OVERLAP = 20  # qo'shni parchalar kesishmasi
+RETRIEVAL_TOP_K = 3
+RETRIEVAL_MIN_SCORE = 1.0  # juda kuchsiz mosliklar promptga qo'shilmaydi
+RETRIEVAL_MAX_CHARS = 1500  # promptga qo'shiladigan matn chegarasi
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# domen -> (manba nomi, model, sarlavha, matn, qo'shimcha filtr)
+RETRIEVAL_SOURCES = {
+    "accident": ("Baxtsiz hodisa", Accident, Accident.title, Accident.description, None),
+    "library": ("Kitob", Book, Book.name, Book.description, None),
+    "train_safety": ("Hujjat", TrainSafetyFile, TrainSafetyFile.name, TrainSafetyFile.description,
+                     TrainSafetyFile.is_active == True),
+    "equipment": ("Jihoz", EquipmentCatalog, EquipmentCatalog.name, EquipmentCatalog.description, None),
+}
+
+
+class Passage(NamedTuple):
+    """Indeksdagi matn parchasi"""
+    source: str
+    title: str
+    text: str
+    terms: Counter
+    length: int
+
+
+def chunk_text(title: str, text: str) -> list[str]:
+    """Matnni kesishuvchi parchalarga bo'lish"""
+    words = (text or "").split()
+    if not words:
+        return [title]
+
+    step = CHUNK_WORDS - CHUNK_OVERLAP
+    return [
+        " ".join(words[start:start + CHUNK_WORDS])
+        for start in range(0, max(1, len(words) - CHUNK_OVERLAP), step)
+    ]
+
+
+def _make_passage(source: str, title: str, text: str) -> Passage:
+    # Sarlavha har bir parchaga qo'shiladi - qisqa tavsiflar ham topilsin
+    terms = Counter(question_key(f"{title} {text}").split())
+    return Passage(source, title, text, terms, sum(terms.values()))
+
+
+class RetrievalIndex:
+    """
+    Bot kontenti bo'yicha BM25 indeks:
+    - domenlar alohida saqlanadi, faqat versiyasi o'zgargan domen qayta yuklanadi
+    - df/o'rtacha uzunlik yangilangan parchalar ro'yxatidan qayta hisoblanadi
+    """
+
+    def __init__(self):
+        self._passages: dict[str, list[Passage]] = {}
+        self._versions: dict[str, int] = {}
+        self._df: Counter = Counter()
+        self._avg_length = 0.0
+        self._total = 0
+        self._lock = asyncio.Lock()
+
+    async def _load_domain(self, session: AsyncSession, domain: str) -> list[Passage]:
+        source, model, title_column, text_column, extra_filter = RETRIEVAL_SOURCES[domain]
+        query = select(title_column, text_column)
+        if extra_filter is not None:
+            query = query.where(extra_filter)
+
+        rows = (await session.execute(query)).all()
+        return [
+            _make_passage(source, title, chunk)
+            for title, text in rows
+            for chunk in chunk_text(title, text)
+        ]
+
+    def _rebuild_stats(self):
+        self._df = Counter()
+        lengths = 0
+        self._total = 0
+        for passages in self._passages.values():
+            for passage in passages:
+                self._df.update(passage.terms.keys())
+                lengths += passage.length
+                self._total += 1
+        self._avg_length = lengths / self._total if self._total else 0.0
+
+    async def refresh(self, session: AsyncSession):
+        """Versiyasi o'zgargan domenlarni qayta indekslash"""
+        stale = [d for d in RETRIEVAL_SOURCES if self._versions.get(d) != content_version(d)]
+        if not stale:
+            return
+
+        async with self._lock:
+            changed = False
+            for domain in RETRIEVAL_SOURCES:
+                version = content_version(domain)
+                if self._versions.get(domain) == version:
+                    continue
+                self._passages[domain] = await self._load_domain(session, domain)
+                self._versions[domain] = version
+                changed = True
+                logger.info(f"Retrieval index: {domain} reindexed ({len(self._passages[domain])} passages)")
+
+            if changed:
+                self._rebuild_stats()
+
+    def search(self, query: str, top_k: int = RETRIEVAL_TOP_K) -> list[tuple[float, Passage]]:
+        """BM25 bo'yicha eng mos parchalar"""
+        terms = [term for term in set(question_key(query).split()) if term in self._df]
+        if not terms or not self._total:
+            return []
+
+        idf = {
+            term: math.log(1 + (self._total - self._df[term] + 0.5) / (self._df[term] + 0.5))
+            for term in terms
+        }
+
+        scored = []
+        for passages in self._passages.values():
+            for passage in passages:
+                score = 0.0
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * passage.length / self._avg_length)
+                for term in terms:
+                    frequency = passage.terms.get(term)
+                    if frequency:
+                        score += idf[term] * frequency * (BM25_K1 + 1) / (frequency + norm)
+                if score >= RETRIEVAL_MIN_SCORE:
+                    scored.append((score, passage))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return scored[:top_k]
+
+
+# Global instance
+retrieval_index = RetrievalIndex()
+
+
+async def retrieve_context(session: AsyncSession, question: str) -> str:
+    """Savolga mos korxona ma'lumotlari - promptga qo'shish uchun (topilmasa bo'sh)"""
+    await retrieval_index.refresh(session)
+
+    lines = []
+    used = 0
+    for _score, passage in retrieval_index.search(question):
+        line = f"[{passage.source}: {passage.title}] {passage.text}"
+        if used + len(line) > RETRIEVAL_MAX_CHARS:
+            line = line[:max(0, RETRIEVAL_MAX_CHARS - used)]
+        if not line:
+            break
+        lines.append(line)
+        used += len(line)
+
+    return "\n".join(lines)
@@ -0,0 +1,300 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, NamedTuple, Optional
+
+from bot.utils.ai_providers import AIProvider, AIProviderError
+
+logger = logging.getLogger(__name__)
+
+# 🎯 CONSTANTS
+HEALTH_WINDOW_SIZE = 50  # oxirgi shuncha so'rov bo'yicha statistika
+HEALTH_WINDOW_SECONDS = 900  # 15 daqiqadan eski natijalar hisobga olinmaydi
+HEALTH_MIN_SAMPLES = 5  # persentil/xato ulushi uchun minimal namunalar
+
+BREAKER_FAILURE_THRESHOLD = 3  # ketma-ket xatolar soni - zanjir uziladi
+BREAKER_ERROR_RATE = 0.5  # oynadagi xato ulushi - zanjir uziladi
+BREAKER_OPEN_SECONDS = 30  # uzilgan provayder shuncha vaqt ishlatilmaydi
+BREAKER_MAX_OPEN_SECONDS = 300  # qayta-qayta uzilsa kutish shu chegaragacha ikkilanadi
+
+HEDGE_PERCENTILE = 0.9  # provayder shu persentildan sekinlashsa keyingisiga ham so'rov yuboriladi
+HEDGE_DEFAULT_DELAY = 4.0  # sekund - statistika yetarli bo'lmaganda
+HEDGE_MIN_DELAY = 1.5  # sekund
+HEDGE_MAX_DELAY = 8.0  # sekund
+HEDGE_MAX_PARALLEL = 2  # bir vaqtda ko'pi bilan shuncha provayder kutiladi
+
+
+class ProviderHealth:
+    """
+    Provayder holati:
+    - oxirgi natijalar oynasi (kechikish, muvaffaqiyat)
+    - circuit breaker: closed -> open (cooldown) -> half-open (bitta sinov so'rovi)
+    """
+
+    def __init__(self):
+        self._samples: deque[tuple[float, float, bool]] = deque(maxlen=HEALTH_WINDOW_SIZE)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.open_seconds = BREAKER_OPEN_SECONDS
+        self._probe_in_flight = False
+
+    def _recent(self) -> list[tuple[float, float, bool]]:
+        cutoff = time.monotonic() - HEALTH_WINDOW_SECONDS
+        return [sample for sample in self._samples if sample[0] >= cutoff]
+
+    def error_rate(self) -> float:
+        """Oynadagi xato ulushi"""
+        samples = self._recent()
+        if not samples:
+            return 0.0
+        return sum(1 for _, _, ok in samples if not ok) / len(samples)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Muvaffaqiyatli javoblar kechikishining persentili (namuna kam bo'lsa None)"""
+        latencies = sorted(latency for _, latency, ok in self._recent() if ok)
+        if len(latencies) < HEALTH_MIN_SAMPLES:
+            return None
+        index = min(len(latencies) - 1, int(percentile * len(latencies)))
+        return latencies[index]
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    def allow_request(self) -> bool:
+        """Zanjir yopiq bo'lsa ruxsat; cooldown tugagach faqat bitta sinov so'rovi"""
+        if self.is_open:
+            return False
+        if self.open_until and self._probe_in_flight:
+            return False
+        return True
+
+    def on_start(self):
+        if self.open_until:
+            self._probe_in_flight = True
+
+    def record(self, latency: float, ok: bool):
+        """So'rov natijasini yozish va breaker holatini yangilash"""
+        self._samples.append((time.monotonic(), latency, ok))
+        self._probe_in_flight = False
+
+        if ok:
+            self.consecutive_failures = 0
+            self.open_until = 0.0
+            self.open_seconds = BREAKER_OPEN_SECONDS
+            return
+
+        self.consecutive_failures += 1
+        samples = self._recent()
+        too_many_errors = len(samples) >= HEALTH_MIN_SAMPLES and self.error_rate() >= BREAKER_ERROR_RATE
+
+        if self.open_until:
+            # Sinov so'rovi muvaffaqiyatsiz - cooldown ikkilanadi
+            self.open_seconds = min(self.open_seconds * 2, BREAKER_MAX_OPEN_SECONDS)
+            self.open_until = time.monotonic() + self.open_seconds
+        elif self.consecutive_failures >= BREAKER_FAILURE_THRESHOLD or too_many_errors:
+            self.open_until = time.monotonic() + self.open_seconds
+
+    def release(self):
+        """Natijasiz tugagan so'rov (boshqa provayder yutgani uchun bekor qilindi)"""
+        self._probe_in_flight = False
+
+    def hedge_delay(self) -> float:
+        """Shu provayderni qancha kutib, keyingisiga ham so'rov yuborish"""
+        latency = self.latency_percentile(HEDGE_PERCENTILE)
+        if latency is None:
+            return HEDGE_DEFAULT_DELAY
+        return max(HEDGE_MIN_DELAY, min(latency, HEDGE_MAX_DELAY))
+
+
+class RouteResult(NamedTuple):
+    """Marshrutlash natijasi"""
+    ok: bool
+    text: str
+    provider: Optional[AIProvider]
+    timed_out: bool
+
+
+class StreamResult(NamedTuple):
+    """Oqimli marshrutlash natijasi (chunks - birinchi bo'lakdan boshlab)"""
+    ok: bool
+    text: str
+    provider: Optional[AIProvider]
+    chunks: Optional[AsyncIterator[str]]
+    timed_out: bool
+
+
+class AIRouter:
+    """
+    Provayderlar orasida marshrutlash:
+    - breaker ochiq provayderlar o'tkazib yuboriladi
+    - javob kechiksa (persentil bo'yicha) keyingi provayderga parallel so'rov
+    - birinchi yaxshi javob olinadi, qolganlari bekor qilinadi
+    - route_stream(): poyga birinchi tokengacha, keyin g'olib oqimi davom etadi
+    """
+
+    def __init__(self):
+        self._health: dict[str, ProviderHealth] = {}
+
+    def health(self, name: str) -> ProviderHealth:
+        if name not in self._health:
+            self._health[name] = ProviderHealth()
+        return self._health[name]
+
+    async def _attempt(self, provider: AIProvider, messages: list[dict]) -> str:
+        health = self.health(provider.name)
+        health.on_start()
+        started = time.monotonic()
+
+        try:
+            text = await provider.complete(messages)
+        except asyncio.CancelledError:
+            health.release()
+            raise
+        except Exception:
+            health.record(time.monotonic() - started, ok=False)
+            raise
+
+        health.record(time.monotonic() - started, ok=True)
+        return text
+
+    async def _attempt_stream(self, provider: AIProvider, messages: list[dict]) -> tuple[str, AsyncIterator[str]]:
+        """Oqimni ochib birinchi bo'lakni kutish - kechikish birinchi token bo'yicha yoziladi"""
+        health = self.health(provider.name)
+        health.on_start()
+        started = time.monotonic()
+        chunks = provider.stream(messages).__aiter__()
+
+        try:
+            first = await chunks.__anext__()
+        except asyncio.CancelledError:
+            health.release()
+            await chunks.aclose()
+            raise
+        except StopAsyncIteration:
+            health.record(time.monotonic() - started, ok=False)
+            raise AIProviderError(f"{provider.label} javob bermadi")
+        except Exception:
+            health.record(time.monotonic() - started, ok=False)
+            raise
+
+        health.record(time.monotonic() - started, ok=True)
+        return first, chunks
+
+    async def _race(self, candidates: list[tuple[AIProvider, list[dict]]],
+                    attempt: Callable[[AIProvider, list[dict]], Awaitable],
+                    on_attempt: Optional[Callable[[AIProvider], None]],
+                    discard: Optional[Callable[[object], Awaitable]] = None):
+        """Hedge bilan poyga: (provayder, natija, timeout bo'lganmi)"""
+        queue = [item for item in candidates if self.health(item[0].name).allow_request()]
+        if not queue and candidates:
+            # Hammasi uzilgan - eng ustuvor provayder baribir sinab ko'riladi
+            queue = candidates[:1]
+
+        pending: dict[asyncio.Task, AIProvider] = {}
+        last_launched: Optional[AIProvider] = None
+        timed_out = False
+
+        def launch():
+            nonlocal last_launched
+            provider, messages = queue.pop(0)
+            if on_attempt:
+                on_attempt(provider)
+            task = asyncio.create_task(attempt(provider, messages))
+            pending[task] = provider
+            last_launched = provider
+
+        try:
+            if queue:
+                launch()
+
+            while pending:
+                can_hedge = queue and len(pending) < HEDGE_MAX_PARALLEL
+                wait_for = self.health(last_launched.name).hedge_delay() if can_hedge else None
+
+                done, _ = await asyncio.wait(pending.keys(), timeout=wait_for,
+                                             return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    logger.info(f"AI hedge: {last_launched.name} slow, also trying {queue[0][0].name}")
+                    launch()
+                    continue
+
+                winner = None
+                for task in done:
+                    provider = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if winner is None:
+                            winner = (provider, task.result())
+                        elif discard:
+                            # Bir vaqtda tugagan ikkinchi natija kerak emas
+                            await discard(task.result())
+                        continue
+
+                    if isinstance(error, asyncio.TimeoutError):
+                        timed_out = True
+                    logger.warning(f"AI provider {provider.name} failed: {error!r}")
+
+                if winner is not None:
+                    return winner[0], winner[1], False
+
+                # Xato bo'lsa keyingisi darhol (hedge kutilmaydi)
+                if not pending and queue:
+                    launch()
+        finally:
+            for task in pending:
+                if task.done() and not task.cancelled() and task.exception() is None:
+                    # Poyga tugagach kelgan natija (masalan, ochilgan oqim) yopiladi
+                    if discard:
+                        await discard(task.result())
+                else:
+                    task.cancel()
+
+        return None, None, timed_out
+
+    @staticmethod
+    def _failure_text(timed_out: bool) -> str:
+        if timed_out:
+            return "AI xizmati javob bermadi (timeout)"
+        return "Barcha AI xizmatlar javob bermadi"
+
+    async def route(self, candidates: list[tuple[AIProvider, list[dict]]],
+                    on_attempt: Optional[Callable[[AIProvider], None]] = None) -> RouteResult:
+        """candidates - ustuvorlik tartibida (provayder, xabarlar)"""
+        provider, text, timed_out = await self._race(candidates, self._attempt, on_attempt)
+
+        if provider is None:
+            return RouteResult(False, self._failure_text(timed_out), None, timed_out)
+        return RouteResult(True, text, provider, False)
+
+    async def route_stream(self, candidates: list[tuple[AIProvider, list[dict]]],
+                           on_attempt: Optional[Callable[[AIProvider], None]] = None) -> StreamResult:
+        """Birinchi token bergan provayder oqimi; qolganlari bekor qilinadi"""
+
+        async def discard(result):
+            await result[1].aclose()
+
+        provider, opened, timed_out = await self._race(candidates, self._attempt_stream, on_attempt, discard)
+
+        if provider is None:
+            return StreamResult(False, self._failure_text(timed_out), None, None, timed_out)
+        return StreamResult(True, "", provider, self._continue_stream(provider, *opened), False)
+
+    async def _continue_stream(self, provider: AIProvider, first: str,
+                               chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Birinchi bo'lak + qolgan oqim; oqim o'rtasida uzilsa xato sifatida yoziladi"""
+        started = time.monotonic()
+        yield first
+
+        try:
+            async for chunk in chunks:
+                yield chunk
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.health(provider.name).record(time.monotonic() - started, ok=False)
+            raise
+        finally:
+            await chunks.aclose()
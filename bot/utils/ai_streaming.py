@@ -0,0 +1,121 @@
+import asyncio
+import html
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.types import Message
+
+logger = logging.getLogger(__name__)
+
+# 🎯 CONSTANTS
+TELEGRAM_TEXT_LIMIT = 4096
+STREAM_PAGE_RESERVE = 300  # izoh (footer) va kursor uchun zaxira
+STREAM_EDIT_INTERVAL = 1.5  # sekund - bitta chatda tahrirlar oralig'i (Telegram flood limiti)
+STREAM_MIN_GROWTH = 20  # belgi - bundan kam o'zgarish uchun tahrir yuborilmaydi
+STREAM_CURSOR = "▍"
+
+
+def _split_page(text: str, limit: int) -> tuple[str, str]:
+    """Matnni HTML-escape'dan keyin limitga sig'adigan bosh qism va qoldiqqa ajratish"""
+    cut = min(len(text), limit)
+    while cut > 0 and len(html.escape(text[:cut])) > limit:
+        cut -= max(1, (len(html.escape(text[:cut])) - limit) // 2)
+
+    # Imkon bo'lsa qator yoki so'z chegarasida bo'lish
+    boundary = max(text.rfind("\n", 0, cut), text.rfind(" ", 0, cut))
+    if boundary > cut // 2:
+        cut = boundary + 1
+    return text[:cut], text[cut:]
+
+
+class StreamingReply:
+    """
+    AI javobini bosqichma-bosqich ko'rsatish:
+    - bo'laklar kelishi bilan xabar tahrirlanadi (throttle bilan)
+    - 4096 belgidan oshsa davomi yangi xabarda
+    - RetryAfter kelsa tahrirlar shu muddatga to'xtatiladi
+    """
+
+    def __init__(self, message: Message, header: str,
+                 on_new_message: Optional[Callable[[Message], Awaitable]] = None):
+        self.messages = [message]
+        self.pages = [""]
+        self.header = header
+        self.on_new_message = on_new_message
+        self._last_edit = 0.0
+        self._shown_length = 0
+        self._paused_until = 0.0
+
+    @property
+    def text(self) -> str:
+        """Hozirgacha olingan to'liq javob"""
+        return "".join(self.pages)
+
+    def _page_limit(self, index: int) -> int:
+        header_length = len(self.header) if index == 0 else 0
+        return TELEGRAM_TEXT_LIMIT - STREAM_PAGE_RESERVE - header_length
+
+    def _render(self, index: int, cursor: bool, footer: str = "") -> str:
+        header = self.header if index == 0 else ""
+        return f"{header}{html.escape(self.pages[index])}{STREAM_CURSOR if cursor else ''}{footer}"
+
+    async def _edit(self, index: int, cursor: bool, footer: str = "", force: bool = False):
+        now = time.monotonic()
+        if not force:
+            if now < self._paused_until or now - self._last_edit < STREAM_EDIT_INTERVAL:
+                return
+            if len(self.pages[index]) - self._shown_length < STREAM_MIN_GROWTH:
+                return
+
+        for _ in range(2):
+            try:
+                await self.messages[index].edit_text(self._render(index, cursor, footer), parse_mode="HTML")
+                break
+            except TelegramRetryAfter as e:
+                self._paused_until = time.monotonic() + e.retry_after
+                if not force:
+                    return
+                # Yakuniy tahrir yo'qolmasligi kerak - kutib qayta urinish
+                await asyncio.sleep(e.retry_after)
+            except TelegramBadRequest as e:
+                # "message is not modified" va shunga o'xshashlar
+                logger.debug(f"Stream edit skipped: {e}")
+                break
+
+        self._last_edit = time.monotonic()
+        self._shown_length = len(self.pages[index])
+
+    async def _start_continuation(self):
+        """Joriy sahifani yakunlab, davomini yangi xabarda boshlash"""
+        index = len(self.pages) - 1
+        head, tail = _split_page(self.pages[index], self._page_limit(index))
+        self.pages[index] = head
+        await self._edit(index, cursor=False, force=True)
+
+        self.pages.append(tail)
+        continuation = await self.messages[-1].answer(
+            self._render(len(self.pages) - 1, cursor=True),
+            parse_mode="HTML"
+        )
+        self.messages.append(continuation)
+        self._last_edit = time.monotonic()
+        self._shown_length = len(tail)
+
+        if self.on_new_message:
+            await self.on_new_message(continuation)
+
+    async def feed(self, chunk: str):
+        """Yangi bo'lakni qo'shish"""
+        self.pages[-1] += chunk
+
+        while len(html.escape(self.pages[-1])) > self._page_limit(len(self.pages) - 1):
+            await self._start_continuation()
+
+        await self._edit(len(self.pages) - 1, cursor=True)
+
+    async def finish(self, footer: str = "") -> str:
+        """Yakuniy tahrir (kursorsiz, izoh bilan) - to'liq javobni qaytaradi"""
+        await self._edit(len(self.pages) - 1, cursor=False, footer=footer, force=True)
+        return self.text
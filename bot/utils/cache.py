@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from db.content_version import load_content_versions
+
+logger = logging.getLogger(__name__)
+
+# 🎯 CONSTANTS
+CONTENT_CACHE_MAX_SIZE = 512
+CONTENT_CACHE_TTL = 300  # sekund - versiya o'zgarmasa ham shuncha vaqtda yangilanadi
+CONTENT_VERSION_POLL_INTERVAL = 10  # sekund - admin paneldagi o'zgarishlarni tekshirish
+
+_MISSING = object()
+_RETRY = object()  # loader bekor qilindi - kutayotganlar o'zi qayta yuklaydi
+
+
+class AsyncTTLCache:
+    """
+    Async kesh:
+    - single-flight: bir vaqtdagi bir xil miss'lar bitta loader'ni kutadi
+    - LRU: maxsize'dan oshsa eng eski ishlatilgan yozuv chiqariladi
+    - TTL monotonic soat bo'yicha
+    """
+
+    def __init__(self, maxsize: int = CONTENT_CACHE_MAX_SIZE, ttl: float = CONTENT_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Kalit bormi (LRU tartibiga ta'sir qilmaydi)"""
+        entry = self._data.get(key)
+        return entry is not None and time.monotonic() < entry[0]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Keshdagi qiymat (muddati o'tgan bo'lsa default)"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Qiymatni saqlash"""
+        self._data[key] = (time.monotonic() + (ttl if ttl is not None else self.ttl), value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """Bitta kalitni o'chirish"""
+        self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        """Shartga mos kalitlarni o'chirish"""
+        for key in [key for key in self._data if predicate(key)]:
+            del self._data[key]
+
+    def clear(self):
+        """Butun keshni tozalash"""
+        self._data.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[..., Awaitable], *args,
+                          ttl: Optional[float] = None) -> Any:
+        """Keshdan olish yoki loader orqali yuklash (bir vaqtda faqat bitta yuklash)"""
+        while True:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            value = await asyncio.shield(inflight)
+            if value is not _RETRY:
+                return value
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        try:
+            value = await loader(*args)
+        except asyncio.CancelledError:
+            # Bekor qilish faqat shu chaqiruvchiga tegishli - boshqalar uyg'otiladi va qayta urinadi
+            future.set_result(_RETRY)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Kutuvchi bo'lmasa "never retrieved" ogohlantirishi chiqmasin
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        self.set(key, value, ttl)
+        future.set_result(value)
+        return value
+
+
+# Bot bo'ylab umumiy kontent keshi: kalit = (domen, versiya, kalit)
+content_cache = AsyncTTLCache()
+
+_versions: dict[str, int] = {}
+_worker_task: Optional[asyncio.Task] = None
+
+
+async def cached(domain: str, key: Hashable, loader: Callable[..., Awaitable], *args,
+                 ttl: Optional[float] = None) -> Any:
+    """Domen versiyasiga bog'langan kesh - admin yozganda eski qiymat ishlatilmaydi"""
+    version = content_version(domain)
+    return await content_cache.get_or_load((domain, version, key), loader, *args, ttl=ttl)
+
+
+def content_version(domain: str) -> int:
+    """Domenning joriy versiyasi (keshdan tashqari indekslar uchun)"""
+    return _versions.get(domain, 0)
+
+
+def invalidate_domain(domain: str):
+    """Domen bo'yicha barcha yozuvlarni tashlash (lokal)"""
+    content_cache.invalidate_where(lambda key: key[0] == domain)
+
+
+async def refresh_content_versions():
+    """Bazadagi versiyalarni o'qish - o'zgargan domenlar keshi tashlanadi"""
+    versions = await load_content_versions()
+
+    for domain, version in versions.items():
+        if _versions.get(domain) != version:
+            _versions[domain] = version
+            invalidate_domain(domain)
+
+
+async def _content_version_worker():
+    """Fon jarayoni: versiyalarni davriy tekshirish"""
+    while True:
+        await asyncio.sleep(CONTENT_VERSION_POLL_INTERVAL)
+        try:
+            await refresh_content_versions()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Content version poll error: {e}")
+
+
+async def start_content_versions():
+    """Bot start bo'lganda versiyalarni yuklash va fon tekshiruvini ishga tushirish"""
+    global _worker_task
+
+    try:
+        await refresh_content_versions()
+    except Exception as e:
+        logger.error(f"Content version load error: {e}")
+
+    if not _worker_task:
+        _worker_task = asyncio.create_task(_content_version_worker())
@@ -0,0 +1,107 @@
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.utils.cache import cached, invalidate_domain
+from db.models import CategoryBook, Book, CategoryVideo, Video
+
+
+class CategorySummary(NamedTuple):
+    """Kategoriya: id, nomi va undagi elementlar soni"""
+    id: int
+    name: str
+    item_count: int
+
+
+class CatalogueItem(NamedTuple):
+    """Ro'yxat tugmasi uchun yengil element (description yuklanmaydi)"""
+    id: int
+    name: str
+
+
+class CataloguePage(NamedTuple):
+    """Bitta kategoriyaning bitta sahifasi"""
+    category: CategorySummary
+    items: list[CatalogueItem]
+    page: int
+    total_pages: int
+
+
+# Domen -> (kategoriya modeli, element modeli, FK ustuni)
+CATALOGUES = {
+    "library": (CategoryBook, Book, Book.category_book_id),
+    "video": (CategoryVideo, Video, Video.category_video_id),
+}
+
+async def _load_category_summaries(session: AsyncSession, domain: str) -> list[CategorySummary]:
+    """Barcha kategoriyalar + elementlar soni - bitta GROUP BY so'rov"""
+    category_model, item_model, fk_column = CATALOGUES[domain]
+    result = await session.execute(
+        select(
+            category_model.id,
+            category_model.name,
+            func.count(item_model.id)
+        )
+        .outerjoin(item_model, fk_column == category_model.id)
+        .group_by(category_model.id, category_model.name)
+        .order_by(category_model.name)
+    )
+    return [CategorySummary(*row) for row in result.all()]
+
+
+async def get_category_summaries(session: AsyncSession, domain: str) -> list[CategorySummary]:
+    """Kategoriyalar ro'yxati - umumiy keshdan (admin o'zgartirsa versiya bo'yicha yangilanadi)"""
+    return await cached(domain, "summaries", _load_category_summaries, session, domain)
+
+
+async def get_category_summary(session: AsyncSession, domain: str, category_id: int) -> Optional[CategorySummary]:
+    """Bitta kategoriya summary'si"""
+    summaries = await get_category_summaries(session, domain)
+    for summary in summaries:
+        if summary.id == category_id:
+            return summary
+
+    # Keshda yo'q (yangi qo'shilgan bo'lishi mumkin) - qayta yuklash
+    invalidate_domain(domain)
+    summaries = await get_category_summaries(session, domain)
+    return next((summary for summary in summaries if summary.id == category_id), None)
+
+
+def paginate_summaries(summaries: list[CategorySummary], page: int, per_page: int):
+    """Kategoriyalar sahifasi: (sahifadagi kategoriyalar, page, total_pages)"""
+    total_pages = max(1, (len(summaries) + per_page - 1) // per_page)
+    page = max(1, min(page, total_pages))
+    start_idx = (page - 1) * per_page
+    return summaries[start_idx:start_idx + per_page], page, total_pages
+
+
+async def get_category_page(
+        session: AsyncSession,
+        domain: str,
+        category_id: int,
+        page: int,
+        per_page: int
+) -> Optional[CataloguePage]:
+    """Kategoriya ochilganda faqat kerakli sahifa - LIMIT/OFFSET, yangilari birinchi"""
+    category = await get_category_summary(session, domain, category_id)
+    if not category:
+        return None
+
+    total_pages = max(1, (category.item_count + per_page - 1) // per_page)
+    page = max(1, min(page, total_pages))
+
+    if not category.item_count:
+        return CataloguePage(category, [], page, total_pages)
+
+    _category_model, item_model, fk_column = CATALOGUES[domain]
+    result = await session.execute(
+        select(item_model.id, item_model.name)
+        .where(fk_column == category_id)
+        .order_by(item_model.id.desc())
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+    )
+    items = [CatalogueItem(*row) for row in result.all()]
+
+    return CataloguePage(category, items, page, total_pages)
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from itertools import groupby
+from typing import Awaitable, NamedTuple, Optional
+
+from aiogram import Bot
+
+from bot.utils.media_registry import send_media, send_media_group
+
+logger = logging.getLogger(__name__)
+
+# Telegram cheklovlari
+CAPTION_MAX_LENGTH = 1024
+MEDIA_GROUP_MAX_SIZE = 10
+
+
+class DetailRenderError(Exception):
+    """Detail yuborilmadi - shu paytgacha yuborilgan xabarlar ID'lari bilan"""
+
+    def __init__(self, message_ids: list[int], original: Exception):
+        super().__init__(str(original))
+        self.message_ids = message_ids
+        self.original = original
+
+
+class DetailAsset(NamedTuple):
+    """Detail sahifasidagi bitta fayl"""
+    kind: str  # photo / document / video
+    source: Optional[str]
+    required: bool = True  # False bo'lsa - xatolikda shunchaki o'tkazib yuboriladi
+
+
+async def _send_group(bot: Bot, chat_id: int, kind: str, assets: list[DetailAsset],
+                      caption: Optional[str] = None, reply_markup=None) -> list[int]:
+    """Bir turdagi asset'larni yuborish - bittasi bo'lsa oddiy send, ko'p bo'lsa media group"""
+    try:
+        if len(assets) == 1:
+            sent = await send_media(
+                bot, kind, chat_id, assets[0].source,
+                caption=caption,
+                reply_markup=reply_markup,
+                parse_mode="HTML"
+            )
+            return [sent.message_id]
+
+        message_ids = []
+        for i in range(0, len(assets), MEDIA_GROUP_MAX_SIZE):
+            chunk = assets[i:i + MEDIA_GROUP_MAX_SIZE]
+            is_last_chunk = i + MEDIA_GROUP_MAX_SIZE >= len(assets)
+            sent = await send_media_group(
+                bot, kind, chat_id, [asset.source for asset in chunk],
+                caption=caption if is_last_chunk else None
+            )
+            message_ids.extend(message.message_id for message in sent)
+        return message_ids
+
+    except Exception as e:
+        if any(asset.required for asset in assets):
+            raise
+        logger.warning(f"Optional {kind} asset skipped: {e}")
+        return []
+
+
+async def render_detail(
+        bot: Bot,
+        chat_id: int,
+        assets: list[DetailAsset],
+        text: str,
+        reply_markup=None,
+        cleanup: Optional[Awaitable] = None
+) -> list[int]:
+    """
+    Detail sahifasini minimal so'rovlar bilan chiqarish:
+    - bir xil turdagi ketma-ket fayllar bitta sendMediaGroup'ga birlashtiriladi
+    - matn 1024 belgidan qisqa bo'lsa oxirgi faylning caption'iga qo'shiladi
+    - eski xabarlarni o'chirish (cleanup) yuborish bilan parallel bajariladi
+    Qaytaradi: yuborilgan barcha xabarlar ID'lari (tartib bilan)
+    Xatolikda DetailRenderError (yuborilganlar ID'lari bilan) ko'tariladi
+    """
+    assets = [asset for asset in assets if asset.source]
+    groups = [(kind, list(items)) for kind, items in groupby(assets, key=lambda asset: asset.kind)]
+
+    # Matn oxirgi bitta faylga sig'adimi? (media group'ga tugma qo'shib bo'lmaydi)
+    fold_text = bool(groups) and len(groups[-1][1]) == 1 and len(text) <= CAPTION_MAX_LENGTH
+
+    async def _render() -> list[int]:
+        message_ids = []
+        text_sent = False
+
+        try:
+            for index, (kind, items) in enumerate(groups):
+                is_last = index == len(groups) - 1
+                if is_last and fold_text:
+                    sent_ids = await _send_group(bot, chat_id, kind, items, text, reply_markup)
+                    text_sent = bool(sent_ids)
+                    message_ids += sent_ids
+                else:
+                    message_ids += await _send_group(bot, chat_id, kind, items)
+
+            # Matn caption'ga sig'madi yoki ixtiyoriy fayl yuborilmadi - alohida xabar
+            if not text_sent:
+                sent = await bot.send_message(
+                    chat_id=chat_id,
+                    text=text,
+                    reply_markup=reply_markup,
+                    parse_mode="HTML"
+                )
+                message_ids.append(sent.message_id)
+        except Exception as e:
+            raise DetailRenderError(message_ids, e) from e
+
+        return message_ids
+
+    if cleanup is None:
+        return await _render()
+
+    # Ikkalasi ham tugashini kutamiz - aks holda cleanup keyin saqlangan ID'larni tozalab yuborishi mumkin
+    message_ids, _cleanup_result = await asyncio.gather(_render(), cleanup, return_exceptions=True)
+    if isinstance(message_ids, BaseException):
+        raise message_ids
+    return message_ids
@@ -0,0 +1,169 @@
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+# 🎯 CONSTANTS
+MINUTE_BUCKETS = 6  # daqiqalik oyna: 6 ta 10 soniyalik chelak
+MINUTE_BUCKET_WIDTH = 10
+HOUR_BUCKETS = 60  # soatlik oyna: 60 ta daqiqalik chelak
+HOUR_BUCKET_WIDTH = 60
+FLOOD_BAN_TIME = 300  # birinchi ban - 5 daqiqa
+FLOOD_BAN_MULTIPLIER = 2  # har keyingi ban 2 barobar uzunroq
+FLOOD_MAX_BAN = 86400  # maksimal ban - 24 soat
+FLOOD_HOUR_BAN = 86400  # soatlik limit oshsa - 24 soat
+FLOOD_STRIKE_RESET = 86400  # shuncha vaqt buzilish bo'lmasa ban tarixi unutiladi
+FLOOD_MAX_USERS = 10_000  # xotirada saqlanadigan userlar (LRU)
+
+REASON_BAN = "ban"  # user ban qilingan
+REASON_KIND = "kind"  # fayl turi limiti - ban emas, faqat kutish
+
+
+class FloodDecision(NamedTuple):
+    """Tekshiruv natijasi"""
+    allowed: bool
+    retry_after: float = 0.0  # sekund - qachon qayta urinish mumkin
+    strikes: int = 0  # progressive ban soni
+    reason: Optional[str] = None
+
+
+class _Window:
+    """Chelakli sirpanuvchi hisoblagich: qo'shish va o'qish O(1) (amortizatsiya)"""
+    __slots__ = ("width", "slots", "head", "total")
+
+    def __init__(self, buckets: int, width: int):
+        self.width = width
+        self.slots = [0] * buckets
+        self.head = 0  # oxirgi chelakning mutlaq raqami
+        self.total = 0
+
+    def _advance(self, now: float):
+        index = int(now // self.width)
+        gap = index - self.head
+        if gap <= 0:
+            return
+        size = len(self.slots)
+        if gap >= size:
+            self.slots = [0] * size
+            self.total = 0
+        else:
+            for i in range(self.head + 1, index + 1):
+                self.total -= self.slots[i % size]
+                self.slots[i % size] = 0
+        self.head = index
+
+    def count(self, now: float) -> int:
+        self._advance(now)
+        return self.total
+
+    def add(self, now: float):
+        self._advance(now)
+        self.slots[self.head % len(self.slots)] += 1
+        self.total += 1
+
+    def retry_after(self, now: float) -> float:
+        """Eng eski to'la chelak oynadan chiqishigacha qolgan vaqt"""
+        self._advance(now)
+        size = len(self.slots)
+        for index in range(self.head - size + 1, self.head + 1):
+            if self.slots[index % size]:
+                return max(0.0, (index + size) * self.width - now)
+        return 0.0
+
+
+class _UserFlood:
+    __slots__ = ("minute", "hour", "kinds", "strikes", "banned_until", "last_strike")
+
+    def __init__(self):
+        self.minute = _Window(MINUTE_BUCKETS, MINUTE_BUCKET_WIDTH)
+        self.hour = _Window(HOUR_BUCKETS, HOUR_BUCKET_WIDTH)
+        self.kinds: dict[str, _Window] = {}
+        self.strikes = 0
+        self.banned_until = 0.0
+        self.last_strike = 0.0
+
+
+class FloodControl:
+    """
+    Flood himoyasi:
+    - har bir user uchun daqiqalik va soatlik chelakli hisoblagichlar
+    - daqiqalik limit oshsa progressive ban (5 daq, 10 daq, 20 daq ... 24 soat)
+    - soatlik limit oshsa uzoq ban
+    - fayl turlari bo'yicha alohida daqiqalik limit (har bir user uchun)
+    - xotira cheklangan: eng uzoq faol bo'lmagan user chiqariladi (LRU)
+    """
+
+    def __init__(
+            self,
+            per_minute: int,
+            per_hour: int,
+            kind_limits: Optional[dict[str, int]] = None,
+            ban_time: int = FLOOD_BAN_TIME,
+            ban_multiplier: int = FLOOD_BAN_MULTIPLIER,
+            hour_ban: int = FLOOD_HOUR_BAN,
+            max_users: int = FLOOD_MAX_USERS,
+    ):
+        self.per_minute = per_minute
+        self.per_hour = per_hour
+        self.kind_limits = kind_limits or {}
+        self.ban_time = ban_time
+        self.ban_multiplier = ban_multiplier
+        self.hour_ban = hour_ban
+        self.max_users = max_users
+        self._users: OrderedDict[int, _UserFlood] = OrderedDict()
+
+    def _state(self, user_id: int) -> _UserFlood:
+        state = self._users.get(user_id)
+        if state is None:
+            state = self._users[user_id] = _UserFlood()
+            if len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user_id)
+        return state
+
+    def _ban(self, state: _UserFlood, now: float, duration: float) -> FloodDecision:
+        state.banned_until = now + duration
+        state.last_strike = now
+        return FloodDecision(False, duration, state.strikes, REASON_BAN)
+
+    def hit(self, user_id: int, kind: Optional[str] = None) -> FloodDecision:
+        """Bitta hodisani tekshirish va ruxsat berilsa hisobga olish"""
+        now = time.time()
+        state = self._state(user_id)
+
+        if now < state.banned_until:
+            return FloodDecision(False, state.banned_until - now, state.strikes, REASON_BAN)
+
+        if state.strikes and now - state.last_strike > FLOOD_STRIKE_RESET:
+            state.strikes = 0
+
+        if state.hour.count(now) >= self.per_hour:
+            state.strikes += 1
+            return self._ban(state, now, self.hour_ban)
+
+        if state.minute.count(now) >= self.per_minute:
+            state.strikes += 1
+            duration = self.ban_time * self.ban_multiplier ** (state.strikes - 1)
+            return self._ban(state, now, min(duration, FLOOD_MAX_BAN))
+
+        window = None
+        limit = self.kind_limits.get(kind) if kind else None
+        if limit:
+            window = state.kinds.get(kind)
+            if window is None:
+                window = state.kinds[kind] = _Window(MINUTE_BUCKETS, MINUTE_BUCKET_WIDTH)
+            if window.count(now) >= limit:
+                return FloodDecision(False, window.retry_after(now), state.strikes, REASON_KIND)
+
+        state.minute.add(now)
+        state.hour.add(now)
+        if window is not None:
+            window.add(now)
+        return FloodDecision(True, strikes=state.strikes)
+
+    def reset(self, user_id: int):
+        """User holatini tozalash (ban ham olib tashlanadi)"""
+        self._users.pop(user_id, None)
+
+    def __len__(self) -> int:
+        return len(self._users)
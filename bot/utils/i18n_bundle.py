@@ -0,0 +1,110 @@
+import asyncio
+import functools
+import gettext as gettext_module
+import logging
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import Mapping
+
+from utils.settings import BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+# 🎯 CONSTANTS
+LOCALES_PATH = BASE_DIR / "locales"
+LOCALES_DOMAIN = "messages"
+DEFAULT_LOCALE = "uz"
+
+# Joriy update tili - har bir update o'z task'ida, shuning uchun userlar bir-biriga ta'sir qilmaydi
+ctx_locale: ContextVar[str] = ContextVar("bot_locale", default=DEFAULT_LOCALE)
+
+
+def _load_catalog(path) -> Mapping[str, str]:
+    with open(path, "rb") as file:
+        translations = gettext_module.GNUTranslations(file)
+    # Faqat oddiy (plural bo'lmagan) va bo'sh bo'lmagan tarjimalar
+    return MappingProxyType({
+        msgid: text for msgid, text in translations._catalog.items()
+        if isinstance(msgid, str) and msgid and text
+    })
+
+
+class LocaleBundles:
+    """
+    Barcha .mo kataloglari bir marta yuklanadi:
+    - har bir til uchun o'zgarmas dict (msgid -> tarjima)
+    - til contextvar'dan olinadi (umumiy I18n obyektining atributi emas)
+    """
+
+    def __init__(self, path=LOCALES_PATH, domain: str = LOCALES_DOMAIN, default_locale: str = DEFAULT_LOCALE):
+        self.path = path
+        self.domain = domain
+        self.default_locale = default_locale
+        self._bundles: dict[str, Mapping[str, str]] | None = None
+
+    def _load(self) -> dict[str, Mapping[str, str]]:
+        bundles = {}
+        for catalog in sorted(self.path.glob(f"*/LC_MESSAGES/{self.domain}.mo")):
+            locale = catalog.parent.parent.name
+            try:
+                bundles[locale] = _load_catalog(catalog)
+            except Exception as e:
+                logger.error(f"Locale catalog load error ({locale}): {e}")
+        logger.info(f"Locale bundles loaded: {', '.join(bundles) or '-'}")
+        return bundles
+
+    @property
+    def bundles(self) -> dict[str, Mapping[str, str]]:
+        if self._bundles is None:
+            self._bundles = self._load()
+        return self._bundles
+
+    @property
+    def locales(self) -> tuple[str, ...]:
+        return tuple(self.bundles)
+
+    def gettext(self, msgid: str, locale: str | None = None) -> str:
+        bundle = self.bundles.get(locale or ctx_locale.get())
+        if bundle is None:
+            return msgid
+        return bundle.get(msgid, msgid)
+
+
+# Global instance
+locale_bundles = LocaleBundles()
+
+
+def gettext(msgid: str) -> str:
+    """Joriy tildagi tarjima (topilmasa msgid o'zi)"""
+    return locale_bundles.gettext(msgid)
+
+
+def get_locale() -> str:
+    return ctx_locale.get()
+
+
+def set_locale(locale: str):
+    """Joriy update (task) uchun tilni o'rnatish"""
+    ctx_locale.set(locale if locale in locale_bundles.bundles else locale_bundles.default_locale)
+
+
+def per_locale(builder):
+    """Argumentsiz, faqat tilga bog'liq natijani har bir til uchun bir marta qurish"""
+    built = {}
+
+    if asyncio.iscoroutinefunction(builder):
+        @functools.wraps(builder)
+        async def async_wrapper():
+            locale = ctx_locale.get()
+            if locale not in built:
+                built[locale] = await builder()
+            return built[locale]
+        return async_wrapper
+
+    @functools.wraps(builder)
+    def wrapper():
+        locale = ctx_locale.get()
+        if locale not in built:
+            built[locale] = builder()
+        return built[locale]
+    return wrapper
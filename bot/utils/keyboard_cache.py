@@ -0,0 +1,51 @@
+import functools
+import inspect
+from typing import Callable, Hashable, Optional
+
+from bot.utils.cache import AsyncTTLCache, content_version
+from bot.utils.i18n_bundle import get_locale, per_locale
+
+# 🎯 CONSTANTS
+KEYBOARD_CACHE_MAX_SIZE = 2048
+KEYBOARD_CACHE_TTL = 24 * 3600  # sekund - kontent versiyasi kalitda, TTL faqat eskirganlarni tozalaydi
+
+# Global instance
+keyboard_cache = AsyncTTLCache(maxsize=KEYBOARD_CACHE_MAX_SIZE, ttl=KEYBOARD_CACHE_TTL)
+
+
+def rows_key(items, *fields: str) -> tuple:
+    """ORM obyektlari ro'yxatidan kalit - faqat tugmada ko'rinadigan maydonlar"""
+    return tuple(tuple(getattr(item, field) for field in fields) for item in items)
+
+
+def _args_key(args: tuple, kwargs: dict) -> Hashable:
+    # Ro'yxatlar (masalan, NamedTuple xulosalari) tuple'ga aylantiriladi
+    frozen = tuple(tuple(arg) if isinstance(arg, list) else arg for arg in args)
+    return (frozen, tuple(sorted(kwargs.items()))) if kwargs else frozen
+
+
+def cached_keyboard(domain: Optional[str] = None, key: Optional[Callable[..., Hashable]] = None):
+    """
+    Markup'ni bir marta qurib qayta ishlatish:
+    kalit = (builder, til, argumentlar, kontent versiyasi), LRU + TTL bilan cheklangan.
+    key - argumentlardan kalit (ORM obyektlari uchun), domain - kontent versiyasi domeni.
+    Argumentsiz va versiyasiz klaviaturalar per_locale'ga topshiriladi (har til uchun bitta markup)
+    """
+    def decorator(builder):
+        if domain is None and key is None and not inspect.signature(builder).parameters:
+            return per_locale(builder)
+
+        name = builder.__qualname__
+
+        @functools.wraps(builder)
+        def wrapper(*args, **kwargs):
+            args_key = key(*args, **kwargs) if key else _args_key(args, kwargs)
+            cache_key = (name, get_locale(), args_key, content_version(domain) if domain else 0)
+
+            markup = keyboard_cache.get(cache_key)
+            if markup is None:
+                markup = builder(*args, **kwargs)
+                keyboard_cache.set(cache_key, markup)
+            return markup
+        return wrapper
+    return decorator
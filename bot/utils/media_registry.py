@@ -0,0 +1,323 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import FSInputFile, URLInputFile, Message, InputMediaPhoto, InputMediaDocument, \
+    InputMediaVideo
+from sqlalchemy import select, update, or_
+from sqlalchemy.dialects.postgresql import insert
+
+from db import db
+from db.models import (
+    MediaFile,
+    Book,
+    Video,
+    Accident,
+    AreaSafety,
+    FacilitySafety,
+    EquipmentSafety,
+    Test,
+    CompanyInfo,
+    TrainSafetyFile
+)
+
+logger = logging.getLogger(__name__)
+
+# 🎯 CONSTANTS
+MEDIA_KINDS = ("photo", "document", "video")
+VERIFY_INTERVAL = 6 * 3600  # 6 soatda bir marta fon tekshiruvi
+VERIFY_MAX_AGE = timedelta(days=7)  # file_id shuncha vaqtda bir qayta tekshiriladi
+VERIFY_BATCH_SIZE = 100
+WARMUP_DELAY = 1.0  # sekund - Telegram flood limitiga tushmaslik uchun
+
+# Admin media kiritadigan barcha ustunlar va ular qanday yuboriladi
+MEDIA_COLUMNS = (
+    (Book.img, "photo"),
+    (Book.file, "document"),
+    (Video.file, "video"),
+    (Accident.file_image, "photo"),
+    (Accident.file_pdf, "document"),
+    (AreaSafety.image, "photo"),
+    (FacilitySafety.image, "photo"),
+    (EquipmentSafety.file_image, "photo"),
+    (Test.image, "photo"),
+    (CompanyInfo.image, "photo"),
+    (CompanyInfo.presentation_file, "document"),
+    (TrainSafetyFile.file_id, "document"),
+)
+
+# (source, kind) -> file_id
+_registry: dict[tuple[str, str], str] = {}
+_worker_task: Optional[asyncio.Task] = None
+
+
+def is_url(source: str) -> bool:
+    """Manba URL ekanligini tekshirish"""
+    return source.startswith(("http://", "https://"))
+
+
+def is_local_path(source: str) -> bool:
+    """Manba lokal fayl yo'li ekanligini tekshirish (file_id'da '/' bo'lmaydi)"""
+    return "/" in source or "\\" in source or os.path.isfile(source)
+
+
+def needs_upload(source: Optional[str]) -> bool:
+    """Telegram file_id emas - yuklash talab qilinadi"""
+    if not source:
+        return False
+    source = source.strip()
+    return is_url(source) or is_local_path(source)
+
+
+def _input_file(source: str):
+    """URL yoki lokal fayl uchun InputFile"""
+    if is_url(source):
+        return URLInputFile(source)
+    return FSInputFile(source)
+
+
+def resolve_media(source: str, kind: str):
+    """Manbani yuborishga tayyorlash: keshdagi file_id yoki InputFile"""
+    source = source.strip()
+    if not needs_upload(source):
+        return source  # Allaqachon Telegram file_id
+
+    file_id = _registry.get((source, kind))
+    if file_id:
+        return file_id
+
+    return _input_file(source)
+
+
+def _extract_file(message: Message, kind: str):
+    """Yuborilgan xabardan (file_id, file_unique_id) ni olish"""
+    if kind == "photo" and message.photo:
+        media = message.photo[-1]
+    else:
+        # Telegram ba'zan videoni hujjat yoki animatsiya sifatida qaytaradi
+        media = message.video or message.document or message.animation
+
+    if not media:
+        return None, None
+    return media.file_id, media.file_unique_id
+
+
+async def remember_media(source: str, kind: str, message: Message):
+    """Yuklangan faylning file_id'sini registry va bazaga yozish"""
+    file_id, file_unique_id = _extract_file(message, kind)
+    if not file_id:
+        return
+
+    _registry[(source, kind)] = file_id
+
+    try:
+        async with db.get_session() as session:
+            stmt = insert(MediaFile).values(
+                source=source,
+                kind=kind,
+                file_id=file_id,
+                file_unique_id=file_unique_id,
+                verified_at=datetime.now(timezone.utc),
+                is_stale=False
+            )
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_media_files_source_kind",
+                set_={
+                    "file_id": stmt.excluded.file_id,
+                    "file_unique_id": stmt.excluded.file_unique_id,
+                    "verified_at": stmt.excluded.verified_at,
+                    "is_stale": False,
+                }
+            )
+            await session.execute(stmt)
+            await session.commit()
+    except Exception as e:
+        logger.error(f"Media registry save error ({kind} {source}): {e}")
+
+
+async def mark_stale(source: str, kind: str):
+    """Eskirgan file_id'ni belgilash - keyingi yuborishda qayta yuklanadi"""
+    _registry.pop((source, kind), None)
+
+    try:
+        async with db.get_session() as session:
+            await session.execute(
+                update(MediaFile)
+                .where(MediaFile.source == source, MediaFile.kind == kind)
+                .values(is_stale=True)
+            )
+            await session.commit()
+    except Exception as e:
+        logger.error(f"Media registry stale mark error ({kind} {source}): {e}")
+
+
+async def send_media(bot: Bot, kind: str, chat_id: int, source: str, **kwargs) -> Message:
+    """Media yuborish - URL/yo'l faqat bir marta yuklanadi, keyin file_id ishlatiladi"""
+    method = {
+        "photo": bot.send_photo,
+        "document": bot.send_document,
+        "video": bot.send_video,
+    }[kind]
+
+    source = source.strip()
+    media = resolve_media(source, kind)
+
+    try:
+        sent = await method(chat_id, media, **kwargs)
+    except TelegramBadRequest:
+        if not (isinstance(media, str) and media != source):
+            raise
+
+        # Keshdagi file_id ishlamadi - qayta yuklash
+        await mark_stale(source, kind)
+        media = _input_file(source)
+        sent = await method(chat_id, media, **kwargs)
+
+    if not isinstance(media, str):
+        await remember_media(source, kind, sent)
+
+    return sent
+
+
+async def send_media_group(bot: Bot, kind: str, chat_id: int, sources: list[str],
+                           caption: Optional[str] = None, **kwargs) -> list[Message]:
+    """Bir turdagi bir nechta faylni bitta sendMediaGroup bilan yuborish"""
+    input_media = {
+        "photo": InputMediaPhoto,
+        "document": InputMediaDocument,
+        "video": InputMediaVideo,
+    }[kind]
+
+    sources = [source.strip() for source in sources]
+    resolved = [resolve_media(source, kind) for source in sources]
+
+    media = []
+    for index, item in enumerate(resolved):
+        # Caption oxirgi elementda - Telegram uni guruh ostida ko'rsatadi
+        if caption and index == len(resolved) - 1:
+            media.append(input_media(media=item, caption=caption, parse_mode="HTML"))
+        else:
+            media.append(input_media(media=item))
+
+    sent = await bot.send_media_group(chat_id, media, **kwargs)
+
+    for source, item, message in zip(sources, resolved, sent):
+        if not isinstance(item, str):
+            await remember_media(source, kind, message)
+
+    return sent
+
+
+async def load_media_registry():
+    """Bot start bo'lganda registry'ni bazadan yuklash"""
+    try:
+        async with db.get_session() as session:
+            result = await session.execute(
+                select(MediaFile.source, MediaFile.kind, MediaFile.file_id)
+                .where(MediaFile.is_stale == False)
+            )
+            for source, kind, file_id in result.all():
+                _registry[(source, kind)] = file_id
+        logger.info(f"Media registry loaded: {len(_registry)} entries")
+    except Exception as e:
+        logger.error(f"Media registry load error: {e}")
+
+
+async def warmup_media_registry(bot: Bot, cache_chat_id: int):
+    """Hali file_id'si yo'q barcha URL/yo'llarni xizmat chatiga oldindan yuklash"""
+    pending: set[tuple[str, str]] = set()
+
+    async with db.get_session() as session:
+        for column, kind in MEDIA_COLUMNS:
+            result = await session.execute(select(column).where(column.isnot(None)).distinct())
+            for (source,) in result.all():
+                source = source.strip()
+                if needs_upload(source) and (source, kind) not in _registry:
+                    pending.add((source, kind))
+
+    uploaded = 0
+    for source, kind in pending:
+        try:
+            sent = await send_media(bot, kind, cache_chat_id, source, disable_notification=True)
+            uploaded += 1
+            try:
+                await bot.delete_message(cache_chat_id, sent.message_id)
+            except Exception:
+                pass
+        except Exception as e:
+            logger.warning(f"Media warmup failed ({kind} {source}): {e}")
+
+        await asyncio.sleep(WARMUP_DELAY)
+
+    if pending:
+        logger.info(f"Media warmup: {uploaded}/{len(pending)} uploaded")
+
+
+async def verify_media_registry(bot: Bot):
+    """Eski tekshirilgan file_id'larni getFile orqali tekshirish"""
+    threshold = datetime.now(timezone.utc) - VERIFY_MAX_AGE
+
+    async with db.get_session() as session:
+        result = await session.execute(
+            select(MediaFile.id, MediaFile.source, MediaFile.kind, MediaFile.file_id)
+            .where(MediaFile.is_stale == False)
+            .where(or_(MediaFile.verified_at.is_(None), MediaFile.verified_at < threshold))
+            .order_by(MediaFile.verified_at.asc().nulls_first())
+            .limit(VERIFY_BATCH_SIZE)
+        )
+        rows = result.all()
+
+    verified_ids = []
+    for media_id, source, kind, file_id in rows:
+        try:
+            await bot.get_file(file_id)
+            verified_ids.append(media_id)
+        except TelegramBadRequest as e:
+            # 20MB dan katta fayllar uchun getFile ishlamaydi, lekin file_id yaroqli
+            if "too big" in str(e).lower():
+                verified_ids.append(media_id)
+            else:
+                logger.warning(f"Stale media file_id ({kind} {source}): {e}")
+                await mark_stale(source, kind)
+        except Exception as e:
+            logger.warning(f"Media verify error ({kind} {source}): {e}")
+
+        await asyncio.sleep(WARMUP_DELAY)
+
+    if verified_ids:
+        async with db.get_session() as session:
+            await session.execute(
+                update(MediaFile)
+                .where(MediaFile.id.in_(verified_ids))
+                .values(verified_at=datetime.now(timezone.utc))
+            )
+            await session.commit()
+
+
+async def _media_registry_worker(bot: Bot, cache_chat_id: Optional[int]):
+    """Fon jarayoni: warmup + davriy tekshiruv"""
+    while True:
+        try:
+            if cache_chat_id:
+                await warmup_media_registry(bot, cache_chat_id)
+            await verify_media_registry(bot)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Media registry worker error: {e}")
+
+        await asyncio.sleep(VERIFY_INTERVAL)
+
+
+async def start_media_registry(bot: Bot, cache_chat_id: Optional[int] = None):
+    """Bot start bo'lganda registry'ni yuklash va fon jarayonini ishga tushirish"""
+    global _worker_task
+
+    await load_media_registry()
+
+    if not _worker_task:
+        _worker_task = asyncio.create_task(_media_registry_worker(bot, cache_chat_id))
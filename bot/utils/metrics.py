@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# 🎯 CONSTANTS
+METRICS_REPORT_INTERVAL = 300  # sekund - hisoblagichlar logga shu oraliqda yoziladi
+
+
+class Metrics:
+    """
+    Jarayon ichidagi hisoblagichlar (nom + label'lar):
+    - inc(): O(1), print/log yo'q - issiq yo'lda ishlatish uchun
+    - start(): o'zgargan hisoblagichlarni davriy ravishda logga yozish (log asosidagi hisobot)
+    """
+
+    def __init__(self):
+        self._counters: dict[tuple, int] = {}
+        self._reported: dict[tuple, int] = {}
+        self._worker_task: Optional[asyncio.Task] = None
+
+    def inc(self, name: str, amount: int = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        self._counters[key] = self._counters.get(key, 0) + amount
+
+    def get(self, name: str, **labels) -> int:
+        return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def snapshot(self) -> dict[tuple, int]:
+        return dict(self._counters)
+
+    def report(self):
+        """Oxirgi hisobotdan beri o'zgargan hisoblagichlarni logga yozish"""
+        changed = {
+            key: value for key, value in self._counters.items()
+            if self._reported.get(key) != value
+        }
+        if not changed:
+            return
+
+        for (name, labels), value in sorted(changed.items()):
+            delta = value - self._reported.get((name, labels), 0)
+            parts = [name] + [f"{key}={value_}" for key, value_ in labels] + [f"total={value}", f"(+{delta})"]
+            logger.info("metric " + " ".join(parts))
+        self._reported.update(changed)
+
+    async def _report_worker(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            self.report()
+
+    def start(self, interval: float = METRICS_REPORT_INTERVAL):
+        """Davriy hisobotni ishga tushirish"""
+        if not self._worker_task:
+            self._worker_task = asyncio.create_task(self._report_worker(interval))
+
+
+# Global instance
+metrics = Metrics()
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+from typing import Awaitable, Optional
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import Message, InputMediaPhoto, ReplyKeyboardRemove
+
+from bot.utils.media_registry import send_media, resolve_media, remember_media
+
+logger = logging.getLogger(__name__)
+
+# Fon vazifalari GC tomonidan yo'qolib ketmasligi uchun
+_background_tasks: set[asyncio.Future] = set()
+
+
+def run_in_background(awaitable: Awaitable) -> asyncio.Future:
+    """Tozalash kabi ishlarni foydalanuvchi kutmaydigan fon vazifasiga chiqarish"""
+    task = asyncio.ensure_future(awaitable)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_done)
+    return task
+
+
+def _on_background_done(task: asyncio.Future):
+    """Fon vazifasi tugaganda - xatoni log qilish"""
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.warning(f"Background task failed: {task.exception()}")
+
+
+def _is_not_modified(error: TelegramBadRequest) -> bool:
+    """Telegram 'message is not modified' xatosi - ekran allaqachon to'g'ri"""
+    return "message is not modified" in str(error).lower()
+
+
+async def _safe_delete(message: Message):
+    """Eski xabarni xavfsiz o'chirish"""
+    try:
+        await message.delete()
+    except Exception:
+        pass
+
+
+async def _edit_in_place(message: Message, text: str, reply_markup=None, photo: Optional[str] = None):
+    """Xabarni joyida tahrirlash: text->text yoki photo->photo. Imkon bo'lmasa None"""
+    try:
+        if photo is None:
+            if message.photo or message.text is None:
+                return None
+            edited = await message.edit_text(text, reply_markup=reply_markup, parse_mode="HTML")
+        else:
+            if not message.photo:
+                return None
+
+            media = resolve_media(photo, "photo")
+            edited = await message.edit_media(
+                InputMediaPhoto(media=media, caption=text, parse_mode="HTML"),
+                reply_markup=reply_markup
+            )
+            if not isinstance(media, str) and isinstance(edited, Message):
+                await remember_media(photo.strip(), "photo", edited)
+
+    except TelegramBadRequest as e:
+        if _is_not_modified(e):
+            return message
+        logger.debug(f"Edit in place failed, falling back to resend: {e}")
+        return None
+
+    return edited if isinstance(edited, Message) else message
+
+
+async def _send_new(message: Message, text: str, reply_markup=None, photo: Optional[str] = None) -> Message:
+    """Yangi xabar yuborish - rasm yuborilmasa matn bilan"""
+    if photo:
+        try:
+            return await send_media(
+                message.bot, "photo", message.chat.id, photo,
+                caption=text,
+                reply_markup=reply_markup,
+                parse_mode="HTML"
+            )
+        except TelegramBadRequest:
+            pass
+
+    return await message.bot.send_message(
+        chat_id=message.chat.id,
+        text=text,
+        reply_markup=reply_markup,
+        parse_mode="HTML"
+    )
+
+
+async def render_screen(
+        message: Message,
+        text: str,
+        reply_markup=None,
+        photo: Optional[str] = None
+) -> tuple[Message, bool]:
+    """
+    Inline menyu ekranini chiqarish:
+    - text->text va photo->photo o'tishlarda xabar joyida tahrirlanadi (1 ta so'rov)
+    - kontent turi o'zgarsa eski xabar o'chiriladi va yangisi yuboriladi (parallel)
+    Qaytaradi: (ekrandagi xabar, yangi xabar yuborildimi)
+    """
+    edited = await _edit_in_place(message, text, reply_markup, photo)
+    if edited is not None:
+        return edited, False
+
+    sent, _deleted = await asyncio.gather(
+        _send_new(message, text, reply_markup, photo),
+        _safe_delete(message)
+    )
+    return sent, True
+
+
+async def update_screen_text(message: Message, text: str, reply_markup=None) -> Message:
+    """Joriy xabar turini saqlagan holda matnini yangilash (media bo'lsa caption)"""
+    try:
+        if message.text is None:
+            edited = await message.edit_caption(caption=text, reply_markup=reply_markup, parse_mode="HTML")
+        else:
+            edited = await message.edit_text(text, reply_markup=reply_markup, parse_mode="HTML")
+    except TelegramBadRequest as e:
+        if not _is_not_modified(e):
+            raise
+        return message
+
+    return edited if isinstance(edited, Message) else message
+
+
+async def render_markup(message: Message, reply_markup) -> Message:
+    """Faqat tugmalarni yangilash (sahifalash uchun)"""
+    try:
+        edited = await message.edit_reply_markup(reply_markup=reply_markup)
+    except TelegramBadRequest as e:
+        if not _is_not_modified(e):
+            raise
+        return message
+
+    return edited if isinstance(edited, Message) else message
+
+
+async def open_section(
+        message: Message,
+        text: str,
+        reply_markup=None,
+        photo: Optional[str] = None,
+        placeholder: str = "..."
+) -> Message:
+    """
+    Reply menyudan inline bo'limga o'tish:
+    reply keyboard'ni olib tashlovchi placeholder va haqiqiy ekran bir vaqtda yuboriladi,
+    placeholder fonda o'chiriladi (sleep yo'q)
+    """
+    placeholder_msg, sent = await asyncio.gather(
+        message.answer(placeholder, reply_markup=ReplyKeyboardRemove()),
+        _send_new(message, text, reply_markup, photo),
+        return_exceptions=True
+    )
+
+    if isinstance(sent, BaseException):
+        raise sent
+    if isinstance(placeholder_msg, Message):
+        run_in_background(_safe_delete(placeholder_msg))
+
+    return sent
+
+
+async def remove_reply_keyboard(message: Message, placeholder: str = "..."):
+    """Reply keyboard'ni olib tashlash - placeholder fonda o'chiriladi"""
+    placeholder_msg = await message.answer(placeholder, reply_markup=ReplyKeyboardRemove())
+    run_in_background(_safe_delete(placeholder_msg))
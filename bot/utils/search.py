@@ -0,0 +1,87 @@
+import re
+from typing import NamedTuple
+
+from sqlalchemy import select, func, literal, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.utils.transliterate import normalize_text
+from db.models import Accident, Book, Video, TrainSafetyFile, CompanyInfo
+
+# 🎯 CONSTANTS
+SEARCH_MIN_LENGTH = 2
+SEARCH_MAX_TERMS = 8
+
+# tur -> (model, sarlavha ustuni, qo'shimcha filtr)
+SEARCH_SOURCES = {
+    "accident": (Accident, Accident.title, None),
+    "book": (Book, Book.name, None),
+    "video": (Video, Video.name, None),
+    "train_file": (TrainSafetyFile, TrainSafetyFile.name, TrainSafetyFile.is_active == True),
+    "company": (CompanyInfo, CompanyInfo.name, CompanyInfo.is_active == True),
+}
+
+
+class SearchHit(NamedTuple):
+    """Qidiruv natijasi: tur, id va sarlavha"""
+    kind: str
+    id: int
+    title: str
+
+
+class SearchPage(NamedTuple):
+    """Natijalarning bitta sahifasi"""
+    hits: list[SearchHit]
+    total: int
+    page: int
+    total_pages: int
+
+
+def build_ts_query(query: str) -> str:
+    """Foydalanuvchi so'rovini tsquery'ga aylantirish: har bir so'z prefiks bo'yicha, AND bilan"""
+    terms = re.findall(r"[^\W_]+", normalize_text(query))[:SEARCH_MAX_TERMS]
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+async def search_content(session: AsyncSession, query: str, page: int, per_page: int) -> SearchPage:
+    """Barcha bo'limlar bo'yicha reyting tartibidagi natijalar - bitta UNION ALL so'rov"""
+    ts_query = build_ts_query(query)
+    if not ts_query:
+        return SearchPage([], 0, 1, 1)
+
+    tsquery = func.to_tsquery("simple", ts_query)
+
+    parts = []
+    for kind, (model, title_column, extra_filter) in SEARCH_SOURCES.items():
+        part = select(
+            literal(kind).label("kind"),
+            model.id.label("id"),
+            title_column.label("title"),
+            func.ts_rank_cd(model.search_vector, tsquery).label("rank")
+        ).where(model.search_vector.op("@@")(tsquery))
+
+        if extra_filter is not None:
+            part = part.where(extra_filter)
+        parts.append(part)
+
+    matches = union_all(*parts).subquery()
+    result = await session.execute(
+        select(
+            matches.c.kind,
+            matches.c.id,
+            matches.c.title,
+            func.count().over().label("total")
+        )
+        .order_by(matches.c.rank.desc(), matches.c.title)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+    )
+    rows = result.all()
+
+    total = rows[0].total if rows else 0
+    if not rows and page > 1:
+        # Sahifa chegaradan tashqarida (natijalar kamaygan) - birinchi sahifa
+        return await search_content(session, query, 1, per_page)
+
+    total_pages = max(1, (total + per_page - 1) // per_page)
+    hits = [SearchHit(row.kind, row.id, row.title) for row in rows]
+    return SearchPage(hits, total, page, total_pages)
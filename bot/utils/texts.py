@@ -1,6 +1,7 @@
-from aiogram.utils.i18n import gettext as _
+from bot.utils.i18n_bundle import gettext as _
 from datetime import datetime, timezone
 from typing import List, Tuple
+import html
 import re
 import random
 
@@ -440,6 +441,40 @@ def safety_error_text() -> str:
     return _("❌ Xatolik yuz berdi. Iltimos, qayta urinib ko'ring.")
 
 
+def safety_serial_search_prompt_text() -> str:
+    """Seriya raqami bo'yicha qidiruv"""
+    return _(
+        "🔎 <b>SERIYA RAQAMI BO'YICHA QIDIRUV</b>\n"
+        "➖➖➖➖➖➖➖➖➖➖➖➖\n\n"
+        "🔢 Himoya vositasining seriya raqamini yuboring.\n"
+        "💡 <i>Raqamning boshi yoki bir qismi ham yetarli.</i>"
+    )
+
+
+def safety_serial_search_too_short_text() -> str:
+    """Qidiruv so'rovi juda qisqa"""
+    return _("❗️ Iltimos, kamida <b>2</b> ta belgi kiriting.")
+
+
+def safety_serial_search_no_results_text(query: str) -> str:
+    """Seriya raqami topilmadi"""
+    return _(
+        "❌ <b>№{query}</b> seriya raqamli\n"
+        "faol <b>Himoya vositasi</b> topilmadi.\n\n"
+        "🔁 <i>Boshqa raqamni yuboring.</i>"
+    ).format(query=html.escape(query))
+
+
+def safety_serial_search_results_text(query: str, count: int) -> str:
+    """Seriya raqami bo'yicha natijalar"""
+    return _(
+        "🔎 <b>So'rov:</b> №{query}\n"
+        "🧰 <b>Topildi: <i>{count}</i> ta</b>\n"
+        "➖➖➖➖➖➖➖➖➖➖➖➖\n\n"
+        "👇 Kerakli himoya vositasini tanlang:"
+    ).format(query=html.escape(query), count=count)
+
+
 # ============================ exam_schedule_handler ============================
 
 
@@ -969,14 +1004,23 @@ def ai_waiting_text() -> str:
     )
 
 
-def ai_response_text(ai_response: str, service_used: str = None) -> str:
-    """Format AI response"""
-    text = (f"🤖 <b>AI Javobi:</b>\n"
-            f"━━━━━━━━━━━━━━━━━━━━\n\n"
-            f"{ai_response}"
-            )
+def ai_superseded_text() -> str:
+    """AI request replaced by a newer question"""
+    return _(
+        "⏭ <b>Yangi savolingizga javob berilmoqda</b>\n\n"
+        "<i>Oldingi savol bekor qilindi</i>"
+    )
+
+
+def ai_response_header_text() -> str:
+    """AI response header (streaming uchun ham)"""
+    return ("🤖 <b>AI Javobi:</b>\n"
+            "━━━━━━━━━━━━━━━━━━━━\n\n")
 
-    text += "\n\n💡 <i>Qo'shimcha ma'lumot kerakmi? Batafsil so'rang!</i>"
+
+def ai_response_footer_text(service_used: str = None) -> str:
+    """AI response footer (streaming uchun ham)"""
+    text = "\n\n💡 <i>Qo'shimcha ma'lumot kerakmi? Batafsil so'rang!</i>"
 
     if service_used:
         text += f"\n<i>📡 {service_used} orqali</i>"
@@ -986,6 +1030,11 @@ def ai_response_text(ai_response: str, service_used: str = None) -> str:
     return text
 
 
+def ai_response_text(ai_response: str, service_used: str = None) -> str:
+    """Format AI response"""
+    return ai_response_header_text() + ai_response + ai_response_footer_text(service_used)
+
+
 def ai_error_text() -> str:
     """AI error text"""
     return _(
@@ -1558,4 +1607,41 @@ def train_safety_error_text() -> str:
     return _(
         "❌ <b>Xatolik yuz berdi.</b>\n"
         "🙏 <i>Iltimos, qayta urinib ko'ring</i>"
-    )
\ No newline at end of file
+    )
+
+# ============================ search_handler ============================
+
+def search_prompt_text() -> str:
+    """Umumiy qidiruv"""
+    return _(
+        "🔎 <b>QIDIRUV</b>\n"
+        "━━━━━━━━━━━━━━━━━━━━\n\n"
+        "✍️ Qidirilayotgan so'z yoki iborani yuboring.\n"
+        "📂 <i>Baxtsiz hodisalar, kitoblar, videolar, PHX hujjatlari va korxona ma'lumotlari bo'yicha qidiriladi.</i>\n"
+        "💡 <i>Kirill yoki lotin yozuvida yozishingiz mumkin.</i>"
+    )
+
+
+def search_too_short_text() -> str:
+    """Qidiruv so'rovi juda qisqa"""
+    return _("❗️ Iltimos, kamida <b>2</b> ta belgi kiriting.")
+
+
+def search_no_results_text(query: str) -> str:
+    """Hech narsa topilmadi"""
+    return _(
+        "❌ <b>«{query}»</b> bo'yicha hech narsa topilmadi.\n\n"
+        "🔁 <i>Boshqa so'z bilan qayta urinib ko'ring.</i>"
+    ).format(query=html.escape(query))
+
+
+def search_results_text(query: str, total: int, page: int, total_pages: int) -> str:
+    """Qidiruv natijalari sarlavhasi"""
+    return _(
+        "🔎 <b>So'rov:</b> «{query}»\n"
+        "📋 <b>Topildi: <i>{total}</i> ta</b>\n"
+        "📄 <b>Sahifa:</b> {page}/{total_pages}\n"
+        "━━━━━━━━━━━━━━━━━━━━\n\n"
+        "👇 Kerakli natijani tanlang:\n"
+        "🔁 <i>Yangi qidiruv uchun boshqa so'z yuboring.</i>"
+    ).format(query=html.escape(query), total=total, page=page, total_pages=total_pages)
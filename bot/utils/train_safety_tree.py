@@ -0,0 +1,83 @@
+from typing import NamedTuple, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.utils.cache import cached
+from db.models import TrainSafetyFolder, TrainSafetyFile
+
+
+class FolderNode(NamedTuple):
+    """Faol papka va undagi faol fayllar ID'lari (order_index tartibida)"""
+    id: int
+    name: str
+    description: Optional[str]
+    file_ids: tuple[int, ...]
+
+
+class FileNode(NamedTuple):
+    """Faol fayl (Telegram file_id bilan)"""
+    id: int
+    name: str
+    file_id: str
+    description: Optional[str]
+    folder_id: int
+
+
+class TrainSafetyTree(NamedTuple):
+    """Papkalar daraxtining keshlanadigan nusxasi"""
+    folders: tuple[FolderNode, ...]
+    folders_by_id: dict[int, FolderNode]
+    files_by_id: dict[int, FileNode]
+
+    def folder_files(self, folder: FolderNode) -> list[FileNode]:
+        """Papkadagi fayllar (tartib saqlangan)"""
+        return [self.files_by_id[file_id] for file_id in folder.file_ids]
+
+
+async def _load_tree(session: AsyncSession) -> TrainSafetyTree:
+    """Faol papkalar va fayllar - ikki yengil so'rov, ORM obyektlarsiz"""
+    folder_rows = (await session.execute(
+        select(TrainSafetyFolder.id, TrainSafetyFolder.name, TrainSafetyFolder.description)
+        .where(TrainSafetyFolder.is_active == True)
+        .order_by(TrainSafetyFolder.order_index, TrainSafetyFolder.name)
+    )).all()
+
+    file_rows = (await session.execute(
+        select(
+            TrainSafetyFile.id,
+            TrainSafetyFile.name,
+            TrainSafetyFile.file_id,
+            TrainSafetyFile.description,
+            TrainSafetyFile.folder_id
+        )
+        .join(TrainSafetyFolder, TrainSafetyFolder.id == TrainSafetyFile.folder_id)
+        .where(TrainSafetyFile.is_active == True, TrainSafetyFolder.is_active == True)
+        .order_by(TrainSafetyFile.order_index, TrainSafetyFile.name)
+    )).all()
+
+    files_by_id = {row.id: FileNode(*row) for row in file_rows}
+
+    folder_file_ids: dict[int, list[int]] = {}
+    for file in files_by_id.values():
+        folder_file_ids.setdefault(file.folder_id, []).append(file.id)
+
+    folders = tuple(
+        FolderNode(folder_id, name, description, tuple(folder_file_ids.get(folder_id, ())))
+        for folder_id, name, description in folder_rows
+    )
+
+    return TrainSafetyTree(folders, {folder.id: folder for folder in folders}, files_by_id)
+
+
+async def get_train_safety_tree(session: AsyncSession) -> TrainSafetyTree:
+    """Daraxt umumiy keshdan - admin papka/fayl o'zgartirsa versiya bo'yicha yangilanadi"""
+    return await cached("train_safety", "tree", _load_tree, session)
+
+
+def paginate(items: Sequence, page: int, per_page: int):
+    """Xotiradagi ro'yxatdan sahifa: (sahifadagi elementlar, page, total_pages)"""
+    total_pages = max(1, (len(items) + per_page - 1) // per_page)
+    page = max(1, min(page, total_pages))
+    start_idx = (page - 1) * per_page
+    return items[start_idx:start_idx + per_page], page, total_pages
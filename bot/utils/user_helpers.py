@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import update, select
 from sqlalchemy.orm import sessionmaker
-from db.models import User
+from db.models import User, Role
 from db import db
 import logging
 
@@ -67,6 +67,17 @@ async def get_user_info(session: AsyncSession, telegram_id: int) -> tuple[str, s
         return "Foydalanuvchi", "uz"
 
 
+async def get_admin_telegram_ids() -> set[int]:
+    """
+    Admin (superuser) rolidagi foydalanuvchilarning telegram ID'lari
+    """
+    async with db.get_session() as session:
+        result = await session.execute(
+            select(User.telegram_id).where(User.role == Role.superuser)
+        )
+        return set(result.scalars().all())
+
+
 def validate_language_code(language_code: str) -> bool:
     """
     Til kodini tekshirish
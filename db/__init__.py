@@ -1,8 +1,10 @@
+import logging
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, AsyncAttrs, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
@@ -28,6 +30,18 @@ except ImportError:
     cf = MockConfig()
 
 
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+
+def get_migration_head() -> str:
+    """migrations/versions dagi oxirgi revision (bazaga ulanmasdan)"""
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory(MIGRATIONS_PATH).get_current_head()
+
+
 class Base(AsyncAttrs, DeclarativeBase):
     pass
 
@@ -66,5 +80,17 @@ class AsyncDatabaseSession:
         async with self._engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
+    async def check_schema_version(self):
+        """Baza sxemasi oxirgi migratsiyada ekanini tekshirish (faqat alembic_version o'qiladi)"""
+        expected = get_migration_head()
+        async with self._engine.connect() as conn:
+            current = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar_one_or_none()
+
+        if current != expected:
+            raise RuntimeError(
+                f"Database schema version {current} != {expected}, run 'alembic upgrade head'"
+            )
+        logger.info(f"Database schema version: {current}")
+
 
 db = AsyncDatabaseSession()
\ No newline at end of file
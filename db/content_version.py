@@ -0,0 +1,54 @@
+import logging
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from db import db
+from db.models import ContentVersion
+
+logger = logging.getLogger(__name__)
+
+# Model nomi -> bot keshidagi domen
+CONTENT_DOMAINS = {
+    "AccidentCategory": "accident",
+    "AccidentYear": "accident",
+    "Accident": "accident",
+    "CategoryBook": "library",
+    "Book": "library",
+    "CategoryVideo": "video",
+    "Video": "video",
+    "TrainSafetyFolder": "train_safety",
+    "TrainSafetyFile": "train_safety",
+    "CompanyInfo": "company",
+    "EquipmentCatalog": "equipment",
+    "User": "exam",
+    "ExamSchedule": "exam",
+}
+
+
+def content_domain(model) -> Optional[str]:
+    """Model qaysi kesh domeniga tegishli (yo'q bo'lsa None)"""
+    return CONTENT_DOMAINS.get(model.__name__)
+
+
+async def bump_content_version(domain: str):
+    """Domen versiyasini oshirish - bot keyingi tekshiruvda keshni tashlaydi"""
+    try:
+        async with db.get_session() as session:
+            stmt = insert(ContentVersion).values(domain=domain, version=1)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ContentVersion.domain],
+                set_={"version": ContentVersion.version + 1}
+            )
+            await session.execute(stmt)
+            await session.commit()
+    except Exception as e:
+        logger.error(f"Content version bump error ({domain}): {e}")
+
+
+async def load_content_versions() -> dict[str, int]:
+    """Barcha domenlar versiyalari"""
+    async with db.get_session() as session:
+        result = await session.execute(select(ContentVersion.domain, ContentVersion.version))
+        return dict(result.all())
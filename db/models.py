@@ -1,8 +1,10 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import BigInteger, String, ForeignKey, Text, Boolean, DateTime, Enum as SqlEnum, Integer
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import BigInteger, String, ForeignKey, Text, Boolean, DateTime, Enum as SqlEnum, Integer, Index, \
+    UniqueConstraint, LargeBinary
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column, relationship, deferred
 
 from db import Base
 from db.utils import CreatedModel
@@ -64,7 +66,7 @@ class Test(CreatedModel):
     __tablename__ = "tests"
     text: Mapped[str] = mapped_column(String(255), nullable=False)
     image: Mapped[str] = mapped_column(String(255), nullable=True)
-    category_test_id: Mapped[int] = mapped_column(ForeignKey("category_tests.id", ondelete='CASCADE'))
+    category_test_id: Mapped[int] = mapped_column(ForeignKey("category_tests.id", ondelete='CASCADE'), index=True)
     category: Mapped["CategoryTest"] = relationship(back_populates="tests")
     answers: Mapped[list["AnswerTest"]] = relationship(back_populates="test", cascade="all, delete-orphan")
 
@@ -76,7 +78,7 @@ class AnswerTest(CreatedModel):
     __tablename__ = "answer_tests"
     text: Mapped[str] = mapped_column(String(255), nullable=False)
     is_correct: Mapped[bool] = mapped_column(Boolean, default=False)
-    test_id: Mapped[int] = mapped_column(ForeignKey("tests.id", ondelete='CASCADE'))
+    test_id: Mapped[int] = mapped_column(ForeignKey("tests.id", ondelete='CASCADE'), index=True)
     test: Mapped["Test"] = relationship(back_populates="answers")
 
     def __str__(self):
@@ -105,7 +107,7 @@ class AreaSafety(CreatedModel):
     image: Mapped[str | None] = mapped_column(String, nullable=True)
 
     department_safety_id: Mapped[int] = mapped_column(
-        ForeignKey("department_safeties.id", ondelete='RESTRICT')
+        ForeignKey("department_safeties.id", ondelete='RESTRICT'), index=True
     )
 
     department_safety: Mapped["DepartmentSafety"] = relationship(back_populates="area_safeties")
@@ -126,7 +128,7 @@ class FacilitySafety(CreatedModel):
     image: Mapped[str | None] = mapped_column(String, nullable=True)
 
     area_safety_id: Mapped[int] = mapped_column(
-        ForeignKey("area_safeties.id", ondelete='RESTRICT')
+        ForeignKey("area_safeties.id", ondelete='RESTRICT'), index=True
     )
 
     area_safety: Mapped["AreaSafety"] = relationship(back_populates="facility_safeties")
@@ -155,9 +157,20 @@ class EquipmentCatalog(CreatedModel):
 class EquipmentSafety(CreatedModel):
     """Himoya vositalari - Inshootdagi himoya uskunalari"""
     __tablename__ = "equipment_safeties"
+    __table_args__ = (
+        # 🔎 Seriya raqami bo'yicha prefix/fuzzy qidiruv uchun (pg_trgm)
+        Index(
+            "idx_equipment_safeties_serial_trgm",
+            "serial_number",
+            postgresql_using="gin",
+            postgresql_ops={"serial_number": "gin_trgm_ops"},
+        ),
+        # Inshoot bo'yicha faol vositalar, muddati bo'yicha tartiblangan (FK'ni ham qoplaydi)
+        Index("idx_equipment_safeties_facility_active_expire", "facility_safety_id", "is_active", "expire_at"),
+    )
 
     catalog_id: Mapped[int] = mapped_column(
-        ForeignKey("equipment_catalogs.id", ondelete='RESTRICT')
+        ForeignKey("equipment_catalogs.id", ondelete='RESTRICT'), index=True
     )
     serial_number: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
     file_image: Mapped[str] = mapped_column(String, nullable=False)
@@ -185,13 +198,20 @@ class CategoryBook(CreatedModel):
 
 class Book(CreatedModel):
     __tablename__ = "books"
+    __table_args__ = (
+        Index("idx_books_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str] = mapped_column(Text)
     img: Mapped[str] = mapped_column(String(255), nullable=True)
     file: Mapped[str] = mapped_column(String)
-    category_book_id: Mapped[int] = mapped_column(ForeignKey("category_books.id", ondelete='CASCADE'))
+    category_book_id: Mapped[int] = mapped_column(ForeignKey("category_books.id", ondelete='CASCADE'), index=True)
     category: Mapped["CategoryBook"] = relationship(back_populates="books")
 
+    # To'liq matnli qidiruv - trigger orqali to'ldiriladi (migratsiya f7c2e9a14b36)
+    search_vector: Mapped[str | None] = deferred(mapped_column(TSVECTOR, nullable=True))
+
     def __str__(self):
         return self.name
 
@@ -207,12 +227,19 @@ class CategoryVideo(CreatedModel):
 
 class Video(CreatedModel):
     __tablename__ = "videos"
+    __table_args__ = (
+        Index("idx_videos_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str] = mapped_column(Text)
     file: Mapped[str] = mapped_column(String)
-    category_video_id: Mapped[int] = mapped_column(ForeignKey("category_videos.id", ondelete='CASCADE'))
+    category_video_id: Mapped[int] = mapped_column(ForeignKey("category_videos.id", ondelete='CASCADE'), index=True)
     category: Mapped["CategoryVideo"] = relationship(back_populates="videos")
 
+    # To'liq matnli qidiruv - trigger orqali to'ldiriladi (migratsiya f7c2e9a14b36)
+    search_vector: Mapped[str | None] = deferred(mapped_column(TSVECTOR, nullable=True))
+
     def __str__(self):
         return self.name
 
@@ -254,18 +281,26 @@ class AccidentYear(CreatedModel):
 class Accident(CreatedModel):
     """Baxtsiz hodisalar"""
     __tablename__ = "accidents"
+    __table_args__ = (
+        Index("idx_accidents_search_vector", "search_vector", postgresql_using="gin"),
+        # Yil (va kategoriya) bo'yicha ro'yxatlar (year_id FK'ni ham qoplaydi)
+        Index("idx_accidents_year_category", "year_id", "category_id"),
+    )
 
     title: Mapped[str] = mapped_column(String(100), nullable=False)
     file_pdf: Mapped[str] = mapped_column(String, nullable=False)
     file_image: Mapped[str | None] = mapped_column(String, nullable=True)
     year_id: Mapped[int] = mapped_column(ForeignKey("accident_years.id"))
-    category_id: Mapped[int] = mapped_column(ForeignKey("accident_categories.id"))
+    category_id: Mapped[int] = mapped_column(ForeignKey("accident_categories.id"), index=True)
 
     year: Mapped["AccidentYear"] = relationship(back_populates="accidents")
     category: Mapped["AccidentCategory"] = relationship(back_populates="accidents")
 
     description: Mapped[str] = mapped_column(Text)
 
+    # To'liq matnli qidiruv - trigger orqali to'ldiriladi (migratsiya f7c2e9a14b36)
+    search_vector: Mapped[str | None] = deferred(mapped_column(TSVECTOR, nullable=True))
+
     def __str__(self):
         return self.title
 
@@ -284,6 +319,9 @@ class Channel(CreatedModel):
 
 class CompanyInfo(CreatedModel):
     __tablename__ = "company_info"
+    __table_args__ = (
+        Index("idx_company_info_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
@@ -295,6 +333,9 @@ class CompanyInfo(CreatedModel):
     address: Mapped[str] = mapped_column(Text, nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
+    # To'liq matnli qidiruv - trigger orqali to'ldiriladi (migratsiya f7c2e9a14b36)
+    search_vector: Mapped[str | None] = deferred(mapped_column(TSVECTOR, nullable=True))
+
     def __str__(self):
         return self.name
 
@@ -320,6 +361,11 @@ class TrainSafetyFolder(CreatedModel):
 class TrainSafetyFile(CreatedModel):
     """Poezdlar harakat xavfsizligi fayllari"""
     __tablename__ = "train_safety_files"
+    __table_args__ = (
+        Index("idx_train_safety_files_search_vector", "search_vector", postgresql_using="gin"),
+        # Papka bo'yicha faol fayllar, tartib raqami bo'yicha (folder_id FK'ni ham qoplaydi)
+        Index("idx_train_safety_files_folder_active_order", "folder_id", "is_active", "order_index"),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     file_id: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -330,6 +376,9 @@ class TrainSafetyFile(CreatedModel):
 
     folder: Mapped["TrainSafetyFolder"] = relationship(back_populates="files")
 
+    # To'liq matnli qidiruv - trigger orqali to'ldiriladi (migratsiya f7c2e9a14b36)
+    search_vector: Mapped[str | None] = deferred(mapped_column(TSVECTOR, nullable=True))
+
     def __str__(self):
         return self.name
 
@@ -347,4 +396,59 @@ class AdminUser(CreatedModel):
         return self.username
 
 
+class MediaFile(CreatedModel):
+    """Admin kiritgan media manbasi (URL / fayl yo'li) -> Telegram file_id keshi"""
+    __tablename__ = "media_files"
+    __table_args__ = (
+        UniqueConstraint("source", "kind", name="uq_media_files_source_kind"),
+    )
+
+    source: Mapped[str] = mapped_column(Text, nullable=False)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)  # photo / document / video
+    file_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    file_unique_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    verified_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    is_stale: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    def __str__(self):
+        return f"{self.kind}: {self.source}"
+
+
+class ContentVersion(CreatedModel):
+    """Kontent versiyasi - admin panel yozganda oshiriladi, bot keshi shunga qarab yangilanadi"""
+    __tablename__ = "content_versions"
+
+    domain: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    version: Mapped[int] = mapped_column(BigInteger, default=1, nullable=False)
+
+    def __str__(self):
+        return f"{self.domain}: v{self.version}"
+
+
+class AIUsageBucket(CreatedModel):
+    """AI so'rovlari hisoblagichi: subyekt (user/xizmat) bo'yicha daqiqalik chelak"""
+    __tablename__ = "ai_usage_buckets"
+    __table_args__ = (
+        UniqueConstraint("subject", "minute", name="uq_ai_usage_buckets_subject_minute"),
+    )
+
+    subject: Mapped[str] = mapped_column(String(64), nullable=False)
+    minute: Mapped[int] = mapped_column(BigInteger, nullable=False)  # Unix vaqt // 60
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    def __str__(self):
+        return f"{self.subject} @ {self.minute}: {self.count}"
+
+
+class AIConversation(CreatedModel):
+    """AI suhbat tarixi - zlib bilan siqilgan JSON (bot restartidan keyin ham saqlanadi)"""
+    __tablename__ = "ai_conversations"
+
+    user_id: Mapped[int] = mapped_column(BigInteger, unique=True, nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    def __str__(self):
+        return f"AI conversation {self.user_id}"
+
+
 metadata = Base.metadata
\ No newline at end of file
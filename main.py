@@ -8,11 +8,18 @@ from aiogram.enums import ParseMode
 from aiogram.types import BotCommand
 from aiogram.utils.i18n import I18n, FSMI18nMiddleware
 
-from bot.handlers import dp
-from bot.middlewares import DbSessionMiddleware, JoinChannelMiddleware, UserLanguageMiddleware, RateLimitMiddleware
+from bot.handlers import dp, setup_routers
+from bot.middlewares import DbSessionMiddleware, JoinChannelMiddleware, UserLanguageMiddleware, RateLimitMiddleware, \
+    FloodControlMiddleware
 from utils.env_data import Config as cf
 
 from db import db
+from bot.utils.media_registry import start_media_registry
+from bot.utils.cache import start_content_versions
+from bot.utils.ai_providers import close_http_client
+from bot.utils.ai_quota import ai_quota
+from bot.utils.flood_control import FloodControl
+from bot.utils.metrics import metrics
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
 bot = Bot(token=cf.bot.TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
@@ -27,8 +34,11 @@ async def set_bot_commands(bot: Bot, i18n: I18n) -> None:
 
 
 async def main() -> None:
-    # Database initialization
-    await db.create_all()
+    # Routerlar - faqat yoqilgan bo'limlar import qilinadi (import vaqtlari logga yoziladi)
+    features = setup_routers(cf.bot.DISABLED_FEATURES)
+
+    # Database sxemasi - jadval va index'lar alembic migratsiyalarida, bu yerda faqat versiya tekshiriladi
+    await db.check_schema_version()
 
     async_session_maker = async_sessionmaker(
         db._engine,
@@ -37,12 +47,16 @@ async def main() -> None:
     )
 
     # Rate Limiting middleware qo'shish
-    dp.message.middleware(RateLimitMiddleware(rate_limit=0.5))  # 0.5 soniya
-    dp.callback_query.middleware(RateLimitMiddleware(rate_limit=0.3))  # 0.3 soniya
+    dp.message.middleware(RateLimitMiddleware(rate_limit=0.5, burst=3, name="message"))  # 0.5 soniya
+    dp.callback_query.middleware(RateLimitMiddleware(rate_limit=0.3, burst=3, name="callback"))  # 0.3 soniya
 
     i18n = I18n(path="locales", default_locale="uz", domain="messages")
 
 
+    # 0. Flood himoyasi - bazaga murojaat qilinmasdan oldin spam to'xtatiladi
+    dp.message.outer_middleware(FloodControlMiddleware(FloodControl(per_minute=40, per_hour=600)))
+    dp.callback_query.outer_middleware(FloodControlMiddleware(FloodControl(per_minute=60, per_hour=1200)))
+
     # 1. I18n middleware - ENG BIRINCHI (til funksiyalarini beradi)
     dp.message.outer_middleware(FSMI18nMiddleware(i18n))
     dp.callback_query.outer_middleware(FSMI18nMiddleware(i18n))
@@ -64,8 +78,26 @@ async def main() -> None:
     group_router.chat_member.outer_middleware(DbSessionMiddleware(async_session_maker))
 
 
+    # 6. Media registry - URL/fayl manbalarini file_id'ga aylantirish
+    cache_chat_id = int(cf.bot.MEDIA_CACHE_CHAT_ID) if cf.bot.MEDIA_CACHE_CHAT_ID else None
+    await start_media_registry(bot, cache_chat_id)
+
+    # 7. Kontent versiyalari - admin paneldagi o'zgarishlarda bot keshi yangilanadi
+    await start_content_versions()
+
+    # 8. AI kvota hisoblagichlari - eski chelaklarni davriy tozalash
+    if "ai" in features:
+        ai_quota.start()
+
+    # 9. Metrics - rate limit / flood hisoblagichlari davriy logga yoziladi
+    metrics.start()
+
     await set_bot_commands(bot, i18n)
-    await dp.start_polling(bot, skip_updates=True)
+    try:
+        await dp.start_polling(bot, skip_updates=True)
+    finally:
+        # AI xizmatlari ulanishlar pool'ini yopish
+        await close_http_client()
 
 
 if __name__ == "__main__":
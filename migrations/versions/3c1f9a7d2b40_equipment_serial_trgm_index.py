@@ -0,0 +1,37 @@
+"""equipment serial number trigram index
+
+Revision ID: 3c1f9a7d2b40
+Revises: e8915f81ff11
+Create Date: 2025-10-02 10:12:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f9a7d2b40'
+down_revision: Union[str, None] = 'e8915f81ff11'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'idx_equipment_safeties_serial_trgm',
+        'equipment_safeties',
+        ['serial_number'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'serial_number': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'idx_equipment_safeties_serial_trgm',
+        table_name='equipment_safeties',
+        postgresql_using='gin',
+    )
@@ -0,0 +1,38 @@
+"""media files registry
+
+Revision ID: 7a2e4c91d5f3
+Revises: 3c1f9a7d2b40
+Create Date: 2025-10-06 09:41:17.220914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2e4c91d5f3'
+down_revision: Union[str, None] = '3c1f9a7d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('media_files',
+    sa.Column('source', sa.Text(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('file_id', sa.String(length=255), nullable=False),
+    sa.Column('file_unique_id', sa.String(length=100), nullable=True),
+    sa.Column('verified_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_stale', sa.Boolean(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text("TIMEZONE('Asia/Tashkent', NOW())"), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text("TIMEZONE('Asia/Tashkent', NOW())"), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'kind', name='uq_media_files_source_kind')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('media_files')
@@ -0,0 +1,69 @@
+"""accident year/category counts concurrent refresh
+
+Revision ID: 8f3b6d2a5c17
+Revises: d4a7e2c91f60
+Create Date: 2025-10-20 09:14:38.502716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3b6d2a5c17'
+down_revision: Union[str, None] = 'd4a7e2c91f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Jadval -> view natijasiga ta'sir qiladigan ustunlar (boshqa UPDATE'lar view'ni yangilamaydi)
+SOURCE_COLUMNS = {
+    'accidents': 'year_id, category_id',
+    'accident_years': 'name',
+    'accident_categories': 'name',
+}
+
+
+def _create_triggers(update_events: dict[str, str]) -> None:
+    for table, update_event in update_events.items():
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_refresh_year_counts ON {table}")
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_refresh_year_counts
+            AFTER INSERT OR {update_event} OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION refresh_accident_year_category_counts()
+        """)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY uchun unique index kerak (bo'sh yil - bitta category_id = NULL qator)
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_accident_year_category_counts_year_category "
+        "ON accident_year_category_counts (year_id, category_id)"
+    )
+
+    # Qayta hisoblash o'quvchilarni bloklamaydi (ACCESS EXCLUSIVE lock olinmaydi)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION refresh_accident_year_category_counts() RETURNS trigger AS $$
+        BEGIN
+            REFRESH MATERIALIZED VIEW CONCURRENTLY accident_year_category_counts;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+
+    _create_triggers({table: f"UPDATE OF {columns}" for table, columns in SOURCE_COLUMNS.items()})
+
+
+def downgrade() -> None:
+    _create_triggers({table: "UPDATE" for table in SOURCE_COLUMNS})
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION refresh_accident_year_category_counts() RETURNS trigger AS $$
+        BEGIN
+            REFRESH MATERIALIZED VIEW accident_year_category_counts;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute("DROP INDEX IF EXISTS idx_accident_year_category_counts_year_category")
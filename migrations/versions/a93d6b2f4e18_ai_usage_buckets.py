@@ -0,0 +1,35 @@
+"""ai usage buckets
+
+Revision ID: a93d6b2f4e18
+Revises: f7c2e9a14b36
+Create Date: 2025-10-15 11:22:07.318540
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a93d6b2f4e18'
+down_revision: Union[str, None] = 'f7c2e9a14b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ai_usage_buckets',
+    sa.Column('subject', sa.String(length=64), nullable=False),
+    sa.Column('minute', sa.BigInteger(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text("TIMEZONE('Asia/Tashkent', NOW())"), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text("TIMEZONE('Asia/Tashkent', NOW())"), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('subject', 'minute', name='uq_ai_usage_buckets_subject_minute')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ai_usage_buckets')
@@ -0,0 +1,65 @@
+"""accident year/category counts materialized view
+
+Revision ID: b41d7e6c2a90
+Revises: 7a2e4c91d5f3
+Create Date: 2025-10-09 11:27:05.318940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41d7e6c2a90'
+down_revision: Union[str, None] = '7a2e4c91d5f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Jadvallar o'zgarganda view qayta hisoblanadi
+SOURCE_TABLES = ('accidents', 'accident_years', 'accident_categories')
+
+
+def upgrade() -> None:
+    # Har bir (yil, kategoriya) uchun hodisalar soni; bo'sh yillar category_id = NULL, soni 0
+    op.execute("""
+        CREATE MATERIALIZED VIEW accident_year_category_counts AS
+        SELECT
+            y.id AS year_id,
+            y.name AS year_name,
+            COALESCE(substring(y.name FROM '(\\d{4})')::int, 0) AS year_number,
+            c.id AS category_id,
+            c.name AS category_name,
+            COUNT(a.id) AS accident_count
+        FROM accident_years y
+        LEFT JOIN accidents a ON a.year_id = y.id
+        LEFT JOIN accident_categories c ON c.id = a.category_id
+        GROUP BY y.id, y.name, c.id, c.name
+    """)
+    op.execute(
+        "CREATE INDEX idx_accident_year_category_counts_year "
+        "ON accident_year_category_counts (year_id)"
+    )
+
+    op.execute("""
+        CREATE FUNCTION refresh_accident_year_category_counts() RETURNS trigger AS $$
+        BEGIN
+            REFRESH MATERIALIZED VIEW accident_year_category_counts;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+
+    for table in SOURCE_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_refresh_year_counts
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION refresh_accident_year_category_counts()
+        """)
+
+
+def downgrade() -> None:
+    for table in SOURCE_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_refresh_year_counts ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS refresh_accident_year_category_counts()")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS accident_year_category_counts")
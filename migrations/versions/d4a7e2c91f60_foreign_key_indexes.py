@@ -0,0 +1,49 @@
+"""foreign key and hot filter indexes
+
+Revision ID: d4a7e2c91f60
+Revises: c62f8e1a7b95
+Create Date: 2025-10-19 11:05:27.614930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7e2c91f60'
+down_revision: Union[str, None] = 'c62f8e1a7b95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nom, jadval, ustunlar) - db/models.py bilan bir xil
+INDEXES = [
+    ('ix_tests_category_test_id', 'tests', ['category_test_id']),
+    ('ix_answer_tests_test_id', 'answer_tests', ['test_id']),
+    ('ix_area_safeties_department_safety_id', 'area_safeties', ['department_safety_id']),
+    ('ix_facility_safeties_area_safety_id', 'facility_safeties', ['area_safety_id']),
+    ('ix_equipment_safeties_catalog_id', 'equipment_safeties', ['catalog_id']),
+    ('idx_equipment_safeties_facility_active_expire', 'equipment_safeties',
+     ['facility_safety_id', 'is_active', 'expire_at']),
+    ('ix_books_category_book_id', 'books', ['category_book_id']),
+    ('ix_videos_category_video_id', 'videos', ['category_video_id']),
+    ('idx_accidents_year_category', 'accidents', ['year_id', 'category_id']),
+    ('ix_accidents_category_id', 'accidents', ['category_id']),
+    ('idx_train_safety_files_folder_active_order', 'train_safety_files',
+     ['folder_id', 'is_active', 'order_index']),
+]
+
+# add_indexes.py skripti yaratgan ortiqcha index'lar - unique constraint index'larini takrorlaydi
+LEGACY_INDEXES = ['idx_users_telegram_id', 'idx_channels_chat_id']
+
+
+def upgrade() -> None:
+    for name in LEGACY_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
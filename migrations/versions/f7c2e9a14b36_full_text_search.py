@@ -0,0 +1,85 @@
+"""full text search vectors
+
+Revision ID: f7c2e9a14b36
+Revises: d5a83f1e7c62
+Create Date: 2025-10-13 10:48:26.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c2e9a14b36'
+down_revision: Union[str, None] = 'd5a83f1e7c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# jadval -> (sarlavha ustuni (A og'irlik), tavsif ustuni (B og'irlik))
+SEARCH_TABLES = {
+    'accidents': ('title', 'description'),
+    'books': ('name', 'description'),
+    'videos': ('name', 'description'),
+    'train_safety_files': ('name', 'description'),
+    'company_info': ('name', 'description'),
+}
+
+
+def upgrade() -> None:
+    # bot/utils/transliterate.py normalize_text() bilan bir xil: kirill -> lotin, kichik harf
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ech10_normalize(value text) RETURNS text AS $$
+            SELECT translate(
+                replace(replace(replace(replace(replace(replace(replace(replace(replace(
+                    lower(coalesce(value, '')),
+                    'ё', 'yo'), 'ц', 'ts'), 'ч', 'ch'), 'ш', 'sh'), 'щ', 'sh'),
+                    'ю', 'yu'), 'я', 'ya'), 'ў', 'o'''), 'ғ', 'g'''),
+                'абвгдежзийклмнопрстуфхыэқҳъь',
+                'abvgdejziyklmnoprstufxieqh'
+            )
+        $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    """)
+
+    # Umumiy trigger: ustun nomlari trigger argumentlari orqali beriladi
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ech10_search_vector_update() RETURNS trigger AS $$
+        DECLARE
+            doc jsonb := to_jsonb(NEW);
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('simple', ech10_normalize(doc ->> TG_ARGV[0])), 'A') ||
+                setweight(to_tsvector('simple', ech10_normalize(doc ->> TG_ARGV[1])), 'B');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+
+    for table, (title_column, description_column) in SEARCH_TABLES.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_search_vector
+            BEFORE INSERT OR UPDATE OF {title_column}, {description_column} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION ech10_search_vector_update('{title_column}', '{description_column}')
+        """)
+        # Mavjud yozuvlarni to'ldirish (trigger ishga tushadi)
+        op.execute(f"UPDATE {table} SET {title_column} = {title_column}")
+        op.create_index(
+            f'idx_{table}_search_vector',
+            table,
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+        )
+
+
+def downgrade() -> None:
+    for table in SEARCH_TABLES:
+        op.drop_index(f'idx_{table}_search_vector', table_name=table, postgresql_using='gin')
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_search_vector ON {table}")
+        op.drop_column(table, 'search_vector')
+
+    op.execute("DROP FUNCTION IF EXISTS ech10_search_vector_update()")
+    op.execute("DROP FUNCTION IF EXISTS ech10_normalize(text)")
@@ -6,6 +6,9 @@ load_dotenv(ENV_PATH)
 
 class BotConfig:
     TOKEN = getenv("BOT_TOKEN")
+    MEDIA_CACHE_CHAT_ID = getenv("MEDIA_CACHE_CHAT_ID")  # URL/fayllarni oldindan yuklash uchun xizmat chati
+    # Vergul bilan ajratilgan o'chirilgan bo'limlar, masalan: "ai,video" (modullari import ham qilinmaydi)
+    DISABLED_FEATURES = {name.strip() for name in (getenv("DISABLED_FEATURES") or "").split(",") if name.strip()}
 
 class DBConfig:
     DB_NAME = getenv("DB_NAME")
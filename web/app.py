@@ -10,7 +10,7 @@ from starlette.middleware.sessions import SessionMiddleware
 from starlette_admin.contrib.sqla import Admin, ModelView
 from starlette_admin.exceptions import FormValidationError
 from starlette.requests import Request
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 import bcrypt
 
 from db import db
@@ -23,16 +23,17 @@ from db.models import (
     AccidentCategory, AccidentYear, Accident,
     Channel, CompanyInfo, TrainSafetyFolder, TrainSafetyFile
 )
+from db.content_version import content_domain, bump_content_version
 from web.provider import ProfessionalAuthProvider
 
 
 class BaseModelView(ModelView):
     """Asosiy ModelView - umumiy sozlamalar"""
 
-    exclude_fields_from_create = ["id", "created_at", "updated_at"]
-    exclude_fields_from_edit = ["id", "created_at", "updated_at"]
-    exclude_fields_from_list = ["created_at", "updated_at"]
-    exclude_fields_from_detail = ["created_at", "updated_at"]
+    exclude_fields_from_create = ["id", "created_at", "updated_at", "search_vector"]
+    exclude_fields_from_edit = ["id", "created_at", "updated_at", "search_vector"]
+    exclude_fields_from_list = ["created_at", "updated_at", "search_vector"]
+    exclude_fields_from_detail = ["created_at", "updated_at", "search_vector"]
 
     page_size = 25
     page_size_options = [10, 25, 50, 100]
@@ -69,7 +70,9 @@ class BaseModelView(ModelView):
                     data["password_hash"].encode(), bcrypt.gensalt()
                 ).decode()
 
-            return await super().create(request, data)
+            obj = await super().create(request, data)
+            await self._bump_content_version()
+            return obj
         except FormValidationError:
             raise
         except Exception as e:
@@ -87,12 +90,26 @@ class BaseModelView(ModelView):
                     data["password_hash"].encode(), bcrypt.gensalt()
                 ).decode()
 
-            return await super().edit(request, pk, data)
+            obj = await super().edit(request, pk, data)
+            await self._bump_content_version()
+            return obj
         except FormValidationError:
             raise
         except Exception as e:
             raise FormValidationError({"error": f"Xatolik: {str(e)}"})
 
+    async def delete(self, request: Request, pks: List[Any]) -> Optional[int]:
+        """Yozuvlarni o'chirish"""
+        deleted = await super().delete(request, pks)
+        await self._bump_content_version()
+        return deleted
+
+    async def _bump_content_version(self):
+        """Bot keshini yangilash uchun kontent versiyasini oshirish"""
+        domain = content_domain(self.model)
+        if domain:
+            await bump_content_version(domain)
+
     def _validate_data(self, data: Dict[str, Any], is_create: bool = True) -> Dict[str, str]:
         """Barcha modellar uchun validation"""
         errors = {}